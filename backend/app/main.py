@@ -1,58 +1,375 @@
+import time
+_BOOT_STARTED = time.perf_counter()
+
 import os
+import json
+import math
+import uuid
 import uvicorn
-from fastapi import FastAPI, Response
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from typing import List
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from backend.app.services import metrics
+from backend.app.services.admission import AdmissionTimeout, ConcurrencyGate, RateLimiter, RateLimitExceeded
 from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.conversation_log import ConversationLog
+from backend.app.services.knowledge import KnowledgeWatcher
+from backend.app.services.personas import DEFAULT_PERSONA, PersonaRegistry
+from backend.app.services.report_jobs import ReportJobManager
+from backend.app.services.static_assets import PrecompressedStaticFiles, static_root
 from backend.app.services.tts_service import TTSService
+from backend.app.services.worker_pool import BoundedExecutor, PoolSaturatedError
 
 # 1. Setup
+startup_timings = {"imports": round(time.perf_counter() - _BOOT_STARTED, 4)}
 app = FastAPI()
 agent = AIAgentService()
+startup_timings.update(agent.startup_timings)
+_tts_started = time.perf_counter()
 tts_service = TTSService()
+startup_timings["tts_init"] = round(time.perf_counter() - _tts_started, 4)
+# Blocking Gemini/TTS calls run here so they never stall the event loop
+pool = BoundedExecutor()
+# Per-client token buckets per endpoint + a global cap on concurrent upstream calls
+limiter = RateLimiter()
+gate = ConcurrencyGate()
+# X-Forwarded-For entries appended by our own proxies. Must match the real proxy depth (Cloud Run: 1;
+# behind an extra load balancer: 2); the default 0 ignores the header, which any client can set
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+# Further digital twins (PERSONAS_DIR/<persona_id>/), loaded on first request into a bounded LRU,
+# sharing the Gemini client, injection filter and transcript compactor with the default persona
+personas = PersonaRegistry(
+    agent.client, injection_filter=agent.injection_filter, compactor=getattr(agent, "compactor", None),
+    gemini_caller=getattr(agent, "gemini", None)
+)
+# Picks up new dynamic_profile.json / resume.pdf in the background (no restart needed)
+if agent.client:
+    KnowledgeWatcher(agent).start()
+    KnowledgeWatcher(personas).start()
+
+def render_hiring_report(chat_history: List[dict], persona_id: Optional[str] = None,
+                         session_id: Optional[str] = None) -> bytes:
+    """
+    Runs on the worker pool (the persona is already loaded by the endpoint).
+    Background jobs bypass upstream(), so the Gemini calls take their gate slot here.
+    """
+    target = agent if not persona_id else personas.get(persona_id)
+    with gate.held():
+        return target.generate_hiring_report(chat_history, session_id=session_id)
+
+# Durable transcript of every chat turn (SQLite, written in batches off the request path);
+# reports read it by session id instead of the browser re-uploading the conversation
+conversations = ConversationLog()
+# Hiring reports run as background jobs on the same pool (submit -> poll -> download)
+reports = ReportJobManager(render_hiring_report, pool)
+# Per-request trace spans (retrieval, Gemini, PDF, ...) returned as a Server-Timing header
+trace_requests = os.getenv("TRACE_REQUESTS", "0").lower() in ("1", "true", "yes")
+startup_timings["total"] = round(time.perf_counter() - _BOOT_STARTED, 4)
+print(f"🚀 Cold start {startup_timings['total']:.2f}s: {startup_timings}")
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry shortly."},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests, please slow down."},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
+@app.exception_handler(AdmissionTimeout)
+async def admission_timeout_handler(request: Request, exc: AdmissionTimeout):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry shortly."},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    """Latency histogram per route and status, plus optional Server-Timing spans"""
+    token = metrics.start_trace() if trace_requests else None
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - started
+        spans = metrics.end_trace(token) if token is not None else None
+        # Route template, not the raw path (job ids would explode the label set)
+        route = getattr(request.scope.get("route"), "path", "static")
+        metrics.HTTP_REQUEST_SECONDS.observe(elapsed, method=request.method, route=route, status=status)
+    if spans is not None:
+        response.headers["Server-Timing"] = metrics.server_timing(spans + [("total", elapsed)])
+    return response
+
+def client_id(request: Request) -> str:
+    """
+    Client IP as recorded by our own proxies: the TRUSTED_PROXY_HOPS-th
+    X-Forwarded-For entry from the right. Entries before it are whatever the
+    client sent, so they never pick the rate-limit bucket. 0 ignores the header.
+    """
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded and TRUSTED_PROXY_HOPS > 0:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        if hops:
+            return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+def rate_limited(endpoint: str):
+    """Dependency that spends one token of the client's `endpoint` budget"""
+    def check(request: Request):
+        limiter.check(endpoint, client_id(request))
+    return check
+
+async def persona_agent(persona_id: Optional[str]) -> AIAgentService:
+    """The agent for `persona_id` (the default persona if empty); a cold persona is loaded on the pool"""
+    if not persona_id or persona_id == DEFAULT_PERSONA:
+        return agent
+    loaded = personas.peek(persona_id)
+    if loaded is not None:
+        return loaded
+    if not personas.exists(persona_id):
+        raise HTTPException(status_code=404, detail="Unknown persona")
+    return await pool.run(personas.get, persona_id)
+
+def report_options(request: "ReportRequest") -> dict:
+    """Keyword options for the report job; the session id keys the compactor's cached summaries"""
+    options = {"persona_id": request.persona_id} if request.persona_id and request.persona_id != DEFAULT_PERSONA else {}
+    if request.session_id:
+        options["session_id"] = request.session_id
+    return options
+
+def log_turn(session_id: str, message: str, answer: str, persona_id: Optional[str]):
+    """Queues a finished exchange for the conversation log (failed turns are not part of the transcript)"""
+    if answer and not answer.startswith("AI Error"):
+        conversations.append_turn(session_id, message, answer, persona_id=persona_id or DEFAULT_PERSONA)
+
+async def report_transcript(request: "ReportRequest") -> List[dict]:
+    """The stored transcript of request.session_id with this persona, or the uploaded chat_history (older clients)"""
+    if request.session_id:
+        history = await pool.run(conversations.transcript, request.session_id, request.persona_id or DEFAULT_PERSONA)
+        if not history:
+            raise HTTPException(status_code=404, detail="No conversation for this session")
+        return history
+    if request.chat_history:
+        return request.chat_history
+    raise HTTPException(status_code=422, detail="session_id is required")
+
+async def upstream(fn, *args, **kwargs):
+    """Runs a blocking Gemini/TTS call on the pool once the concurrency gate admits it"""
+    await gate.acquire()
+    try:
+        return await pool.run(fn, *args, **kwargs)
+    finally:
+        gate.release()
+
+def gated_stream(chunks):
+    """Holds an (already acquired) gate slot for the lifetime of a streaming response"""
+    released = []
+
+    def release():
+        if not released:
+            released.append(True)
+            gate.release()
+
+    def stream():
+        try:
+            yield from chunks
+        finally:
+            release()
+
+    # The background task covers a stream that is closed before it ever started
+    return stream(), BackgroundTask(release)
 
 # 2. Models
 class UserMessage(BaseModel):
     message: str
-    mode: str = "hr"
-    seniority: int = 2
+    mode: Literal["hr", "tech_lead"] = "hr"
+    seniority: int = Field(2, ge=0, le=3)  # index into the precomputed instruction table
+    session_id: Optional[str] = None
+    persona_id: Optional[str] = None
 
 class ReportRequest(BaseModel):
-    chat_history: List[dict]
+    session_id: Optional[str] = None
+    chat_history: Optional[List[dict]] = None  # deprecated: send session_id
+    persona_id: Optional[str] = None
 
 class TTSRequest(BaseModel):
     text: str
 
 # 3. API Endpoints
-@app.post("/api/chat")
+@app.post("/api/chat", dependencies=[Depends(rate_limited("chat"))])
 async def chat(user_msg: UserMessage):
     """
     Accepts a user message, calls the AI agent, and returns the response.
+    Each visitor gets their own conversation, keyed by session_id.
+    persona_id picks the digital twin (default: the original persona).
+    """
+    session_id = user_msg.session_id or uuid.uuid4().hex
+    target = await persona_agent(user_msg.persona_id)
+    response = await upstream(
+        target.ask, user_msg.message, mode=user_msg.mode, seniority=user_msg.seniority, session_id=session_id
+    )
+    log_turn(session_id, user_msg.message, response, user_msg.persona_id)
+    return {"response": response, "session_id": session_id}
+
+@app.post("/api/chat/stream", dependencies=[Depends(rate_limited("chat"))])
+async def chat_stream(user_msg: UserMessage):
     """
-    response = agent.ask(user_msg.message, mode=user_msg.mode)
-    return {"response": response}
+    Same as /api/chat, but streams the answer as Server-Sent Events:
+    `chunk` events as tokens arrive, then a `done` event with token usage.
+    """
+    session_id = user_msg.session_id or uuid.uuid4().hex
+    target = await persona_agent(user_msg.persona_id)
+
+    def event_stream():
+        parts = []
+        for event in target.ask_stream(
+            user_msg.message, mode=user_msg.mode, seniority=user_msg.seniority, session_id=session_id
+        ):
+            if event["type"] == "chunk":
+                parts.append(event["text"])
+            elif event["type"] == "done":
+                event["session_id"] = session_id
+                log_turn(session_id, user_msg.message, "".join(parts), user_msg.persona_id)
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    # Sync generator: Starlette iterates it in a worker thread, off the event loop
+    await gate.acquire()
+    body, release = gated_stream(event_stream())
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=release
+    )
 
-@app.post("/api/generate-report")
+@app.post("/api/generate-report", dependencies=[Depends(rate_limited("report"))])
 async def generate_report(request: ReportRequest):
     """
-    Generates a PDF report based on chat history.
+    Generates a PDF report from the session's stored conversation.
     """
-    pdf_bytes = agent.generate_hiring_report(request.chat_history)
+    await persona_agent(request.persona_id)
+    chat_history = await report_transcript(request)
+    # Not upstream(): a cached PDF needs no slot, and render_hiring_report takes its own
+    pdf_bytes = await pool.run(reports.generate_now, chat_history, **report_options(request))
     return Response(content=pdf_bytes, media_type="application/pdf")
 
-@app.post("/api/tts")
+@app.post("/api/reports", status_code=202, dependencies=[Depends(rate_limited("report"))])
+async def submit_report(request: ReportRequest):
+    """
+    Starts report generation in the background and returns a job id to poll.
+    The transcript is read server-side from the session's conversation log.
+    An identical transcript reuses the cached PDF or the job already running.
+    """
+    await persona_agent(request.persona_id)
+    chat_history = await report_transcript(request)
+    return reports.submit(chat_history, **report_options(request)).to_dict()
+
+@app.get("/api/reports/{job_id}")
+async def report_status(job_id: str):
+    """
+    Job status: queued / running / done (with download_url) / failed.
+    """
+    job = reports.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    return job.to_dict()
+
+@app.get("/api/reports/{job_id}/pdf")
+async def report_pdf(job_id: str):
+    """
+    Downloads the finished report.
+    """
+    job = reports.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Report is {job.status}")
+    return Response(
+        content=job.pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="SOURCE_PERSONA_REPORT_{job_id[:8]}.pdf"'}
+    )
+
+@app.post("/api/tts", dependencies=[Depends(rate_limited("tts"))])
 async def text_to_speech(request: TTSRequest):
     """
     Synthesizes speech from text using Google Cloud TTS.
     """
-    audio_bytes = tts_service.synthesize_speech(request.text)
+    audio_bytes = await upstream(tts_service.synthesize_long, request.text)
     return Response(content=audio_bytes, media_type="audio/mpeg")
 
+@app.post("/api/tts/stream", dependencies=[Depends(rate_limited("tts"))])
+async def text_to_speech_stream(request: TTSRequest):
+    """
+    Same as /api/tts, but streams MP3 segments sentence by sentence,
+    so playback can start after the first one is synthesized.
+    """
+    # Sync generator: Starlette iterates it in a worker thread, off the event loop
+    await gate.acquire()
+    body, release = gated_stream(tts_service.synthesize_stream(request.text))
+    return StreamingResponse(
+        body,
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=release
+    )
+
+@app.get("/api/stats")
+async def stats():
+    """
+    Runtime counters (active sessions, evictions, context cache, ...).
+    """
+    return {
+        **agent.stats(),
+        "tts_cache": tts_service.stats(),
+        "reports": reports.stats(),
+        "conversations": conversations.stats(),
+        "rate_limit": limiter.stats(),
+        "upstream_gate": gate.stats(),
+        "personas": personas.stats(),
+        "worker_pool": pool.stats(),
+        "startup": startup_timings,
+    }
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """
+    Latency histograms, prompt/response sizes, token usage, errors and cache hits
+    in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/api/admin/reload")
+async def reload_knowledge(force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """
+    Reloads profile/resume data right away (e.g. after a GitHub sync),
+    for the default persona and every loaded one.
+    Requires the X-Admin-Token header to match ADMIN_TOKEN; disabled if it is unset.
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token or x_admin_token != admin_token:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    reloaded = await pool.run(agent.reload_knowledge, force)
+    reloaded = await pool.run(personas.reload_knowledge, force) or reloaded
+    return {"reloaded": reloaded, "fingerprint": agent.knowledge_fingerprint if agent.client else None}
+
 # 4. Static Files (Serve Frontend)
 # Important: This must be AFTER the API routes
 frontend_path = os.path.join(os.getcwd(), "frontend")
-app.mount("/", StaticFiles(directory=frontend_path, html=True), name="frontend")
+# frontend/dist (python -m backend.build_assets) when built: minified, fingerprinted, precompressed
+app.mount("/", PrecompressedStaticFiles(directory=static_root(frontend_path), html=True), name="frontend")
 
 # 5. Run Configuration
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+# backend/app/services/admission.py
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class RateLimitExceeded(Exception):
+    """A client used up its token bucket for an endpoint."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class AdmissionTimeout(Exception):
+    """No upstream slot became free before the queueing deadline."""
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__("Upstream busy, queueing deadline exceeded")
+        self.retry_after = retry_after
+
+
+def token_bucket(tokens: Optional[float], updated: Optional[float], now: float,
+                 rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float, float]:
+    """
+    One token-bucket step: refills `rate` tokens/s up to `burst`, then tries to
+    take `cost`. Returns (allowed, tokens left, seconds until allowed).
+    """
+    if tokens is None or updated is None:
+        tokens = burst
+    else:
+        tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / rate
+
+
+class InMemoryBucketStore:
+    """Per-process buckets (the default; fine for a single Cloud Run instance)."""
+
+    def __init__(self, max_keys: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys or int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+        # key -> (tokens, updated, seconds until full): each bucket keeps its own endpoint's refill time
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = self._clock()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (None, None, None))
+            allowed, tokens, retry_after = token_bucket(tokens, updated, now, rate, burst, cost)
+            self._buckets[key] = (tokens, now, (burst - tokens) / rate)
+            if len(self._buckets) > self.max_keys:
+                self._purge(now)
+        return allowed, retry_after
+
+    def _purge(self, now: float):
+        """Drops buckets that have refilled completely (same as never seen)"""
+        for key in [k for k, (_, updated, full_after) in self._buckets.items() if now - updated >= full_after]:
+            del self._buckets[key]
+
+
+# Atomic refill + take on the Redis side, so several app instances share one budget
+_REDIS_TOKEN_BUCKET = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local rate, burst, now, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = burst
+else
+  tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+end
+local allowed, retry = 0, 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisBucketStore:
+    """
+    Buckets in Redis (anything with redis-py's register_script API), shared by
+    all instances. Bucket keys expire once they would be full again.
+    """
+
+    def __init__(self, redis_client, prefix: str = "persona:rl:", clock: Callable[[], float] = time.time):
+        self.redis = redis_client
+        self.prefix = prefix
+        self._clock = clock
+        self._script = redis_client.register_script(_REDIS_TOKEN_BUCKET)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, retry_after = self._script(keys=[self.prefix + key], args=[rate, burst, self._clock(), cost])
+        return bool(int(allowed)), float(retry_after)
+
+
+def parse_limit(spec: str) -> Tuple[float, float]:
+    """'30/60' -> 30 requests per 60 s: (rate per second, burst)"""
+    count, _, period = spec.partition("/")
+    count, period = float(count), float(period or 1)
+    return count / period, count
+
+
+class RateLimiter:
+    """
+    Token bucket per (endpoint, client) with a separate budget per endpoint,
+    configured as RATE_LIMIT_<ENDPOINT>="<requests>/<seconds>".
+    """
+
+    DEFAULT_LIMITS = {"chat": "30/60", "report": "5/300", "tts": "30/60"}
+
+    def __init__(self, store=None, limits: Optional[Dict[str, str]] = None, enabled: Optional[bool] = None):
+        self.store = store or self._default_store()
+        specs = {
+            name: os.getenv(f"RATE_LIMIT_{name.upper()}", default)
+            for name, default in self.DEFAULT_LIMITS.items()
+        }
+        specs.update(limits or {})
+        self.limits = {name: parse_limit(spec) for name, spec in specs.items()}
+        if enabled is None:
+            enabled = os.getenv("RATE_LIMIT_ENABLED", "1").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+
+        # Metrics
+        self.allowed = 0
+        self.limited = 0
+
+    @staticmethod
+    def _default_store():
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                import redis
+                return RedisBucketStore(redis.Redis.from_url(redis_url))
+            except Exception as e:
+                print(f"⚠️ Redis Rate Limit Store Error: {e}. Falling back to in-process buckets.")
+        return InMemoryBucketStore()
+
+    def check(self, endpoint: str, client_id: str):
+        """Takes one token, or raises RateLimitExceeded with the wait in seconds."""
+        if not self.enabled:
+            return
+        rate, burst = self.limits[endpoint]
+        try:
+            allowed, retry_after = self.store.take(f"{endpoint}:{client_id}", rate, burst)
+        except Exception as e:
+            # A broken shared store must not take the whole site down
+            print(f"⚠️ Rate Limit Store Error: {e}")
+            return
+        if not allowed:
+            self.limited += 1
+            raise RateLimitExceeded(retry_after)
+        self.allowed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "store": type(self.store).__name__,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class ConcurrencyGate:
+    """
+    Global cap on concurrent upstream (Gemini / TTS) work across all endpoints.
+    Excess requests wait in FIFO order up to `queue_timeout` seconds, then get
+    AdmissionTimeout. Slots may be released from any thread (e.g. the worker
+    thread that finishes a streaming response).
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, queue_timeout: Optional[float] = None):
+        self.max_concurrent = max_concurrent or int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "16"))
+        self.queue_timeout = queue_timeout if queue_timeout is not None else float(os.getenv("UPSTREAM_QUEUE_TIMEOUT_SECONDS", "10"))
+        self._active = 0
+        self._waiters: "deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]" = deque()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.admitted = 0
+        self.queued = 0
+        self.timed_out = 0
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active < self.max_concurrent:
+                self._active += 1
+                self.admitted += 1
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+            self.queued += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(loop, waiter, timed_out=True)
+            raise AdmissionTimeout()
+        except asyncio.CancelledError:
+            self._abandon(loop, waiter)
+            raise
+        with self._lock:
+            self.admitted += 1
+
+    @contextmanager
+    def held(self):
+        """
+        Holds a slot around blocking upstream work on a worker thread (e.g. a
+        background report job). Waits on a private event loop; raises
+        AdmissionTimeout like acquire().
+        """
+        asyncio.run(self.acquire())
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _abandon(self, loop, waiter, timed_out: bool = False):
+        with self._lock:
+            handed_over = (loop, waiter) not in self._waiters
+            if not handed_over:
+                self._waiters.remove((loop, waiter))
+                self.timed_out += timed_out
+        if handed_over:
+            # A slot arrived just as we gave up: pass it on
+            self.release()
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the next waiter (active count unchanged)
+                loop, waiter = self._waiters.popleft()
+                loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+            else:
+                self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "active": self._active,
+                "waiting": len(self._waiters),
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "timed_out": self.timed_out,
+            }
@@ -0,0 +1,165 @@
+# backend/app/services/audio_cache.py
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class AudioCache:
+    """
+    Content-addressed cache of synthesized speech, keyed by hash(text, voice, encoding).
+    Two tiers, each bounded by total bytes and evicting least recently used:
+    a small in-memory LRU in front of a larger on-disk directory. Disk hits are
+    promoted to memory; memory evictions stay on disk.
+
+    The lock only guards the two indexes; file reads, writes and evictions
+    happen outside it, so one slow disk access doesn't stall other lookups.
+    """
+
+    def __init__(self, memory_bytes: Optional[int] = None, disk_bytes: Optional[int] = None,
+                 disk_dir: Optional[str] = None):
+        self.memory_bytes = memory_bytes if memory_bytes is not None else int(os.getenv("TTS_CACHE_MEMORY_BYTES", str(16 * 1024 * 1024)))
+        self.disk_bytes = disk_bytes if disk_bytes is not None else int(os.getenv("TTS_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+        self.disk_dir = disk_dir or os.getenv("TTS_CACHE_DIR", os.path.join("backend", "data", "tts_cache"))
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._disk_used = 0
+        self._writing: set = set()  # keys whose file is being written
+        self._lock = threading.Lock()
+        self._load_disk_index()
+
+        # Metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def key(text: str, voice: str, encoding: str) -> str:
+        return hashlib.sha256(f"{voice}\0{encoding}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.bytes_saved += len(audio)
+                return audio
+            if key not in self._disk:
+                self.misses += 1
+                return None
+        audio = self._read_disk(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                self._drop_disk_entry(key)
+                return None
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.disk_hits += 1
+            self.bytes_saved += len(audio)
+            self._put_memory(key, audio)
+            return audio
+
+    def put(self, key: str, audio: bytes):
+        if not audio:
+            return
+        with self._lock:
+            self._put_memory(key, audio)
+            if self.disk_bytes <= 0 or len(audio) > self.disk_bytes or key in self._disk or key in self._writing:
+                return
+            self._writing.add(key)
+        written = self._write_disk(key, audio)
+        with self._lock:
+            self._writing.discard(key)
+            if not written:
+                return
+            self._disk[key] = len(audio)
+            self._disk_used += len(audio)
+            evicted = []
+            while self._disk_used > self.disk_bytes:
+                old, size = self._disk.popitem(last=False)
+                self._disk_used -= size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_used,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_used,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+            }
+
+    # Memory tier (caller holds the lock)
+    def _put_memory(self, key: str, audio: bytes):
+        if len(audio) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= len(old)
+        self._memory[key] = audio
+        self._memory_used += len(audio)
+        while self._memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    # Disk tier: file I/O runs without the lock, the index is updated under it
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.audio")
+
+    def _load_disk_index(self):
+        """Rebuilds the disk LRU order from file mtimes (survives restarts)"""
+        try:
+            entries = []
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".audio"):
+                    st = os.stat(os.path.join(self.disk_dir, name))
+                    entries.append((st.st_mtime, name[:-len(".audio")], st.st_size))
+        except OSError:
+            return
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_used += size
+
+    def _drop_disk_entry(self, key: str):
+        """Forgets a file that could not be read (caller holds the lock)"""
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_used -= size
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key))  # keeps LRU order across restarts
+        except OSError:
+            return None
+        return audio
+
+    def _write_disk(self, key: str, audio: bytes) -> bool:
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️ TTS Cache Write Error: {e}")
+            return False
+        return True
@@ -0,0 +1,153 @@
+# backend/app/services/context_cache.py
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+from google.genai import types
+
+
+class ContextCacheManager:
+    """
+    Keeps the large static persona prompt (resume + GitHub profile + rules)
+    registered as a Gemini cached context, so each turn only references it
+    by name instead of resending it.
+
+    The cache is re-created whenever the prompt fingerprint changes, its TTL
+    is extended shortly before expiry, and any failure makes callers fall
+    back to sending the full system instruction (get() returns None).
+    """
+
+    def __init__(
+        self,
+        client,
+        model_name: str,
+        ttl_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.model_name = model_name
+        self.ttl_seconds = ttl_seconds or int(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "3600"))
+        if enabled is None:
+            enabled = os.getenv("CONTEXT_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+        # Refresh this long before expiry; after failures back off 5 min, doubling up to 1 h
+        self.refresh_margin = min(60, self.ttl_seconds // 4)
+        self.retry_after = 300
+        self.max_retry_after = 3600
+        self._consecutive_failures = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._name: Optional[str] = None
+        self._fingerprint: Optional[str] = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+
+        # Metrics
+        self.created = 0
+        self.refreshed = 0
+        self.failures = 0
+
+    def get(self, static_instruction: str, fingerprint: str) -> Optional[str]:
+        """Returns the cached-content name for this prompt, or None to use the fallback path."""
+        if not self.enabled or not self.client:
+            return None
+
+        now = self._clock()
+        if self._is_fresh(fingerprint, now):
+            return self._name
+
+        # Only one thread talks to the API; the others use the fallback meanwhile
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self._is_fresh(fingerprint, now):
+                return self._name
+            if now < self._retry_at:
+                return None
+            if self._name and fingerprint == self._fingerprint and now < self._expires_at:
+                self._extend(now)
+            else:
+                self._create(static_instruction, fingerprint, now)
+            return self._name if fingerprint == self._fingerprint else None
+        finally:
+            self._lock.release()
+
+    def invalidate(self):
+        """Forgets the current cache (e.g. after the API rejected it); the next get() re-creates it."""
+        with self._lock:
+            self._delete(self._name)
+            self._name = None
+            self._fingerprint = None
+            self._expires_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "active": self._name is not None,
+            "created": self.created,
+            "refreshed": self.refreshed,
+            "failures": self.failures,
+        }
+
+    def _is_fresh(self, fingerprint: str, now: float) -> bool:
+        return (
+            self._name is not None
+            and fingerprint == self._fingerprint
+            and now < self._expires_at - self.refresh_margin
+        )
+
+    def _create(self, static_instruction: str, fingerprint: str, now: float):
+        try:
+            cache = self.client.caches.create(
+                model=self.model_name,
+                config=types.CreateCachedContentConfig(
+                    display_name="source-persona-static-context",
+                    system_instruction=static_instruction,
+                    ttl=f"{self.ttl_seconds}s"
+                )
+            )
+        except Exception as e:
+            # e.g. prompt below the model's minimum cacheable size, or caching unsupported
+            print(f"⚠️ Context Cache Error: {e}")
+            self._back_off(now)
+            if fingerprint != self._fingerprint:
+                # The old cache holds outdated data; don't keep serving it
+                self._delete(self._name)
+                self._name = None
+                self._fingerprint = None
+            return
+
+        self._delete(self._name)
+        self._name = cache.name
+        self._fingerprint = fingerprint
+        self._expires_at = now + self.ttl_seconds
+        self._consecutive_failures = 0
+        self.created += 1
+
+    def _extend(self, now: float):
+        try:
+            self.client.caches.update(
+                name=self._name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s")
+            )
+            self._expires_at = now + self.ttl_seconds
+            self.refreshed += 1
+        except Exception as e:
+            print(f"⚠️ Context Cache Refresh Error: {e}")
+            self._back_off(now)
+
+    def _back_off(self, now: float):
+        self.failures += 1
+        self._consecutive_failures += 1
+        delay = self.retry_after * 2 ** (self._consecutive_failures - 1)
+        self._retry_at = now + min(delay, self.max_retry_after)
+
+    def _delete(self, name: Optional[str]):
+        if not name:
+            return
+        try:
+            self.client.caches.delete(name=name)
+        except Exception:
+            pass  # It expires on its own anyway
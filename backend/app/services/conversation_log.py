@@ -0,0 +1,175 @@
+# backend/app/services/conversation_log.py
+import os
+import time
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    persona_id TEXT,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_by_session_persona ON turns (session_id, persona_id, id);
+"""
+
+# (session_id, persona_id, role, content, created_at)
+_Row = Tuple[str, Optional[str], str, str, float]
+# Queue markers: write what is collected now / write it and stop
+_FLUSH = object()
+_STOP = object()
+
+
+class ConversationLog:
+    """
+    Append-only, durable log of chat turns in an embedded SQLite database
+    (WAL mode, so reads never wait for the writer). Chat endpoints only
+    enqueue; a background thread writes the queue in batches of up to
+    `batch_size` rows, one transaction each, at most every `flush_seconds`.
+    transcript() first waits for earlier appends to be written, so a report
+    requested right after a turn sees it.
+
+    The database is local to the instance: on Cloud Run point CONVERSATION_DB
+    at a mounted volume if transcripts must outlive the container.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: Optional[int] = None,
+                 flush_seconds: Optional[float] = None, max_pending: Optional[int] = None):
+        self.path = path or os.getenv("CONVERSATION_DB", os.path.join("backend", "data", "conversations.db"))
+        self.batch_size = batch_size or int(os.getenv("CONVERSATION_BATCH_SIZE", "100"))
+        self.flush_seconds = flush_seconds if flush_seconds is not None else float(os.getenv("CONVERSATION_FLUSH_SECONDS", "0.2"))
+        self.max_pending = max_pending or int(os.getenv("CONVERSATION_MAX_PENDING", "10000"))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._local = threading.local()
+        self._written = threading.Condition()
+        self._enqueued_seq = 0
+        self._written_seq = 0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.appended = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.write_errors = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._thread = threading.Thread(target=self._run, name="conversation-writer", daemon=True)
+        self._thread.start()
+
+    def append_turn(self, session_id: str, user_text: str, model_text: str, persona_id: Optional[str] = None):
+        """Queues one user/model exchange (never blocks the request; drops it if the queue is full)"""
+        now = time.time()
+        rows = [(session_id, persona_id, "user", user_text, now), (session_id, persona_id, "model", model_text, now)]
+        with self._lock:
+            # Both rows or neither (only appenders fill the queue, under this lock)
+            if self._queue.qsize() + len(rows) > self.max_pending:
+                self.dropped += 1
+                print("⚠️ Conversation Log Full: turn dropped")
+                return
+            for row in rows:
+                self._queue.put_nowait(row)
+            self._enqueued_seq += len(rows)
+            self.appended += 1
+
+    def transcript(self, session_id: str, persona_id: Optional[str] = None,
+                   timeout: float = 5.0) -> List[Dict[str, str]]:
+        """
+        The turns of one (session, persona) conversation in order, as
+        [{"role", "content"}] (the report's chat_history format). A visitor
+        talking to two personas under one session id gets two transcripts.
+        """
+        self.flush(timeout)
+        rows = self._connection().execute(
+            "SELECT role, content FROM turns WHERE session_id = ? AND persona_id IS ? ORDER BY id",
+            (session_id, persona_id)
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until everything appended so far is on disk; False on timeout"""
+        with self._lock:
+            target = self._enqueued_seq
+        with self._written:
+            if self._written_seq >= target:
+                return True
+        self._queue.put(_FLUSH)  # don't sit out the rest of the batching window
+        with self._written:
+            return self._written.wait_for(lambda: self._written_seq >= target, timeout)
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "appended_turns": self.appended,
+                "written_rows": self.written,
+                "batches": self.batches,
+                "pending_rows": self._queue.qsize(),
+                "dropped_turns": self.dropped,
+                "write_errors": self.write_errors,
+                "db_bytes": sum(os.path.getsize(self.path + suffix)
+                                for suffix in ("", "-wal") if os.path.exists(self.path + suffix)),
+            }
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections must stay on their thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            # WAL + NORMAL: commits don't fsync; a crash can lose the last batch, never corrupt the file
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _run(self):
+        conn = self._connection()
+        while True:
+            row = self._queue.get()
+            if row is _STOP:
+                return
+            batch = [] if row is _FLUSH else [row]
+            # Collect more rows for up to flush_seconds, so bursts share one transaction
+            deadline = time.monotonic() + self.flush_seconds
+            while batch and len(batch) < self.batch_size:
+                try:
+                    row = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if row is _FLUSH:
+                    break
+                if row is _STOP:
+                    self._write(conn, batch)
+                    return
+                batch.append(row)
+            if batch:
+                self._write(conn, batch)
+
+    def _write(self, conn: sqlite3.Connection, batch: List[_Row]):
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO turns (session_id, persona_id, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                    batch,
+                )
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+        except sqlite3.Error as e:
+            with self._lock:
+                self.write_errors += 1
+            print(f"⚠️ Conversation Log Write Error: {e}")
+        # Failed rows count as handled too, so transcript() never waits on them forever
+        with self._written:
+            self._written_seq += len(batch)
+            self._written.notify_all()
@@ -0,0 +1,191 @@
+# backend/app/services/fast_path.py
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from backend.app.services.portfolio_index import PortfolioIndex
+
+_WORDS = re.compile(r"[a-z0-9][a-z0-9+#.-]*")
+_PROJECTS = r"(?:projects?|repos?|repositories)"
+_YOUR = r"(?:(?:your|my) )?"
+_BUILT = r"(?:(?:do|did|have) you (?:have|build|built|make|made|create|created|ship|shipped|publish|published))"
+_USING = r"(?:use|used|using|uses|with|are (?:written |built )?(?:in|with)|were (?:written |built )?(?:in|with))"
+_SUBJECT = r"([a-z0-9+#. -]+?)"
+# Each pattern must match the whole (normalized) question: an extra clause means it is not a pure lookup
+_COUNT = re.compile(rf"how many {_YOUR}{_PROJECTS}(?: {_BUILT})?(?: (?:in|from|during) (?P<year>20\d\d))?"
+                    r"(?: (?:in total|total|overall|on github))?")
+_COUNT_SUBJECT = re.compile(rf"how many {_YOUR}{_PROJECTS}(?: {_BUILT})? {_USING} {_SUBJECT}")
+_MOST_STARRED = re.compile(rf"(?:(?:what is|what's|which is) )?{_YOUR}(?:most[- ]starred|top[- ]starred|"
+                           rf"highest[- ]starred|most popular) (?:project|repo|repository)(?: on github)?")
+_TOP_N = re.compile(rf"(?:(?:what are|show me|show|list) )?{_YOUR}top (?P<n>\d+|three|five|ten) {_PROJECTS}"
+                    r"(?: by stars)?")
+_LANGUAGES = re.compile(r"(?:what|which) (?:programming )?languages (?:do|did) you (?:use|code in|write|work with)"
+                        rf"|(?:what|which) (?:programming )?languages are {_YOUR}{_PROJECTS} (?:written )?in")
+_BY_SUBJECT = re.compile(rf"(?:(?:which|what) {_YOUR}{_PROJECTS}(?: {_BUILT})? {_USING} {_SUBJECT})"
+                         rf"|(?:(?:list|show)(?: me)? {_YOUR}{_PROJECTS} (?:in|with|using) {_SUBJECT})")
+# Any of these changes the meaning of an otherwise matching question; leave it to the model
+_NEGATION = re.compile(r"\b(?:not|no|never|without|except|excluding|besides|other than)\b|n't\b")
+_NUMBERS = {"three": 3, "five": 5, "ten": 10}
+# Languages worth a definite "none" when the portfolio has no repo in them (only as the whole subject)
+_KNOWN_LANGUAGES = {
+    "rust": "Rust", "go": "Go", "golang": "Go", "kotlin": "Kotlin", "swift": "Swift", "c++": "C++", "c#": "C#",
+    "ruby": "Ruby", "php": "PHP", "scala": "Scala", "haskell": "Haskell", "elixir": "Elixir", "dart": "Dart",
+    "python": "Python", "java": "Java", "javascript": "JavaScript", "typescript": "TypeScript",
+}
+# Everyday words that are also language/topic names: never picked out of free text
+_AMBIGUOUS = {"go", "c", "r", "d", "v", "ai", "api", "app", "web", "data", "code", "cli", "bot"}
+
+class FastPathResult:
+    __slots__ = ("intent", "answer", "context")
+
+    def __init__(self, intent: str, answer: Optional[str] = None, context: Optional[str] = None):
+        self.intent = intent
+        self.answer = answer    # complete deterministic answer: no Gemini call
+        self.context = context  # or just the matching rows, attached to the Gemini turn
+
+
+class FastPathMatcher:
+    """
+    Deterministic intent matcher in front of the LLM for factual portfolio
+    questions ("how many projects in 2025?", "which repos use Rust?",
+    "most-starred project?"). These are answered straight from the
+    PortfolioIndex. Questions that merely mention a known language, topic or
+    year get the matching rows attached instead, so Gemini quotes exact data.
+    Only short questions qualify (FAST_PATH_MAX_CHARS), the pattern must cover
+    the whole question and its subject must name a language or topic exactly;
+    negations and extra clauses go to the model.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, max_chars: Optional[int] = None, max_rows: int = 10):
+        self.enabled = enabled if enabled is not None else os.getenv("FAST_PATH_ENABLED", "1").lower() in ("1", "true", "yes")
+        self.max_chars = max_chars or int(os.getenv("FAST_PATH_MAX_CHARS", "160"))
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.answered = 0
+        self.injected = 0
+        self.misses = 0
+
+    def match(self, message: str, index: Optional[PortfolioIndex]) -> Optional[FastPathResult]:
+        if not self.enabled or index is None or not len(index):
+            return None
+        text = message.lower().strip()
+        result = self._match(text, index) if len(text) <= self.max_chars else None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            elif result.answer:
+                self.answered += 1
+            else:
+                self.injected += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.answered + self.injected + self.misses
+            return {
+                "enabled": self.enabled,
+                "answered": self.answered,
+                "injected": self.injected,
+                "misses": self.misses,
+                "answer_rate": round(self.answered / total, 3) if total else 0.0,
+            }
+
+    def _match(self, text: str, index: PortfolioIndex) -> Optional[FastPathResult]:
+        text = " ".join(text.replace("\u2019", "'").rstrip("?!. ").split())
+        if _NEGATION.search(text):
+            return None
+
+        count = _COUNT.fullmatch(text)
+        if count:
+            if count.group("year") and not index.years_exact:
+                return None  # profile synced before creation dates were recorded
+            if count.group("year"):
+                rows, scope = index.rows_by_year(int(count.group("year"))), f"from {count.group('year')}"
+            else:
+                rows, scope = list(range(len(index))), "in total"
+            return FastPathResult("count", self._count_answer(index, rows, scope))
+        count = _COUNT_SUBJECT.fullmatch(text)
+        if count:
+            subject = self._resolve(count.group(1), index)
+            if subject is None:
+                return None
+            return FastPathResult("count", self._count_answer(index, subject[1], f"with {subject[0]}"))
+
+        if _MOST_STARRED.fullmatch(text):
+            rows = index.top_starred(5)
+            best = index.row(rows[0])
+            answer = (f"My most-starred project is **{best['name']}** (★{best['stars']}): "
+                      f"{best['description']}\n\nTop projects by stars:\n{index.format_rows(rows)}")
+            return FastPathResult("most_starred", answer)
+
+        top = _TOP_N.fullmatch(text)
+        if top:
+            n = _NUMBERS.get(top.group("n")) or int(top.group("n"))
+            rows = index.top_starred(min(n, self.max_rows))
+            return FastPathResult("top_n", f"My top {len(rows)} projects by stars:\n{index.format_rows(rows)}")
+
+        if _LANGUAGES.fullmatch(text):
+            breakdown = ", ".join(f"{language} ({n})" for language, n in index.language_counts())
+            return FastPathResult("languages", f"Languages across my GitHub projects: {breakdown}.")
+
+        which = _BY_SUBJECT.fullmatch(text)
+        if which:
+            phrase = next(group for group in which.groups() if group)
+            subject = self._resolve(phrase, index)
+            if subject is None:
+                known = _KNOWN_LANGUAGES.get(phrase.strip())
+                if known is None:
+                    return None
+                subject = (known, [])
+            name, rows = subject
+            verb = "uses" if len(rows) == 1 else "use"
+            answer = (f"{len(rows)} of my projects {verb} {name}:\n{index.format_rows(rows, self.max_rows)}"
+                      if rows else f"I don't have a project with {name} in my GitHub records.")
+            return FastPathResult("by_subject", answer)
+
+        # Not a pure lookup, but the exact rows still beat retrieval guesses
+        year = re.search(r"\b(20\d\d)\b", text)
+        subject = self._mentioned(_WORDS.findall(text), index)
+        if subject:
+            rows = subject[1]
+        else:
+            rows = index.rows_by_year(int(year.group(1))) if year and index.years_exact else []
+        if rows:
+            return FastPathResult("context", context="PORTFOLIO INDEX (exact GitHub data):\n" +
+                                  index.format_rows(rows, self.max_rows))
+        return None
+
+    @staticmethod
+    def _resolve(phrase: str, index: PortfolioIndex):
+        """(display name, rows) if the whole phrase names a language or topic of the index"""
+        phrase = phrase.strip()
+        if phrase.startswith("the "):
+            phrase = phrase[4:]
+        if phrase == "golang":
+            phrase = "go"
+        if index.language_id(phrase) is not None:
+            return index.languages[index.language_id(phrase)], index.rows_by_language(phrase)
+        if index.topic_id(phrase) is not None:
+            return index.topics[index.topic_id(phrase)], index.rows_by_topic(phrase)
+        return None
+
+    @staticmethod
+    def _mentioned(words: List[str], index: PortfolioIndex):
+        """(display name, rows) of the first unambiguous language or topic token in free text"""
+        words = [word.rstrip(".,") for word in words if word.rstrip(".,") not in _AMBIGUOUS]
+        for word in words:
+            if index.language_id(word) is not None:
+                return index.languages[index.language_id(word)], index.rows_by_language(word)
+        for word in words:
+            if index.topic_id(word) is not None:
+                return index.topics[index.topic_id(word)], index.rows_by_topic(word)
+        return None
+
+    @staticmethod
+    def _count_answer(index: PortfolioIndex, rows: List[int], scope: str) -> str:
+        if not rows:
+            return f"I don't have any projects {scope} in my GitHub records."
+        return (f"{len(rows)} projects {scope} on my GitHub. The most-starred ones:\n"
+                f"{index.format_rows(rows, 5)}")
@@ -0,0 +1,324 @@
+# backend/app/services/gemini_caller.py
+import os
+import math
+import time
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import httpx
+from google.genai import errors as genai_errors
+from backend.app.services import metrics
+
+# attempt(model, timeout_seconds) -> result: one Gemini request (built for that model)
+Attempt = Callable[[str, float], Any]
+
+# Failures of Gemini itself (or the way to it). Anything else is a bug in the
+# caller's own code: it is neither retried on the fallback model nor held against the breaker.
+UPSTREAM_ERRORS = (genai_errors.APIError, httpx.HTTPError, TimeoutError, ConnectionError)
+
+
+def is_upstream_error(error: BaseException) -> bool:
+    return isinstance(error, UPSTREAM_ERRORS)
+
+
+class BudgetExceeded(Exception):
+    """No Gemini attempt finished within the endpoint's latency budget."""
+
+    def __init__(self, endpoint: str, budget: float):
+        super().__init__(f"{endpoint} exceeded its {budget:.1f}s latency budget")
+        self.endpoint = endpoint
+        self.budget = budget
+
+
+class LatencyWindow:
+    """Durations of the last `size` successful attempts (source of the hedge delay)"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(math.ceil(q * len(ordered))) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class CircuitBreaker:
+    """
+    Watches the last `window` calls to the primary model. Opens when at least
+    `min_calls` were seen and the share of failed calls reaches `error_rate`,
+    or the share of calls slower than `slow_seconds` reaches `slow_rate`.
+    While open, traffic goes to the fallback model; after `cooldown_seconds`
+    one probe call is let through (half-open) and closes it again on success.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, window: Optional[int] = None, min_calls: Optional[int] = None,
+                 error_rate: Optional[float] = None, slow_rate: Optional[float] = None,
+                 slow_seconds: Optional[float] = None, cooldown_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window or int(os.getenv("BREAKER_WINDOW", "20"))
+        self.min_calls = min_calls or int(os.getenv("BREAKER_MIN_CALLS", "5"))
+        self.error_rate = error_rate or float(os.getenv("BREAKER_ERROR_RATE", "0.5"))
+        self.slow_rate = slow_rate or float(os.getenv("BREAKER_SLOW_RATE", "0.5"))
+        self.slow_seconds = slow_seconds or float(os.getenv("BREAKER_SLOW_SECONDS", "8"))
+        self.cooldown_seconds = cooldown_seconds or float(os.getenv("BREAKER_COOLDOWN_SECONDS", "30"))
+        self._clock = clock
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=self.window)  # (ok, seconds)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """True if the next call may use the primary model"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.cooldown_seconds:
+                self._transition(self.HALF_OPEN)
+            # A probe that never reported back (e.g. an abandoned stream) is replaced after a cooldown
+            if self._state == self.HALF_OPEN and (
+                    not self._probing or self._clock() - self._probe_started >= self.cooldown_seconds):
+                self._probing = True
+                self._probe_started = self._clock()
+                return True
+            return False
+
+    def record(self, ok: bool, seconds: float):
+        """Outcome of one call that was routed to the primary model"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probing = False
+                if ok and seconds < self.slow_seconds:
+                    self._calls.clear()
+                    self._transition(self.CLOSED)
+                else:
+                    self._open()
+                return
+            if self._state == self.OPEN:
+                return  # a straggler started before the breaker opened
+            self._calls.append((ok, seconds))
+            if len(self._calls) < self.min_calls:
+                return
+            failed = sum(1 for call_ok, _ in self._calls if not call_ok)
+            slow = sum(1 for call_ok, s in self._calls if call_ok and s >= self.slow_seconds)
+            if failed / len(self._calls) >= self.error_rate or slow / len(self._calls) >= self.slow_rate:
+                self._open()
+
+    # Caller holds the lock
+    def _open(self):
+        self._opened_at = self._clock()
+        self.opened += 1
+        self._transition(self.OPEN)
+
+    def _transition(self, state: str):
+        self._state = state
+        metrics.BREAKER_TRANSITIONS.inc(state=state)
+        print(f"🔌 Gemini circuit breaker -> {state}")
+
+
+class GeminiCaller:
+    """
+    Runs Gemini requests under a per-endpoint latency budget
+    (GEMINI_BUDGET_<ENDPOINT>_SECONDS). If the first attempt is still running
+    after the p95 of recent attempts (hedge delay), an identical second
+    attempt is fired and whichever finishes first wins. An attempt that fails
+    fast is retried once on the fallback model while budget remains, and
+    the circuit breaker moves all traffic to the fallback model
+    (GEMINI_FALLBACK_MODEL) while the primary one is failing or slow.
+
+    Attempts run on a small dedicated pool; losers are abandoned, and the
+    request timeout passed to each attempt (the budget left) makes the SDK
+    give up on them too.
+    """
+
+    def __init__(self, model_name: str, fallback_model: Optional[str] = None,
+                 budgets: Optional[Dict[str, float]] = None, hedge: Optional[bool] = None,
+                 hedge_min_seconds: Optional[float] = None, hedge_default_seconds: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None, max_workers: Optional[int] = None):
+        self.model_name = model_name
+        self.fallback_model = fallback_model if fallback_model is not None else os.getenv(
+            "GEMINI_FALLBACK_MODEL", "gemini-2.5-flash-lite")
+        self.budgets = budgets or {
+            "chat": float(os.getenv("GEMINI_BUDGET_CHAT_SECONDS", "20")),
+            "report": float(os.getenv("GEMINI_BUDGET_REPORT_SECONDS", "60")),
+        }
+        self.hedge = hedge if hedge is not None else os.getenv("GEMINI_HEDGE", "1").lower() in ("1", "true", "yes")
+        self.hedge_min_seconds = hedge_min_seconds if hedge_min_seconds is not None else float(
+            os.getenv("GEMINI_HEDGE_MIN_SECONDS", "0.5"))
+        # Until enough attempts were seen to estimate the p95
+        self.hedge_default_seconds = hedge_default_seconds or float(os.getenv("GEMINI_HEDGE_DEFAULT_SECONDS", "6"))
+        self.hedge_min_samples = 20
+        self.breaker = breaker or CircuitBreaker()
+        self._windows: Dict[Tuple[str, str], LatencyWindow] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.getenv("GEMINI_ATTEMPT_WORKERS", "32")), thread_name_prefix="gemini")
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.timeouts = 0
+
+    def choose_model(self) -> str:
+        """The primary model, or the fallback one while the breaker is open"""
+        if self.fallback_model and not self.breaker.allow():
+            return self.fallback_model
+        return self.model_name
+
+    def budget(self, endpoint: str) -> float:
+        return self.budgets.get(endpoint, max(self.budgets.values()))
+
+    def hedge_delay(self, endpoint: str, model: str) -> float:
+        window = self._window(endpoint, model)
+        p95 = window.quantile(0.95) if len(window) >= self.hedge_min_samples else None
+        return max(self.hedge_min_seconds, p95 if p95 is not None else self.hedge_default_seconds)
+
+    def call(self, endpoint: str, attempt: Attempt) -> Any:
+        """
+        attempt(model, timeout_seconds) under the endpoint's budget, hedged and
+        with fallback. Raises BudgetExceeded, or the last attempt's error.
+        Keep request building out of `attempt`: only upstream errors are retried.
+        """
+        started = time.monotonic()
+        budget = self.budget(endpoint)
+        deadline = started + budget
+        first_model = self.choose_model()
+        pending: Dict[Future, Tuple[str, str]] = {}
+        self._submit(pending, endpoint, attempt, first_model,
+                     "primary" if first_model == self.model_name else "fallback", deadline)
+        hedge_at = started + self.hedge_delay(endpoint, first_model) if self.hedge else math.inf
+        hedged = retried = False
+        last_error: Optional[Exception] = None
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            wake = deadline if hedged or hedge_at >= deadline else hedge_at
+            done, _ = wait(list(pending), timeout=max(0.0, wake - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                path, model = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not is_upstream_error(e):
+                        self._finish(endpoint, first_model, path, "error", started, upstream=False)
+                        raise
+                    last_error = e
+                    continue
+                self._finish(endpoint, first_model, path, "ok", started)
+                return result
+
+            now = time.monotonic()
+            if not pending:
+                if self.fallback_model and not retried and first_model != self.fallback_model and now < deadline:
+                    # Primary failed fast: one try on the lighter model with the time left
+                    retried = hedged = True
+                    self._submit(pending, endpoint, attempt, self.fallback_model, "fallback", deadline)
+                    continue
+                self._finish(endpoint, first_model, "primary", "error", started)
+                raise last_error
+            if now >= deadline:
+                self._finish(endpoint, first_model, "primary", "timeout", started)
+                raise BudgetExceeded(endpoint, budget)
+            if not hedged and now >= hedge_at:
+                hedged = True
+                with self._lock:
+                    self.hedged += 1
+                self._submit(pending, endpoint, attempt, first_model, "hedge", deadline)
+
+    def observe(self, endpoint: str, model: str, ok: bool, seconds: float):
+        """
+        Outcome of a call made outside call() (streaming), for the breaker and the
+        hedge delay. Report failures only for upstream errors (is_upstream_error).
+        """
+        if ok:
+            self._window(endpoint, model).observe(seconds)
+        if self.fallback_model and model == self.model_name:
+            self.breaker.record(ok, seconds)
+        metrics.GEMINI_CALLS.inc(endpoint=endpoint, path="primary" if model == self.model_name else "fallback",
+                                 outcome="ok" if ok else "error")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "model": self.model_name,
+                "fallback_model": self.fallback_model or None,
+                "breaker": self.breaker.state,
+                "breaker_opened": self.breaker.opened,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "fallbacks": self.fallbacks,
+                "timeouts": self.timeouts,
+            }
+        stats["hedge_delay_seconds"] = {
+            endpoint: round(self.hedge_delay(endpoint, self.model_name), 3) for endpoint in self.budgets
+        }
+        return stats
+
+    def _window(self, endpoint: str, model: str) -> LatencyWindow:
+        with self._lock:
+            window = self._windows.get((endpoint, model))
+            if window is None:
+                window = self._windows[(endpoint, model)] = LatencyWindow()
+            return window
+
+    def _submit(self, pending: Dict[Future, Tuple[str, str]], endpoint: str, attempt: Attempt,
+                model: str, path: str, deadline: float):
+        def run():
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with metrics.span("gemini"):
+                    result = attempt(model, max(0.1, deadline - time.monotonic()))
+                outcome = "ok"
+                # Late losers count too, or the p95 would only ever see the fast half
+                self._window(endpoint, model).observe(time.perf_counter() - started)
+                return result
+            finally:
+                metrics.GEMINI_ATTEMPT_SECONDS.observe(
+                    time.perf_counter() - started, endpoint=endpoint, path=path, outcome=outcome)
+
+        # The caller's context goes along (e.g. the request's trace spans)
+        future = self._executor.submit(contextvars.copy_context().run, run)
+        pending[future] = (path, model)
+
+    def _finish(self, endpoint: str, first_model: str, path: str, outcome: str, started: float,
+                upstream: bool = True):
+        elapsed = time.monotonic() - started
+        if self.fallback_model and first_model == self.model_name and upstream:
+            # A call rescued by the fallback model still counts against the primary one
+            self.breaker.record(outcome == "ok" and path != "fallback", elapsed)
+        with self._lock:
+            if outcome == "timeout":
+                self.timeouts += 1
+            if path == "hedge" and outcome == "ok":
+                self.hedge_wins += 1
+            if path == "fallback" and outcome == "ok":
+                self.fallbacks += 1
+        metrics.GEMINI_CALLS.inc(endpoint=endpoint, path=path, outcome=outcome)
@@ -1,91 +1,270 @@
 import os
+import re
+import time
+import threading
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from backend.app.services import metrics
+from backend.app.services.portfolio_index import INDEX_FILE, PortfolioIndex
+from backend.app.services.repo_enrichment import RepoEnricher
+
+_LAST_PAGE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+# Bump when the processed project record changes shape: cached records are then rebuilt
+PROJECT_SCHEMA = 2
+
+
+class _EnrichedProjects(list):
+    """
+    The profile's project list, each merged with its enrichment record only as
+    the JSON encoder reaches it. The list itself holds the plain projects (so
+    len() and truthiness are right); iteration yields the merged copies.
+    """
+
+    def __init__(self, projects: List[Dict[str, Any]], enricher: Optional[RepoEnricher]):
+        super().__init__(projects)
+        self.enricher = enricher
+
+    def __iter__(self):
+        for project in super().__iter__():
+            details = self.enricher.lookup(project["name"]) if self.enricher else None
+            yield {**project, **details} if details else project
 
 class GitHubSyncService:
-    def __init__(self, username: str = "vero-code"):
+    def __init__(self, username: str = "vero-code", cache_path: str = "backend/data/github_cache.json",
+                 session: Optional[requests.Session] = None, max_workers: int = 4, sleep=time.sleep,
+                 enricher: Optional[RepoEnricher] = None):
         self.username = username
         self.api_url = f"https://api.github.com/users/{username}/repos"
-        self.token = os.getenv("GITHUB_TOKEN") 
+        self.token = os.getenv("GITHUB_TOKEN")
         self.headers = {
             "Authorization": f"token {self.token}",
             "Accept": "application/vnd.github.v3+json"
         } if self.token else {}
 
+        # Pooled keep-alive connections, shared by the parallel page fetches
+        self.max_workers = max_workers
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max_workers))
+        self.session = session
+        self.session.headers.update(self.headers)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        # On-disk cache: ETag + body per page URL, processed record per repo
+        self.cache_path = cache_path
+        self.cache = self._load_cache()
+        self.max_retries = 3
+        self.max_rate_limit_wait = 60
+
+        # Sync stats
+        self.requests_made = 0
+        self.not_modified = 0
+        self.changed = False
+        self.reprocessed = 0
+        # Columnar index of the last processed profile (saved next to it)
+        self.portfolio_index: Optional[PortfolioIndex] = None
+        # Optional README / languages / commits stage, merged in by save_to_json
+        self.enricher = enricher
+
     def fetch_repos(self) -> List[Dict[str, Any]]:
-        """Fetches repositories, handling pagination."""
-        repos = []
-        page = 1
+        """Fetches repositories: page 1 first, then the remaining pages in parallel."""
         print(f"📡 Connecting to GitHub API for user: {self.username}...")
-        
-        while True:
-            params = {"per_page": 100, "page": page, "sort": "updated"}
-            try:
-                response = requests.get(self.api_url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data:
-                    break
-                
-                repos.extend(data)
-                page += 1
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Error fetching data: {e}")
-                return []
-
-        print(f"✅ Fetched {len(repos)} raw repositories.")
+        self.changed = False
+        started = time.perf_counter()
+
+        try:
+            first_page, link = self._get_page(1)
+            last_page = self._last_page(link)
+            repos = list(first_page)
+            if last_page > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    # map() keeps page order
+                    for page, _ in pool.map(self._get_page, range(2, last_page + 1)):
+                        repos.extend(page)
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error fetching data: {e}")
+            metrics.ERRORS.inc(component="github")
+            metrics.GITHUB_FETCH_SECONDS.observe(time.perf_counter() - started, outcome="error")
+            return []
+
+        metrics.GITHUB_FETCH_SECONDS.observe(time.perf_counter() - started, outcome="ok")
+
+        self._save_cache()
+        print(f"✅ Fetched {len(repos)} raw repositories "
+              f"({self.not_modified}/{self.requests_made} pages unchanged).")
         return repos
 
+    def _get_page(self, page: int) -> Tuple[List[Dict], str]:
+        """GETs one page with If-None-Match; a 304 is served from the disk cache."""
+        params = {"per_page": 100, "page": page, "sort": "updated"}
+        cache_key = f"{self.api_url}?page={page}"
+        cached = self.cache["pages"].get(cache_key)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+        response = self._request(params, headers)
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.not_modified += 1
+            metrics.GITHUB_REQUESTS.inc(result="not_modified")
+            return cached["body"], cached.get("link", "")
+
+        response.raise_for_status()
+        metrics.GITHUB_REQUESTS.inc(result="modified")
+        body = response.json()
+        link = response.headers.get("Link", "")
+        etag = response.headers.get("ETag")
+        with self._lock:
+            if etag:
+                self.cache["pages"][cache_key] = {"etag": etag, "body": body, "link": link}
+            self.changed = True
+        return body, link
+
+    def _request(self, params: Dict, headers: Dict) -> requests.Response:
+        """GET with rate-limit-aware retries (waits for X-RateLimit-Reset / Retry-After)."""
+        for attempt in range(self.max_retries + 1):
+            response = self.session.get(self.api_url, params=params, headers=headers, timeout=30)
+            with self._lock:
+                self.requests_made += 1
+            wait = self._retry_delay(response, attempt)
+            if wait is None or attempt == self.max_retries:
+                return response
+            print(f"⏳ GitHub returned {response.status_code}, retrying in {wait:.0f}s...")
+            self._sleep(wait)
+        return response
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response should be used as is."""
+        status = response.status_code
+        if status in (403, 429):
+            if "Retry-After" in response.headers:
+                return min(float(response.headers["Retry-After"]), self.max_rate_limit_wait)
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                reset = float(response.headers.get("X-RateLimit-Reset", time.time()))
+                return min(max(reset - time.time(), 1), self.max_rate_limit_wait)
+            return None
+        if status >= 500:
+            return 2 ** attempt
+        return None
+
+    @staticmethod
+    def _last_page(link: str) -> int:
+        match = _LAST_PAGE.search(link or "")
+        return int(match.group(1)) if match else 1
+
     def process_data(self, raw_repos: List[Dict]) -> Dict[str, Any]:
         """Filters and cleans data for the AI Agent context."""
         processed_projects = []
-        
+        # Records cached under an older schema (e.g. without "created") are all re-processed
+        previous = self.cache["projects"] if self.cache.get("project_schema") == PROJECT_SCHEMA else {}
+        current = {}
+        self.reprocessed = 0
+
         cutoff_date = datetime(2025, 1, 1).date()
 
         for repo in raw_repos:
+            # Only repos whose updated_at moved since the last sync are re-processed
+            cached = previous.get(repo["name"])
+            if cached and cached["updated_at"] == repo["updated_at"]:
+                current[repo["name"]] = cached
+                if cached["project"]:
+                    processed_projects.append(cached["project"])
+                continue
+            self.reprocessed += 1
+
             updated_at = datetime.strptime(repo["updated_at"], "%Y-%m-%dT%H:%M:%SZ").date()
             created_at = datetime.strptime(repo["created_at"], "%Y-%m-%dT%H:%M:%SZ").date()
 
-            if updated_at < cutoff_date and created_at < cutoff_date:
-                continue
-            
-            # if repo["fork"]: continue
-
-            project_info = {
-                "name": repo["name"],
-                "description": repo["description"] or "No description provided.",
-                "url": repo["html_url"],
-                "stars": repo["stargazers_count"],
-                "language": repo["language"],
-                "topics": repo["topics"],
-                "last_update": str(updated_at),
-                "is_fork": repo["fork"]
-            }
-            processed_projects.append(project_info)
+            project_info = None
+            if not (updated_at < cutoff_date and created_at < cutoff_date):
+                # if repo["fork"]: continue
+
+                project_info = {
+                    "name": repo["name"],
+                    "description": repo["description"] or "No description provided.",
+                    "url": repo["html_url"],
+                    "stars": repo["stargazers_count"],
+                    "language": repo["language"],
+                    "topics": repo["topics"],
+                    "last_update": str(updated_at),
+                    "created": str(created_at),
+                    "is_fork": repo["fork"]
+                }
+                processed_projects.append(project_info)
+            current[repo["name"]] = {"updated_at": repo["updated_at"], "project": project_info}
 
         processed_projects.sort(key=lambda x: (x["stars"], x["last_update"]), reverse=True)
 
-        return {
+        self.cache["projects"] = current
+        self.cache["project_schema"] = PROJECT_SCHEMA
+        self._save_cache()
+
+        profile = {
             "generated_at": str(datetime.now()),
             "total_projects_2025_2026": len(processed_projects),
             "projects": processed_projects
         }
+        # Exact answers for "how many / which / most-starred" questions (see fast_path.py)
+        self.portfolio_index = PortfolioIndex.from_profile(profile)
+        return profile
+
+    def enrich(self, raw_repos: List[Dict]) -> int:
+        """Runs the enrichment stage (if configured); returns how many repos were fetched."""
+        if self.enricher is None or not raw_repos:
+            return 0
+        return self.enricher.enrich(raw_repos)
 
     def save_to_json(self, data: Dict, filepath: str = "backend/data/dynamic_profile.json"):
-        """Saves the processed data to a JSON file."""
+        """
+        Saves the processed data to a JSON file (and its portfolio index next to it).
+        Projects are written one at a time, each merged with its enrichment record
+        read back from the enricher's store, and the file is swapped in atomically.
+        """
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        profile = {**data, "projects": _EnrichedProjects(data["projects"], self.enricher)}
+        # iterencode (not dumps) so merged projects are encoded and written one at a time
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for chunk in encoder.iterencode(profile):
+                f.write(chunk)
+        os.replace(tmp_path, filepath)
+        if self.portfolio_index is not None and self.portfolio_index.source == str(data.get("generated_at", "")):
+            self.portfolio_index.save(os.path.join(os.path.dirname(filepath), INDEX_FILE))
         print(f"💾 Profile saved to {filepath} ({data['total_projects_2025_2026']} projects)")
 
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("username") == self.username:
+                return cache
+        except (FileNotFoundError, ValueError):
+            pass
+        return {"username": self.username, "pages": {}, "projects": {}}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
 if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
-    
+
     syncer = GitHubSyncService(username="vero-code")
     raw_data = syncer.fetch_repos()
-    clean_data = syncer.process_data(raw_data)
-    syncer.save_to_json(clean_data)
\ No newline at end of file
+    if not syncer.changed and os.path.exists("backend/data/dynamic_profile.json"):
+        # Every page answered 304: nothing to re-process, and the profile file stays untouched
+        print("💤 No changes on GitHub since the last sync.")
+    else:
+        clean_data = syncer.process_data(raw_data)
+        syncer.save_to_json(clean_data)
@@ -0,0 +1,179 @@
+# backend/app/services/injection_filter.py
+import os
+import re
+import time
+import threading
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Same reply the model gives under rule 5 of the persona prompt (the frontend styles it)
+SECURITY_ALERT = "[SECURITY_ALERT] Access Denied. Ah ah ah, you didn't say the magic word! 🦖"
+
+# What an override/reveal must name to count: the assistant's own instructions, not any rules or guidelines
+_TARGET = (r"(((all|any|the|these|those|your|its)\s+)?((previous|prior|above|earlier|initial|original|hidden|secret|system)"
+           r"\s+)+(instructions?|prompts?|directives|rules|guidelines|messages?)|\b(your|its)\s+(instructions?|prompts?"
+           r"|directives|rules|guidelines))\b")
+# An imperative aimed at the assistant: the verb opens a sentence, or follows "and"/"please"/"you must"/...
+_LEAD = (r"(^|[.!?:;\]>\n]\s*|\b(and|then|now|please|(can|could|would|will)\s+you|you\s+(must|should|will|need\s+to|"
+         r"have\s+to|are\s+to)|i\s+(want|need)\s+you\s+to)\s+)(please\s+|now\s+|just\s+)?")
+_OVERRIDE = r"\b(ignor(e|es|ing)|disregard(s|ing)?|forget|override)\b.{0,40}" + _TARGET
+_REVEAL = r"\b(reveal|show|print|repeat|output|leak|display|tell\s+me)\b.{0,40}" + _TARGET
+_ACT_AS = (r"\b(act|behave)\s+as\s+(an?\s+)?(linux|bash|unix|windows|python|sql)?\s*"
+           r"(terminal|shell|console|interpreter)\b")
+
+# Structural attack patterns (on the lowercased message), weight per pattern. Override, reveal and act-as
+# only reach the threshold as an imperative; merely mentioning them scores less and needs other evidence.
+PATTERNS = [
+    (_LEAD + _OVERRIDE, 1.0),
+    (_OVERRIDE, 0.4),
+    (_LEAD + _REVEAL, 1.0),
+    (_REVEAL, 0.4),
+    (_LEAD + _ACT_AS, 1.0),
+    (_ACT_AS, 0.4),
+    (r"\byou\s+are\s+(now|no\s+longer)\b", 0.6),
+    (r"\bfrom\s+now\s+on\b.{0,40}\b(you|respond|answer|act)\b", 0.5),
+    (r"\b(pretend|imagine|roleplay|role-play)\b.{0,30}\b(you|are|to\s+be)\b.{0,30}\b(not|no|without|unrestricted|evil|free)\b", 0.7),
+    (r"\b(new|updated|real)\s+(instructions?|rules|system\s+prompt)\s*:", 1.0),
+    (r"</?\s*(system|instructions?|im_start|im_end)\s*>|\[/?(system|inst)\]", 1.0),
+    # Mode names only count when the message tries to switch them on, not when it asks about them
+    (r"\b(enable|activate|enter|switch\s+(on|to|into)|turn\s+on|go\s+into|you\s+are\s+(now\s+)?in)\b.{0,20}"
+     r"\b(developer|god|dan|jailbreak|jailbroken|unrestricted)\s+mode\b", 1.0),
+    (r"\bdo\s+anything\s+now\b", 0.6),
+    # Instruction-override context: on its own harmless, next to attack vocabulary it tips the score
+    (r"\b(please\s+comply|comply|obey|you\s+must\s+(now\s+)?(answer|reply|respond|obey)|"
+     r"you\s+will\s+(now\s+)?(answer|reply|respond|act))\b", 0.5),
+    (r"\bbegin\s+your\s+(response|reply|answer)\s+with\b", 0.6),
+    (r"\b(repeat|print|output|copy)\b.{0,20}\b(words|text|everything|all)\s+(above|before\s+this)\b", 1.0),
+]
+
+# Attack vocabulary for the keyword automaton (whole words after normalization), weight per keyword
+KEYWORDS = {
+    "jailbreak": 0.5, "jailbroken": 0.6, "dan": 0.4, "unfiltered": 0.6, "uncensored": 0.6,
+    "no restrictions": 0.6, "without restrictions": 0.6, "no limitations": 0.5, "no rules": 0.5,
+    "ignore all": 0.6, "ignore previous": 0.8, "ignore the above": 1.0, "disregard": 0.4,
+    "previous instructions": 0.6, "prior instructions": 0.6, "your instructions": 0.4,
+    "system prompt": 0.3, "initial prompt": 0.5, "prompt injection": 0.2,
+    "bypass": 0.4, "override": 0.3, "sudo": 0.5, "admin mode": 0.6, "root access": 0.4,
+    "act as": 0.3, "pretend": 0.3, "roleplay": 0.3, "stay in character": 0.5,
+    "safety filters": 0.5, "content policy": 0.5, "opposite mode": 1.0, "evil": 0.3,
+    "verbatim": 0.3, "the words above": 0.6, "everything above": 0.5,
+}
+
+
+class Verdict(NamedTuple):
+    blocked: bool
+    score: float
+    hits: List[str]
+
+
+class AhoCorasick:
+    """Multi-keyword matcher: one pass over the text finds every keyword it contains."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # Breadth-first failure links (depth-1 states fail to the root)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0) if state else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        found: Set[int] = set()
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+_ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+class InjectionFilter:
+    """
+    Local first-line defense in front of Gemini: scores a message with compiled
+    attack patterns plus an Aho-Corasick keyword automaton and blocks it when
+    the score reaches the threshold. Anything subtler is still left to rule 5
+    of the persona prompt.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, enabled: Optional[bool] = None):
+        self.threshold = threshold or float(os.getenv("INJECTION_THRESHOLD", "1.0"))
+        if enabled is None:
+            enabled = os.getenv("INJECTION_FILTER_ENABLED", "1").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+        self._patterns = [(re.compile(p, re.DOTALL), w) for p, w in PATTERNS]
+        # Keywords are padded with spaces so they only match whole words of the normalized text
+        self._keyword_weights = list(KEYWORDS.values())
+        self._keyword_names = list(KEYWORDS)
+        self._automaton = AhoCorasick(f" {k} " for k in KEYWORDS)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.checked = 0
+        self.blocked = 0
+        self.total_seconds = 0.0
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        return unicodedata.normalize("NFKC", message).translate(_ZERO_WIDTH).lower()
+
+    def check(self, message: str) -> Verdict:
+        if not self.enabled:
+            return Verdict(False, 0.0, [])
+        started = time.perf_counter()
+
+        text = self.normalize(message)
+        hits, score = [], 0.0
+        for pattern, weight in self._patterns:
+            if pattern.search(text):
+                hits.append(pattern.pattern[:40])
+                score += weight
+        for index in self._automaton.find(f" {_NON_WORD.sub(' ', text)} "):
+            hits.append(self._keyword_names[index])
+            score += self._keyword_weights[index]
+
+        blocked = score >= self.threshold
+        with self._lock:
+            self.checked += 1
+            self.blocked += blocked
+            self.total_seconds += time.perf_counter() - started
+        return Verdict(blocked, round(score, 2), hits)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "checked": self.checked,
+                "blocked": self.blocked,
+                "avg_check_us": round(self.total_seconds / self.checked * 1e6, 1) if self.checked else 0.0,
+            }
@@ -0,0 +1,181 @@
+# backend/app/services/knowledge.py
+import os
+import json
+import hashlib
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from pypdf import PdfReader
+
+DATA_FILES = ("dynamic_profile.json", "resume.pdf", "persona.json")
+# Pre-extracted resume text, keyed by the PDF's content hash (built by run_sync / the Docker build)
+RESUME_CACHE = "resume_cache.json"
+
+# Who the agent represents. A persona's data dir may override any of these in persona.json;
+# without one (the original single-persona setup) the prompt is exactly the historical one.
+DEFAULT_IDENTITY = {
+    "name": "Veronika Kashtanova",
+    "short_name": "Veronika",
+    "possessive": "her",
+    "title": "Senior AI Engineer & Founder",
+    "location": "Ukraine",
+    "report_role": "Senior AI Engineer / Founder",
+    "github_username": "vero-code",
+    "skill_example": "Yes. In 'Stream Refinery', I used Python to build a Kafka consumer...",
+    "synthesis_example": "With a Master's degree and 10 years of Backend experience (Resume), I recently pivoted "
+                         "to Generative AI, shipping over 37 projects in 2025 (GitHub).",
+    "contact": "You can reach me via X (@veron_code) or check my code on GitHub (https://github.com/vero-code).",
+    "availability": "Open to Lead/Founder roles in Big Tech and Grant opportunities.",
+}
+
+
+class KnowledgeSnapshot:
+    """
+    Everything derived from the data files (profile, resume, retrieval index,
+    precomputed instructions). Built completely before it is published, and
+    never mutated afterwards: a reload swaps in a new snapshot, so a request
+    that grabbed the old one keeps a consistent view until it finishes.
+    """
+
+    __slots__ = (
+        "identity", "profile_data", "resume_pages", "resume_text", "retrieval_index", "portfolio_index",
+        "base_system_instruction", "instructions", "fingerprint", "stamp", "digest",
+    )
+
+    def __init__(self, profile_data: Dict[str, Any], resume_pages: List[str], stamp: Tuple, digest: str,
+                 identity: Optional[Mapping[str, str]] = None):
+        self.identity = identity or DEFAULT_IDENTITY
+        self.profile_data = profile_data
+        self.resume_pages = tuple(resume_pages)
+        self.resume_text = "".join(page + "\n" for page in resume_pages)
+        self.stamp = stamp
+        self.digest = digest
+        # Filled in by the agent before the snapshot is published
+        self.retrieval_index = None
+        self.portfolio_index = None
+        self.base_system_instruction = ""
+        self.instructions: Mapping = {}
+        self.fingerprint = ""
+
+
+def data_files_stamp(data_dir: str) -> Tuple:
+    """Cheap change detector for the data files: (mtime, size) of each"""
+    stamp = []
+    for name in DATA_FILES:
+        try:
+            st = os.stat(os.path.join(data_dir, name))
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def data_files_digest(data_dir: str) -> str:
+    """Content hash of the data files (tells a real change from a mere touch)"""
+    digest = hashlib.sha256()
+    for name in DATA_FILES:
+        try:
+            with open(os.path.join(data_dir, name), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_identity(data_dir: str) -> Dict[str, str]:
+    """persona.json merged over DEFAULT_IDENTITY (missing or unreadable file -> the defaults)"""
+    identity = dict(DEFAULT_IDENTITY)
+    try:
+        with open(os.path.join(data_dir, "persona.json"), "r", encoding="utf-8") as f:
+            identity.update({k: str(v) for k, v in json.load(f).items()})
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️ Persona Identity Error ({data_dir}): {e}")
+    return identity
+
+
+def file_sha256(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_resume_pages(data_dir: str) -> Tuple[List[str], bool]:
+    """
+    Returns (page texts, from_cache). Uses the extraction cache when it matches
+    the current resume.pdf; otherwise parses the PDF and refreshes the cache.
+    """
+    pdf_path = os.path.join(data_dir, "resume.pdf")
+    pdf_hash = file_sha256(pdf_path)
+    if pdf_hash is None:
+        return ["Resume not found."], False
+
+    cache_path = os.path.join(data_dir, RESUME_CACHE)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("sha256") == pdf_hash:
+            return cache["pages"], True
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        pages = [page.extract_text() for page in PdfReader(pdf_path).pages]
+    except Exception:
+        return ["Error reading resume."], False
+    _save_resume_cache(cache_path, pdf_hash, pages)
+    return pages, False
+
+
+def build_resume_cache(data_dir: str) -> bool:
+    """Build step: makes sure the extraction cache matches resume.pdf. Returns True if it was rebuilt."""
+    pages, from_cache = load_resume_pages(data_dir)
+    if not from_cache:
+        print(f"📄 Resume extracted ({len(pages)} pages) -> {os.path.join(data_dir, RESUME_CACHE)}")
+    return not from_cache
+
+
+def _save_resume_cache(cache_path: str, pdf_hash: str, pages: List[str]):
+    try:
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sha256": pdf_hash, "pages": pages}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # Read-only filesystem etc.: the next start simply parses again
+        print(f"⚠️ Resume Cache Error: {e}")
+
+
+class KnowledgeWatcher:
+    """
+    Background thread that polls the data files every `interval` seconds and
+    asks the agent to reload when they change, keeping that work off the
+    request path.
+    """
+
+    def __init__(self, agent, interval: Optional[float] = None):
+        self.agent = agent
+        self.interval = interval or float(os.getenv("KNOWLEDGE_CHECK_SECONDS", "30"))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="knowledge-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.agent.reload_knowledge()
+            except Exception as e:
+                print(f"⚠️ Knowledge Reload Error: {e}")
@@ -0,0 +1,223 @@
+# backend/app/services/metrics.py
+import math
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds: from a cache hit (~ms) to a long report (~1 min)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Characters / bytes: from a one-line question to a full-context prompt or a PDF
+SIZE_BUCKETS = (100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Registry:
+    """Set of metrics rendered together in the Prometheus text format (GET /metrics)"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), registry: Optional[Registry] = REGISTRY):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts (not cumulative), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(tuple(str(labels[n]) for n in self.labelnames))
+            return series[2] if series else 0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = 'le="%s"' % _number(bound)
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {count}"
+
+
+# Per-request trace: a list of (span name, seconds) while a request is being traced.
+# The list is shared by reference, so spans recorded on worker threads (the context
+# is copied into BoundedExecutor jobs) end up in the same trace.
+_trace: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("persona_trace", default=None)
+
+
+def start_trace():
+    """Starts collecting spans for the current request; returns a token for end_trace()"""
+    return _trace.set([])
+
+
+def end_trace(token) -> List[Tuple[str, float]]:
+    spans = _trace.get() or []
+    _trace.reset(token)
+    return spans
+
+
+def record_span(name: str, seconds: float):
+    spans = _trace.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str):
+    """Times a block as a trace span (no-op cost when the request is not traced)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+@contextmanager
+def timed(histogram: Histogram, span_name: Optional[str] = None, **labels):
+    """Observes the duration of a block in `histogram` (and as a trace span if named)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        if span_name:
+            record_span(span_name, elapsed)
+
+
+def server_timing(spans: List[Tuple[str, float]]) -> str:
+    """Server-Timing header value; repeated span names are numbered (gemini, gemini-2, ...)"""
+    seen: Dict[str, int] = {}
+    entries = []
+    for name, seconds in spans:
+        seen[name] = seen.get(name, 0) + 1
+        label = name if seen[name] == 1 else f"{name}-{seen[name]}"
+        entries.append(f"{label};dur={seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+# Hot-path metrics
+HTTP_REQUEST_SECONDS = Histogram(
+    "persona_http_request_duration_seconds", "HTTP request latency (until response headers).",
+    ("method", "route", "status"))
+ASK_SECONDS = Histogram(
+    "persona_ask_duration_seconds", "Chat turn latency by outcome (ok, cached, fast_path, blocked, timeout, error).",
+    ("method", "outcome"))
+PROMPT_CHARS = Histogram(
+    "persona_prompt_chars", "Characters sent to Gemini per call (instruction + history + message).",
+    ("method",), SIZE_BUCKETS)
+RESPONSE_CHARS = Histogram(
+    "persona_response_chars", "Characters of Gemini answers.", ("method",), SIZE_BUCKETS)
+GEMINI_TOKENS = Counter(
+    "persona_gemini_tokens_total", "Gemini token usage (prompt, response, cached).", ("method", "kind"))
+ERRORS = Counter("persona_errors_total", "Failed calls by component.", ("component",))
+CACHE_LOOKUPS = Counter(
+    "persona_cache_lookups_total", "Cache lookups by cache and result (hit, miss).", ("cache", "result"))
+REPORT_SECONDS = Histogram(
+    "persona_report_duration_seconds", "Hiring report generation latency (analysis + PDF).", ("outcome",))
+PDF_SECONDS = Histogram("persona_pdf_render_seconds", "PDF rendering latency.")
+PDF_BYTES = Histogram("persona_pdf_bytes", "Size of rendered PDF reports.", buckets=SIZE_BUCKETS)
+TTS_SECONDS = Histogram(
+    "persona_tts_duration_seconds", "Speech synthesis latency per chunk, by audio cache result.", ("cache",))
+TTS_CHARS = Histogram("persona_tts_chars", "Characters per synthesized chunk.", buckets=SIZE_BUCKETS)
+GITHUB_FETCH_SECONDS = Histogram(
+    "persona_github_fetch_duration_seconds", "Duration of a full GitHub repository fetch.", ("outcome",))
+GITHUB_REQUESTS = Counter(
+    "persona_github_requests_total",
+    "GitHub API requests by result (pages: modified, not_modified; enrichment: enrich, enrich_missing, enrich_error).",
+    ("result",))
+PERSONA_LOAD_SECONDS = Histogram(
+    "persona_bundle_load_seconds", "Cold load of a persona bundle (first request to an idle persona).")
+GEMINI_CALLS = Counter(
+    "persona_gemini_calls_total",
+    "Budgeted Gemini calls by endpoint, the path that answered (primary, hedge, fallback) and outcome.",
+    ("endpoint", "path", "outcome"))
+GEMINI_ATTEMPT_SECONDS = Histogram(
+    "persona_gemini_attempt_duration_seconds", "Latency of single Gemini attempts (hedges and abandoned ones too).",
+    ("endpoint", "path", "outcome"))
+BREAKER_TRANSITIONS = Counter(
+    "persona_gemini_breaker_transitions_total", "Circuit breaker state changes (open, half_open, closed).", ("state",))
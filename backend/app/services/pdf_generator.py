@@ -1,6 +1,52 @@
 from fpdf import FPDF
 import os
 from datetime import datetime
+from backend.app.services import metrics
+
+# Colors
+COLOR_BG = (10, 10, 20)
+COLOR_ACCENT = (0, 150, 255)
+COLOR_TEXT_MAIN = (40, 40, 50)
+COLOR_TEXT_SUB = (100, 100, 110)
+
+
+class ReportPDF(FPDF):
+    """
+    FPDF with the branding header in its header() hook, so FPDF lays it out on
+    every page (full block on page 1, a slim running header on overflow pages)
+    instead of each report placing it by hand. The header is still emitted
+    into each page's content stream: fpdf2 has no public API for a reusable
+    form XObject, and the few text cells cost less than the body text.
+    """
+
+    def __init__(self, session_id: str):
+        super().__init__()
+        self.session_id = session_id
+
+    def header(self):
+        if self.page_no() > 1:
+            self.set_font("Helvetica", "B", 8)
+            self.set_text_color(*COLOR_TEXT_SUB)
+            self.cell(0, 6, f"SOURCE PERSONA // TECHNICAL DUE DILIGENCE // ID: {self.session_id}",
+                      new_x="LMARGIN", new_y="NEXT", align="R")
+            self.ln(4)
+            return
+
+        self.set_font("Helvetica", "B", 10)
+        self.set_text_color(*COLOR_TEXT_SUB)
+        self.cell(0, 50, f"ID: {self.session_id}", align="R", new_x="LMARGIN", new_y="NEXT")
+
+        self.set_y(15)
+        self.set_font("Helvetica", "B", 24)
+        self.set_text_color(0, 0, 0)
+        self.cell(0, 10, "SOURCE PERSONA", new_x="LMARGIN", new_y="NEXT", align="L")
+
+        self.set_font("Helvetica", "", 12)
+        self.set_text_color(*COLOR_ACCENT)
+        self.cell(0, 10, "TECHNICAL DUE DILIGENCE REPORT", new_x="LMARGIN", new_y="NEXT", align="L")
+
+        self.ln(10)
+
 
 class PDFService:
     def __init__(self):
@@ -21,31 +67,20 @@ class PDFService:
             "score_breakdown": {"name": int, ...} # Optional
         }
         """
-        pdf = FPDF()
+        try:
+            with metrics.timed(metrics.PDF_SECONDS, "pdf"):
+                pdf_bytes = self._render(data)
+        except Exception:
+            metrics.ERRORS.inc(component="pdf")
+            raise
+        metrics.PDF_BYTES.observe(len(pdf_bytes))
+        return pdf_bytes
+
+    def _render(self, data: dict) -> bytes:
+        # 1. Header (drawn by the ReportPDF page template)
+        pdf = ReportPDF(data.get("session_id", "UNKNOWN"))
         pdf.add_page()
-        
-        # Colors
-        COLOR_BG = (10, 10, 20)
-        COLOR_ACCENT = (0, 150, 255)
-        COLOR_TEXT_MAIN = (40, 40, 50)
-        COLOR_TEXT_SUB = (100, 100, 110)
-
-        # 1. Header
-        pdf.set_font("Helvetica", "B", 10)
-        pdf.set_text_color(*COLOR_TEXT_SUB)
-        pdf.cell(0, 50, f"ID: {data.get('session_id', 'UNKNOWN')}", align="R", new_x="LMARGIN", new_y="NEXT")
-        
-        pdf.set_y(15)
-        pdf.set_font("Helvetica", "B", 24)
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(0, 10, "SOURCE PERSONA", new_x="LMARGIN", new_y="NEXT", align="L")
-        
-        pdf.set_font("Helvetica", "", 12)
-        pdf.set_text_color(*COLOR_ACCENT)
-        pdf.cell(0, 10, "TECHNICAL DUE DILIGENCE REPORT", new_x="LMARGIN", new_y="NEXT", align="L")
-        
-        pdf.ln(10)
-        
+
         # 2. Candidate Profile
         pdf.set_fill_color(240, 240, 250)
         pdf.rect(10, pdf.get_y(), 190, 25, 'F')
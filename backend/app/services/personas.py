@@ -0,0 +1,216 @@
+# backend/app/services/personas.py
+import os
+import re
+import sys
+import time
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from backend.app.services import metrics
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.gemini_caller import GeminiCaller
+from backend.app.services.injection_filter import InjectionFilter
+from backend.app.services.transcript_compactor import TranscriptCompactor
+
+DEFAULT_PERSONA = "default"
+# Persona ids are directory names: no dots or slashes, so they can't escape PERSONAS_DIR
+_PERSONA_ID = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+
+class PersonaNotFound(Exception):
+    """No bundle directory for the requested persona id."""
+
+
+def deep_sizeof(obj, _seen: Optional[set] = None) -> int:
+    """Approximate retained size of an object graph in bytes (shared objects counted once)"""
+    seen = _seen if _seen is not None else set()
+    stack, total = [obj], 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool, type(None))):
+            continue
+        if isinstance(item, (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)):
+            continue
+        if isinstance(item, dict) or hasattr(item, "items") and hasattr(item, "keys"):
+            for key, value in item.items():
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+class _Loaded:
+    __slots__ = ("agent", "nbytes", "load_seconds", "last_used")
+
+    def __init__(self, agent: AIAgentService, nbytes: int, load_seconds: float):
+        self.agent = agent
+        self.nbytes = nbytes
+        self.load_seconds = load_seconds
+        self.last_used = time.time()
+
+
+class PersonaRegistry:
+    """
+    Many digital twins in one process. Each persona is a directory under
+    PERSONAS_DIR (persona.json identity, dynamic_profile.json, resume.pdf)
+    and is loaded into its own agent on first use. Loaded personas share one
+    genai client, the injection filter, the transcript compactor and the
+    Gemini caller (latency budgets, hedging, circuit breaker), and are
+    kept in an LRU bounded by the measured size of their knowledge snapshots
+    (PERSONA_CACHE_BYTES) and by count (PERSONA_MAX_LOADED). Concurrent first
+    requests for the same cold persona wait for a single load.
+
+    The default persona (the original backend/data setup) is not managed here.
+    """
+
+    def __init__(self, client, root: Optional[str] = None, max_bytes: Optional[int] = None,
+                 max_loaded: Optional[int] = None, injection_filter: Optional[InjectionFilter] = None,
+                 compactor: Optional[TranscriptCompactor] = None, model_name: str = "gemini-3-flash-preview",
+                 gemini_caller: Optional[GeminiCaller] = None):
+        self.client = client
+        self.root = root or os.getenv("PERSONAS_DIR", os.path.join("backend", "data", "personas"))
+        self.max_bytes = max_bytes or int(os.getenv("PERSONA_CACHE_BYTES", str(256 * 1024 * 1024)))
+        self.max_loaded = max_loaded or int(os.getenv("PERSONA_MAX_LOADED", "50"))
+        self.injection_filter = injection_filter or InjectionFilter()
+        # One breaker / latency history for the shared upstream
+        self.gemini_caller = gemini_caller or (GeminiCaller(model_name) if client else None)
+        self.compactor = compactor or (
+            TranscriptCompactor(client, model_name, gemini_caller=self.gemini_caller) if client else None
+        )
+        self._loaded: "OrderedDict[str, _Loaded]" = OrderedDict()
+        self._bytes = 0
+        self._loading: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds_max = 0.0
+
+    def exists(self, persona_id: str) -> bool:
+        return bool(_PERSONA_ID.match(persona_id or "")) and os.path.isdir(os.path.join(self.root, persona_id))
+
+    def peek(self, persona_id: str) -> Optional[AIAgentService]:
+        """The persona's agent if it is already loaded (never loads; safe on the event loop)"""
+        with self._lock:
+            entry = self._loaded.get(persona_id)
+            if entry is None:
+                return None
+            self._touch(persona_id, entry)
+            return entry.agent
+
+    def get(self, persona_id: str) -> AIAgentService:
+        """The persona's agent, loading it on first use. Raises PersonaNotFound."""
+        agent = self.peek(persona_id)
+        if agent is not None:
+            return agent
+        if not self.exists(persona_id):
+            raise PersonaNotFound(persona_id)
+
+        with self._lock:
+            loading = self._loading.setdefault(persona_id, threading.Lock())
+        with loading:
+            # Someone else may have finished loading it while we waited
+            agent = self.peek(persona_id)
+            if agent is not None:
+                return agent
+            try:
+                entry = self._load(persona_id)
+                # Published before the loading lock goes away, so a waiter's peek() above finds it
+                evicted = self._insert(persona_id, entry)
+            finally:
+                with self._lock:
+                    self._loading.pop(persona_id, None)
+        for agent in evicted:
+            # Gemini keeps billing cached contexts until they expire: drop them now
+            agent.context_cache.invalidate()
+        return entry.agent
+
+    def reload_knowledge(self, force: bool = False) -> bool:
+        """Hot reload for every loaded persona (KnowledgeWatcher target); True if any changed"""
+        with self._lock:
+            entries = list(self._loaded.items())
+        changed = False
+        for persona_id, entry in entries:
+            if entry.agent.reload_knowledge(force):
+                changed = True
+                size = deep_sizeof(entry.agent.knowledge)
+                with self._lock:
+                    if self._loaded.get(persona_id) is entry:
+                        self._bytes += size - entry.nbytes
+                    entry.nbytes = size
+        return changed
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                "loaded": len(self._loaded),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "load_seconds_max": round(self.load_seconds_max, 4),
+                "personas": {
+                    persona_id: {
+                        "bytes": entry.nbytes,
+                        "load_seconds": round(entry.load_seconds, 4),
+                        "idle_seconds": round(now - entry.last_used, 1),
+                        "sessions": entry.agent.sessions.stats().get("active_sessions"),
+                    }
+                    for persona_id, entry in self._loaded.items()
+                },
+            }
+
+    def _load(self, persona_id: str) -> _Loaded:
+        started = time.perf_counter()
+        agent = AIAgentService(
+            client=self.client,
+            data_dir=os.path.join(self.root, persona_id),
+            persona_id=persona_id,
+            injection_filter=self.injection_filter,
+            compactor=self.compactor,
+            gemini_caller=self.gemini_caller,
+        )
+        elapsed = time.perf_counter() - started
+        # What an idle persona costs: its snapshot (profile, resume, index, instruction table)
+        nbytes = deep_sizeof(agent.knowledge) if agent.client else 0
+        metrics.PERSONA_LOAD_SECONDS.observe(elapsed)
+        print(f"🧬 Persona '{persona_id}' loaded in {elapsed * 1000:.0f} ms ({nbytes / 1024:.0f} KiB)")
+        return _Loaded(agent, nbytes, elapsed)
+
+    def _insert(self, persona_id: str, entry: _Loaded):
+        """Adds a freshly loaded persona and evicts least recently used ones over the bounds"""
+        evicted = []
+        with self._lock:
+            self._loaded[persona_id] = entry
+            self._bytes += entry.nbytes
+            self.loads += 1
+            self.load_seconds_max = max(self.load_seconds_max, entry.load_seconds)
+            # The newest persona always stays, even if it alone exceeds the budget
+            while len(self._loaded) > 1 and (self._bytes > self.max_bytes or len(self._loaded) > self.max_loaded):
+                _, old = self._loaded.popitem(last=False)
+                self._bytes -= old.nbytes
+                self.evictions += 1
+                evicted.append(old.agent)
+        return evicted
+
+    # Caller holds the lock
+    def _touch(self, persona_id: str, entry: _Loaded):
+        self._loaded.move_to_end(persona_id)
+        entry.last_used = time.time()
+        self.hits += 1
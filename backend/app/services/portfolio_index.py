@@ -0,0 +1,212 @@
+# backend/app/services/portfolio_index.py
+import os
+import sys
+import json
+import struct
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+INDEX_FILE = "portfolio_index.bin"
+_MAGIC = b"PIDX1\n"
+_NO_LANGUAGE = 0xFFFF
+
+
+class PortfolioIndex:
+    """
+    Columnar view of the GitHub projects for exact questions (counts per
+    year, repos per language or topic, star ranking). Rows are in star-rank
+    order, as in dynamic_profile.json; numeric columns are typed arrays and
+    languages/topics are dictionary-encoded, with topics stored as
+    offsets + ids (CSR).
+
+    On disk (portfolio_index.bin): magic, a small JSON header with the string
+    columns and dictionaries, then the raw little-endian arrays, so loading
+    is a header parse plus a few array.frombytes() calls.
+    """
+
+    def __init__(self, names: List[str], urls: List[str], descriptions: List[str], languages: List[str],
+                 topics: List[str], stars: array, years: array, updated_years: array, language_ids: array,
+                 topic_offsets: array, topic_ids: array, source: str = "", years_exact: bool = True):
+        self.names = names
+        self.urls = urls
+        self.descriptions = descriptions
+        self.languages = languages  # dictionary: id -> language
+        self.topics = topics        # dictionary: id -> topic
+        self.stars = stars                # 'I'
+        self.years = years                # 'H' year created (last update for older syncs)
+        self.years_exact = years_exact    # False if any project lacked its creation date
+        self.updated_years = updated_years  # 'H'
+        self.language_ids = language_ids  # 'H', _NO_LANGUAGE if unknown
+        self.topic_offsets = topic_offsets  # 'I', len(rows) + 1
+        self.topic_ids = topic_ids        # 'H'
+        self.source = source  # generated_at of the profile it was built from
+        self._language_lookup = {lang.lower(): i for i, lang in enumerate(languages)}
+        self._topic_lookup = {topic.lower(): i for i, topic in enumerate(topics)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_profile(cls, profile_data: Dict[str, Any]) -> "PortfolioIndex":
+        projects = sorted(profile_data.get("projects", []),
+                          key=lambda p: (p.get("stars", 0), p.get("last_update", "")), reverse=True)
+        languages: Dict[str, int] = {}
+        topics: Dict[str, int] = {}
+        stars, years, updated_years = array("I"), array("H"), array("H")
+        language_ids, topic_offsets, topic_ids = array("H"), array("I", [0]), array("H")
+        for project in projects:
+            updated = _year(project.get("last_update"))
+            stars.append(int(project.get("stars") or 0))
+            years.append(_year(project.get("created")) or updated)
+            updated_years.append(updated)
+            language = project.get("language")
+            language_ids.append(languages.setdefault(language, len(languages)) if language else _NO_LANGUAGE)
+            for topic in project.get("topics") or []:
+                topic_ids.append(topics.setdefault(topic, len(topics)))
+            topic_offsets.append(len(topic_ids))
+        return cls(
+            [p.get("name", "") for p in projects], [p.get("url", "") for p in projects],
+            [p.get("description") or "" for p in projects], list(languages), list(topics),
+            stars, years, updated_years, language_ids, topic_offsets, topic_ids,
+            source=str(profile_data.get("generated_at", "")),
+            years_exact=all(p.get("created") for p in projects),
+        )
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        columns = [self.stars, self.years, self.updated_years, self.language_ids, self.topic_offsets, self.topic_ids]
+        header = json.dumps({
+            "source": self.source, "years_exact": self.years_exact,
+            "names": self.names, "urls": self.urls, "descriptions": self.descriptions,
+            "languages": self.languages, "topics": self.topics,
+            "columns": [[column.typecode, len(column)] for column in columns],
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC + struct.pack("<I", len(header)) + header)
+            for column in columns:
+                f.write(_little_endian(column).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PortfolioIndex":
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path} is not a portfolio index")
+        offset = len(_MAGIC)
+        (header_len,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_len])
+        offset += header_len
+        columns = []
+        for typecode, length in header["columns"]:
+            column = array(typecode)
+            size = column.itemsize * length
+            column.frombytes(data[offset:offset + size])
+            columns.append(_little_endian(column))  # byte-swapping is its own inverse
+            offset += size
+        return cls(header["names"], header["urls"], header["descriptions"], header["languages"],
+                   header["topics"], *columns, source=header["source"],
+                   years_exact=header.get("years_exact", False))
+
+    @classmethod
+    def for_profile(cls, data_dir: str, profile_data: Dict[str, Any]) -> "PortfolioIndex":
+        """The saved index if it was built from this profile, else a fresh one (cheap either way)"""
+        path = os.path.join(data_dir, INDEX_FILE)
+        try:
+            index = cls.load(path)
+            if index.source == str(profile_data.get("generated_at", "")) and len(index) == len(
+                    profile_data.get("projects", [])):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        return cls.from_profile(profile_data)
+
+    # --- Queries (all return row ids in star-rank order) ---
+
+    def language_id(self, language: str) -> Optional[int]:
+        return self._language_lookup.get(language.lower())
+
+    def topic_id(self, topic: str) -> Optional[int]:
+        return self._topic_lookup.get(topic.lower())
+
+    def rows_by_year(self, year: int) -> List[int]:
+        return [row for row, y in enumerate(self.years) if y == year]
+
+    def rows_by_language(self, language: str) -> List[int]:
+        language_id = self.language_id(language)
+        if language_id is None:
+            return []
+        return [row for row, lid in enumerate(self.language_ids) if lid == language_id]
+
+    def rows_by_topic(self, topic: str) -> List[int]:
+        topic_id = self.topic_id(topic)
+        if topic_id is None:
+            return []
+        offsets, ids = self.topic_offsets, self.topic_ids
+        return [row for row in range(len(self)) if topic_id in ids[offsets[row]:offsets[row + 1]]]
+
+    def top_starred(self, n: int = 5) -> List[int]:
+        return list(range(min(n, len(self))))
+
+    def language_counts(self) -> List[tuple]:
+        counts = Counter(lid for lid in self.language_ids if lid != _NO_LANGUAGE)
+        return [(self.languages[lid], n) for lid, n in counts.most_common()]
+
+    def row(self, row: int) -> Dict[str, Any]:
+        lid = self.language_ids[row]
+        offsets = self.topic_offsets
+        return {
+            "name": self.names[row],
+            "url": self.urls[row],
+            "description": self.descriptions[row],
+            "language": self.languages[lid] if lid != _NO_LANGUAGE else None,
+            "stars": self.stars[row],
+            "year": self.years[row],
+            "topics": [self.topics[t] for t in self.topic_ids[offsets[row]:offsets[row + 1]]],
+        }
+
+    def format_rows(self, rows: Sequence[int], limit: int = 10) -> str:
+        """Markdown list of projects (name, language, stars, link)"""
+        lines = []
+        for row in rows[:limit]:
+            info = self.row(row)
+            language = f"{info['language']}, " if info["language"] else ""
+            lines.append(f"- **{info['name']}** ({language}★{info['stars']}) — {info['url']}")
+        if len(rows) > limit:
+            lines.append(f"- …and {len(rows) - limit} more")
+        return "\n".join(lines)
+
+
+def _year(date: Optional[str]) -> int:
+    try:
+        return int(str(date)[:4])
+    except (TypeError, ValueError):
+        return 0
+
+
+def _little_endian(column: array) -> array:
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def build_index_file(data_dir: str) -> bool:
+    """Writes portfolio_index.bin for the data dir's profile if missing or stale; True if written"""
+    try:
+        with open(os.path.join(data_dir, "dynamic_profile.json"), "r", encoding="utf-8") as f:
+            profile_data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    index = PortfolioIndex.for_profile(data_dir, profile_data)
+    path = os.path.join(data_dir, INDEX_FILE)
+    if os.path.exists(path) and PortfolioIndex.load(path).source == index.source:
+        return False
+    index.save(path)
+    print(f"🗂️ Portfolio index saved to {path} ({len(index)} projects)")
+    return True
@@ -0,0 +1,228 @@
+# backend/app/services/repo_enrichment.py
+import os
+import json
+import time
+import asyncio
+import base64
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from backend.app.services import metrics
+
+ENRICHMENT_FILE = "github_enrichment.jsonl"
+
+
+class RepoEnricher:
+    """
+    Per-repo details the repo listing lacks: a README excerpt, the language
+    byte breakdown and the latest commit messages. That is three extra API
+    calls per repo. They are fanned out with asyncio over one httpx.AsyncClient,
+    and a semaphore bounds the calls in flight (GITHUB_ENRICH_CONCURRENCY).
+    A run costs about as long as the slowest few calls, not their sum.
+
+    Results are spooled to github_enrichment.jsonl, one line per repo keyed
+    by pushed_at, as each repo completes. Unchanged repos are copied over
+    without a request. Only line offsets stay in memory; save_to_json()
+    reads each record back while streaming the profile out.
+    """
+
+    def __init__(self, token: Optional[str] = None, store_path: str = os.path.join("backend/data", ENRICHMENT_FILE),
+                 concurrency: Optional[int] = None, readme_chars: Optional[int] = None, commits: Optional[int] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None, sleep=asyncio.sleep):
+        self.token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        self.store_path = store_path
+        self.concurrency = concurrency or int(os.getenv("GITHUB_ENRICH_CONCURRENCY", "16"))
+        self.readme_chars = readme_chars or int(os.getenv("GITHUB_README_CHARS", "1200"))
+        self.commits = commits or int(os.getenv("GITHUB_ENRICH_COMMITS", "5"))
+        self.transport = transport
+        self._sleep = sleep
+        self.max_retries = 3
+        self.max_rate_limit_wait = 60
+
+        # repo name -> (pushed_at, byte offset of its line in the store)
+        self._offsets: Dict[str, Tuple[str, int]] = self._scan_store(store_path)
+        self._resume_at = 0.0  # shared pause after a rate-limit response (loop time)
+
+        # Stats of the last run
+        self.requests_made = 0
+        self.fetched = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.rate_limit_waits = 0
+        self.elapsed = 0.0
+
+    def enrich(self, repos: List[Dict[str, Any]]) -> int:
+        """Refreshes the store for these repos; returns how many were fetched from GitHub."""
+        started = time.perf_counter()
+        self.requests_made = self.fetched = self.unchanged = self.failed = self.rate_limit_waits = 0
+        self._resume_at = 0.0
+        try:
+            asyncio.run(self._enrich_all(repos))
+        except (OSError, httpx.HTTPError) as e:
+            print(f"⚠️ Repo Enrichment Error: {e}")
+            metrics.ERRORS.inc(component="github")
+        self.elapsed = time.perf_counter() - started
+        print(f"🔎 Enriched {self.fetched} repositories ({self.unchanged} unchanged, {self.failed} failed, "
+              f"{self.requests_made} requests) in {self.elapsed:.1f}s.")
+        return self.fetched
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """The stored details of one repo (read from disk), or None"""
+        entry = self._offsets.get(name)
+        if entry is None:
+            return None
+        return json.loads(self._read_line(entry[1]))["details"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "repos": len(self._offsets),
+            "fetched": self.fetched,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "requests": self.requests_made,
+            "rate_limit_waits": self.rate_limit_waits,
+            "seconds": round(self.elapsed, 3),
+        }
+
+    async def _enrich_all(self, repos: List[Dict[str, Any]]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        offsets: Dict[str, Tuple[str, int]] = {}
+        tmp_path = self.store_path + ".tmp"
+        os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+
+        async with httpx.AsyncClient(base_url="https://api.github.com", headers=headers, limits=limits,
+                                     transport=self.transport, timeout=30) as client:
+            with open(tmp_path, "wb") as out:
+                # 1. Unchanged repos: copy their line over, no request
+                pending = []
+                for repo in repos:
+                    stored = self._offsets.get(repo["name"])
+                    if stored and stored[0] == repo.get("pushed_at"):
+                        offsets[repo["name"]] = (stored[0], out.tell())
+                        out.write(self._read_line(stored[1]))
+                        self.unchanged += 1
+                    else:
+                        pending.append(repo)
+
+                # 2. The rest concurrently; each line is written as soon as its repo completes
+                tasks = [asyncio.create_task(self._enrich_repo(client, semaphore, repo)) for repo in pending]
+                for task in asyncio.as_completed(tasks):
+                    repo, details = await task
+                    stored = self._offsets.get(repo["name"])
+                    if details is None:
+                        self.failed += 1
+                        if stored:  # keep the older details rather than none
+                            offsets[repo["name"]] = (stored[0], out.tell())
+                            out.write(self._read_line(stored[1]))
+                        continue
+                    offsets[repo["name"]] = (repo.get("pushed_at"), out.tell())
+                    out.write(json.dumps({"name": repo["name"], "pushed_at": repo.get("pushed_at"),
+                                          "details": details}, ensure_ascii=False).encode("utf-8") + b"\n")
+                    self.fetched += 1
+        os.replace(tmp_path, self.store_path)
+        self._offsets = offsets
+
+    async def _enrich_repo(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, repo: Dict[str, Any]):
+        base = f"/repos/{repo['full_name']}"
+        try:
+            readme, languages, commits = await asyncio.gather(
+                self._get(client, semaphore, f"{base}/readme"),
+                self._get(client, semaphore, f"{base}/languages"),
+                self._get(client, semaphore, f"{base}/commits", {"per_page": self.commits}),
+            )
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"⚠️ Enrichment failed for {repo['name']}: {e}")
+            metrics.GITHUB_REQUESTS.inc(result="enrich_error")
+            return repo, None
+        return repo, {
+            "readme": self._readme_excerpt(readme),
+            "language_bytes": languages or {},
+            "recent_commits": [
+                {"date": (c.get("commit", {}).get("author") or {}).get("date", "")[:10],
+                 "message": (c.get("commit", {}).get("message") or "").split("\n", 1)[0][:160]}
+                for c in (commits or [])
+            ],
+        }
+
+    async def _get(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, path: str,
+                   params: Optional[Dict] = None) -> Any:
+        """GET with the shared rate-limit pause; None for 404/409 (no README, empty repo)."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            pause = self._resume_at - loop.time()
+            if pause > 0:
+                await self._sleep(pause)
+            async with semaphore:
+                response = await client.get(path, params=params)
+            self.requests_made += 1
+            wait = self._retry_delay(response, attempt)
+            if wait is None or attempt == self.max_retries:
+                break
+            if response.status_code in (403, 429):
+                # Every task pauses, not just this one: the limit is per token
+                self.rate_limit_waits += 1
+                self._resume_at = max(self._resume_at, loop.time() + wait)
+                print(f"⏳ GitHub rate limit during enrichment, pausing {wait:.0f}s...")
+            else:
+                await self._sleep(wait)
+        if response.status_code in (404, 409):
+            metrics.GITHUB_REQUESTS.inc(result="enrich_missing")
+            return None
+        response.raise_for_status()
+        metrics.GITHUB_REQUESTS.inc(result="enrich")
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            # Budget used up by this call: hold the remaining calls until the reset
+            reset = float(response.headers.get("X-RateLimit-Reset", time.time()))
+            self._resume_at = max(self._resume_at, loop.time() + min(max(reset - time.time(), 0),
+                                                                     self.max_rate_limit_wait))
+        return response.json()
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the response should be used as is."""
+        status = response.status_code
+        if status in (403, 429):
+            if "Retry-After" in response.headers:
+                return min(float(response.headers["Retry-After"]), self.max_rate_limit_wait)
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                reset = float(response.headers.get("X-RateLimit-Reset", time.time()))
+                return min(max(reset - time.time(), 1), self.max_rate_limit_wait)
+            return None
+        if status >= 500:
+            return 2 ** attempt
+        return None
+
+    def _readme_excerpt(self, readme: Optional[Dict[str, Any]]) -> str:
+        if not readme or not readme.get("content"):
+            return ""
+        text = base64.b64decode(readme["content"]).decode("utf-8", errors="replace")
+        lines = [line.strip() for line in text.splitlines()]
+        # Drop badges, images and HTML; keep headings and prose
+        text = " ".join(line for line in lines if line and not line.startswith(("[![", "![", "<")))
+        return text[:self.readme_chars].rstrip()
+
+    def _read_line(self, offset: int) -> bytes:
+        with open(self.store_path, "rb") as f:
+            f.seek(offset)
+            return f.readline()
+
+    @staticmethod
+    def _scan_store(path: str) -> Dict[str, Tuple[str, int]]:
+        offsets = {}
+        try:
+            with open(path, "rb") as f:
+                while True:
+                    offset = f.tell()
+                    line = f.readline()
+                    if not line:
+                        break
+                    try:
+                        record = json.loads(line)
+                        offsets[record["name"]] = (record.get("pushed_at"), offset)
+                    except (ValueError, KeyError):
+                        continue
+        except OSError:
+            pass
+        return offsets
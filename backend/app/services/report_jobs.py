@@ -0,0 +1,165 @@
+# backend/app/services/report_jobs.py
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from backend.app.services import metrics
+from backend.app.services.worker_pool import BoundedExecutor
+
+
+class ReportJob:
+    __slots__ = ("id", "key", "status", "created_at", "finished_at", "pdf", "error")
+
+    def __init__(self, key: str):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = "queued"  # queued -> running -> done | failed
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.pdf: Optional[bytes] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        info = {"job_id": self.id, "status": self.status}
+        if self.status == "done":
+            info["download_url"] = f"/api/reports/{self.id}/pdf"
+        if self.error:
+            info["error"] = self.error
+        return info
+
+
+class ReportJobManager:
+    """
+    Hiring reports as background jobs: submit() returns immediately with a job
+    id, the Gemini analysis + PDF rendering runs on the worker pool, and the
+    client polls for the result. Finished PDFs are cached by transcript hash,
+    so repeated "download report" clicks (and duplicate in-flight submits)
+    don't regenerate.
+
+    Extra keyword options (persona_id, session_id) are passed on to `generate` and
+    are part of the cache key.
+    """
+
+    def __init__(self, generate: Callable[..., bytes], pool: BoundedExecutor,
+                 cache_size: Optional[int] = None, job_ttl_seconds: Optional[int] = None):
+        self.generate = generate
+        self.pool = pool
+        self.cache_size = cache_size or int(os.getenv("REPORT_CACHE_SIZE", "32"))
+        self.job_ttl = job_ttl_seconds or int(os.getenv("REPORT_JOB_TTL_SECONDS", "900"))
+        self._jobs: Dict[str, ReportJob] = {}
+        self._in_flight: Dict[str, ReportJob] = {}  # transcript hash -> running job
+        self._pdfs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.generated = 0
+        self.cache_hits = 0
+        self.failed = 0
+
+    @staticmethod
+    def transcript_key(chat_history: List[dict], **options) -> str:
+        canonical = json.dumps([chat_history, options], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def submit(self, chat_history: List[dict], **options) -> ReportJob:
+        """Starts (or reuses) a report job; raises PoolSaturatedError if the pool is full."""
+        key = self.transcript_key(chat_history, **options)
+        with self._lock:
+            self._purge_expired()
+            running = self._in_flight.get(key)
+            if running is not None:
+                return running
+            job = ReportJob(key)
+            pdf = self._cached_pdf(key)
+            if pdf is not None:
+                self._finish(job, pdf)
+                self._jobs[job.id] = job
+                return job
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+
+        try:
+            self.pool.submit(self._run, job, chat_history, options)
+        except Exception:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+                self._in_flight.pop(key, None)
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def generate_now(self, chat_history: List[dict], **options) -> bytes:
+        """Blocking variant for the legacy /api/generate-report endpoint (same cache)"""
+        key = self.transcript_key(chat_history, **options)
+        with self._lock:
+            pdf = self._cached_pdf(key)
+        if pdf is not None:
+            return pdf
+        pdf = self.generate(chat_history, **options)
+        if pdf:
+            with self._lock:
+                self._store_pdf(key, pdf)
+        return pdf
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "in_flight": len(self._in_flight),
+                "cached_pdfs": len(self._pdfs),
+                "generated": self.generated,
+                "cache_hits": self.cache_hits,
+                "failed": self.failed,
+            }
+
+    def _run(self, job: ReportJob, chat_history: List[dict], options: Dict[str, Any]):
+        job.status = "running"
+        try:
+            pdf = self.generate(chat_history, **options)
+        except Exception as e:
+            print(f"⚠️ Report Job Error: {e}")
+            pdf = b""
+        with self._lock:
+            self._in_flight.pop(job.key, None)
+            if pdf:
+                self.generated += 1
+                self._store_pdf(job.key, pdf)
+                self._finish(job, pdf)
+            else:
+                self.failed += 1
+                job.error = "Report generation failed"
+                job.status = "failed"
+                job.finished_at = time.time()
+
+    # Caller holds the lock
+    def _finish(self, job: ReportJob, pdf: bytes):
+        job.pdf = pdf
+        job.finished_at = time.time()
+        job.status = "done"
+
+    def _cached_pdf(self, key: str) -> Optional[bytes]:
+        pdf = self._pdfs.get(key)
+        metrics.CACHE_LOOKUPS.inc(cache="report_pdf", result="miss" if pdf is None else "hit")
+        if pdf is not None:
+            self._pdfs.move_to_end(key)
+            self.cache_hits += 1
+        return pdf
+
+    def _store_pdf(self, key: str, pdf: bytes):
+        self._pdfs[key] = pdf
+        self._pdfs.move_to_end(key)
+        while len(self._pdfs) > self.cache_size:
+            self._pdfs.popitem(last=False)
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self._jobs[job_id]
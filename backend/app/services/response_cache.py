@@ -0,0 +1,150 @@
+# backend/app/services/response_cache.py
+import os
+import re
+import math
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Filler words dropped before matching, so "Please, tell me about yourself."
+# and "tell me about yourself" share one entry
+STOPWORDS = frozenset(
+    "a an the do does did you your yours me my i is are was were be can could would will "
+    "please what whats how of in on to and or for with have has hey hi hello".split()
+)
+_PUNCTUATION = re.compile(r"[^\w\s+#]")
+
+
+class _Entry:
+    __slots__ = ("response", "vector", "latency")
+
+    def __init__(self, response: str, vector: Dict[str, float], latency: float):
+        self.response = response
+        self.vector = vector
+        self.latency = latency
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of agent answers for repeated recruiter questions.
+    Lookup is exact on the normalized message first, then by cosine similarity
+    of character-trigram vectors (catches typos and reordering). Only entries
+    with the same (mode, seniority) can match, since those change the answer.
+    A near-duplicate must also have the same keywords: numbers and years match
+    exactly, words may differ by one typo ("tel" ~ "tell", not 2024 ~ 2025).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, threshold: Optional[float] = None):
+        self.max_entries = max_entries or int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+        self.threshold = threshold or float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.88"))
+        self._entries: "OrderedDict[Tuple[str, int, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits_exact = 0
+        self.hits_similar = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.latency_saved = 0.0
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Lowercases, strips punctuation and filler words"""
+        words = _PUNCTUATION.sub(" ", message.lower()).split()
+        keywords = [w for w in words if w not in STOPWORDS]
+        return " ".join(keywords or words)
+
+    @staticmethod
+    def _vectorize(text: str) -> Dict[str, float]:
+        padded = f" {text} "
+        counts = Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+        norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+        return {gram: c / norm for gram, c in counts.items()}
+
+    def get(self, message: str, mode: str, seniority: int) -> Optional[str]:
+        key = (mode, seniority, self.normalize(message))
+        if not key[2]:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits_exact += 1
+            else:
+                key, entry = self._most_similar(key)
+                if entry is not None:
+                    self.hits_similar += 1
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.latency_saved += entry.latency
+            return entry.response
+
+    def put(self, message: str, mode: str, seniority: int, response: str, latency: float = 0.0):
+        key = (mode, seniority, self.normalize(message))
+        if not key[2]:
+            return
+
+        with self._lock:
+            self._entries[key] = _Entry(response, self._vectorize(key[2]), latency)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drops every entry (called when the profile/resume data is reloaded)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.hits_exact + self.hits_similar
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits_exact": self.hits_exact,
+                "hits_similar": self.hits_similar,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "latency_saved_seconds": round(self.latency_saved, 3),
+            }
+
+    def _most_similar(self, key: Tuple[str, int, str]):
+        """Best match above the threshold within the same mode/seniority. Caller holds the lock."""
+        vector = self._vectorize(key[2])
+        best_key, best_entry, best_score = None, None, self.threshold
+        for other_key, entry in self._entries.items():
+            if other_key[:2] != key[:2] or not self._same_keywords(key[2], other_key[2]):
+                continue
+            score = sum(weight * entry.vector.get(gram, 0.0) for gram, weight in vector.items())
+            if score >= best_score:
+                best_key, best_entry, best_score = other_key, entry, score
+        return best_key, best_entry
+
+    @classmethod
+    def _same_keywords(cls, text: str, other: str) -> bool:
+        """Every keyword of each message has a counterpart in the other"""
+        words, other_words = set(text.split()), set(other.split())
+        return (all(any(cls._same_word(w, o) for o in other_words) for w in words)
+                and all(any(cls._same_word(o, w) for w in words) for o in other_words))
+
+    @staticmethod
+    def _same_word(word: str, other: str) -> bool:
+        """Equal, or a one-character typo of a word (never for numbers or short tokens like c#)"""
+        if word == other:
+            return True
+        if not (word.isalpha() and other.isalpha()) or max(len(word), len(other)) < 4 or word[0] != other[0]:
+            return False
+        if abs(len(word) - len(other)) > 1:
+            return False
+        if len(word) == len(other):
+            return sum(a != b for a, b in zip(word, other)) == 1
+        short, long = sorted((word, other), key=len)
+        return any(long[:i] + long[i + 1:] == short for i in range(len(long)))
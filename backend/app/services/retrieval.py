@@ -0,0 +1,128 @@
+# backend/app/services/retrieval.py
+import re
+import math
+from collections import Counter, namedtuple
+from typing import Dict, List, Tuple
+from backend.app.services.response_cache import STOPWORDS
+
+Chunk = namedtuple("Chunk", ["source", "title", "text"])
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+# pypdf yields one word per line; bullets mark natural split points
+_BULLET = re.compile(r"\s*[●○•]\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Conversational filler that would otherwise match random chunks
+_QUERY_STOPWORDS = STOPWORDS | {"about", "tell", "yourself", "know"}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def chunk_resume(pages: List[str], max_chars: int = 600) -> List[Chunk]:
+    """Splits resume pages into bullet/sentence-aligned chunks of at most ~max_chars"""
+    chunks = []
+    for page_no, page in enumerate(pages, start=1):
+        flat = " ".join(page.split())
+        pieces = [p for part in _BULLET.split(flat) for p in _SENTENCE_END.split(part) if p]
+        current = ""
+        for piece in pieces:
+            if current and len(current) + len(piece) + 1 > max_chars:
+                chunks.append(Chunk("resume", f"Resume p.{page_no}", current))
+                current = ""
+            current = f"{current} {piece}".strip()
+        if current:
+            chunks.append(Chunk("resume", f"Resume p.{page_no}", current))
+    return chunks
+
+
+def chunk_projects(profile_data: Dict, readme_chars: int = 500) -> List[Chunk]:
+    """One compact chunk per GitHub project (plus README / language mix / commits when enriched)"""
+    chunks = []
+    for project in profile_data.get("projects", []):
+        topics = ", ".join(project.get("topics") or [])
+        text = (
+            f"{project.get('name')} ({project.get('language') or 'n/a'}, "
+            f"{project.get('stars', 0)} stars, updated {project.get('last_update', 'n/a')}"
+            f"{', fork' if project.get('is_fork') else ''}): {project.get('description', '')}"
+            f"{f' Topics: {topics}.' if topics else ''} {project.get('url', '')}"
+        )
+        language_bytes = project.get("language_bytes") or {}
+        if language_bytes:
+            total = sum(language_bytes.values()) or 1
+            mix = sorted(language_bytes.items(), key=lambda item: item[1], reverse=True)[:4]
+            text += " Languages: " + ", ".join(f"{lang} {n * 100 // total}%" for lang, n in mix) + "."
+        commits = [c.get("message", "") for c in project.get("recent_commits") or [] if c.get("message")]
+        if commits:
+            text += " Recent commits: " + "; ".join(commits[:3]) + "."
+        if project.get("readme"):
+            text += " README: " + project["readme"][:readme_chars]
+        chunks.append(Chunk("github", project.get("name", "project"), text.strip()))
+    return chunks
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of chunks, with an inverted index so a query
+    only touches the postings of its own terms.
+    """
+
+    def __init__(self, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._doc_len: List[int] = []
+
+        for doc_id, chunk in enumerate(chunks):
+            # Project names are indexed too ("stream-refinery" -> stream, refinery)
+            terms = tokenize(f"{chunk.title} {chunk.text}")
+            self._doc_len.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings.setdefault(term, []).append((doc_id, tf))
+
+        n = len(chunks)
+        self._avg_len = (sum(self._doc_len) / n) if n else 0.0
+        self._idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def search(self, query: str, k: int = 6) -> List[Tuple[float, Chunk]]:
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)) - _QUERY_STOPWORDS:
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / self._avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(score, self.chunks[doc_id]) for doc_id, score in top]
+
+
+class RetrievalIndex:
+    """Resume + GitHub projects, chunked and indexed for per-question retrieval."""
+
+    def __init__(self, resume_pages: List[str], profile_data: Dict):
+        resume_chunks = chunk_resume(resume_pages)
+        project_chunks = chunk_projects(profile_data)
+        # The resume header (name, title, summary) grounds every answer
+        self.pinned = resume_chunks[:1]
+        # The most-starred projects are the showcase for open questions
+        stars = [project.get("stars") or 0 for project in profile_data.get("projects", [])]
+        self.showcase = [chunk for _, chunk in sorted(zip(stars, project_chunks), key=lambda p: p[0], reverse=True)]
+        self.index = BM25Index(resume_chunks + project_chunks)
+
+    def __len__(self):
+        return len(self.index.chunks)
+
+    def retrieve(self, query: str, k: int = 6) -> List[Chunk]:
+        hits = [chunk for _, chunk in self.index.search(query, k)] or self.showcase[:k]
+        return self.pinned + [c for c in hits if c not in self.pinned]
+
+    @staticmethod
+    def format(chunks: List[Chunk]) -> str:
+        lines = [f"- [{c.title}] {c.text}" for c in chunks]
+        return "RETRIEVED CONTEXT (most relevant records for this question):\n" + "\n".join(lines)
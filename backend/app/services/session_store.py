@@ -0,0 +1,108 @@
+# backend/app/services/session_store.py
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _Session:
+    __slots__ = ("history", "last_seen")
+
+    def __init__(self, now: float):
+        self.history: List[Any] = []
+        self.last_seen = now
+
+
+class SessionStore:
+    """
+    Bounded in-memory store of per-visitor chat histories.
+    Sessions are evicted LRU-first once `max_sessions` is reached, or after
+    `ttl_seconds` of inactivity. Each history keeps only the last
+    `max_history_turns` user/model exchanges, so prompt size stays flat.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        max_history_turns: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_COUNT", "500"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+        self.max_history_turns = max_history_turns or int(os.getenv("SESSION_HISTORY_TURNS", "10"))
+        self._clock = clock
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.created = 0
+        self.evicted_lru = 0
+        self.evicted_ttl = 0
+        self.trimmed_turns = 0
+
+    def get_history(self, session_id: str) -> List[Any]:
+        """Returns a copy of the session history, creating the session if needed."""
+        with self._lock:
+            return list(self._touch(session_id).history)
+
+    def append_turn(self, session_id: str, user_content: Any, model_content: Any):
+        """Appends a user/model exchange and trims the history to the cap."""
+        with self._lock:
+            session = self._touch(session_id)
+            session.history.extend([user_content, model_content])
+            overflow = len(session.history) - self.max_history_turns * 2
+            if overflow > 0:
+                # History always holds whole exchanges, so it still starts with a user turn
+                del session.history[:overflow]
+                self.trimmed_turns += overflow // 2
+
+    def turn_count(self, session_id: str) -> int:
+        """Number of exchanges currently held for a session (0 if unknown)."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return len(session.history) // 2 if session else 0
+
+    def drop(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._purge_expired(self._clock())
+            return {
+                "active_sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "created": self.created,
+                "evicted_lru": self.evicted_lru,
+                "evicted_ttl": self.evicted_ttl,
+                "trimmed_turns": self.trimmed_turns,
+            }
+
+    def _touch(self, session_id: str) -> _Session:
+        """Fetches (or creates) a session and marks it most-recently used. Caller holds the lock."""
+        now = self._clock()
+        self._purge_expired(now)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted_lru += 1
+            session = _Session(now)
+            self._sessions[session_id] = session
+            self.created += 1
+        else:
+            self._sessions.move_to_end(session_id)
+            session.last_seen = now
+        return session
+
+    def _purge_expired(self, now: float):
+        # OrderedDict is kept in last-seen order, so expired sessions are at the front
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_seen < self.ttl_seconds:
+                break
+            del self._sessions[oldest_id]
+            self.evicted_ttl += 1
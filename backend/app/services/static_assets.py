@@ -0,0 +1,218 @@
+# backend/app/services/static_assets.py
+import os
+import re
+import io
+import gzip
+import json
+import shutil
+import hashlib
+import mimetypes
+from typing import Dict, List, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli  # optional: only gzip variants are built without it
+except ImportError:
+    brotli = None
+
+MANIFEST = "manifest.json"
+# Text assets worth compressing (images are already compressed formats)
+COMPRESSIBLE = (".html", ".css", ".js", ".json", ".svg", ".txt")
+# Preference order when the client accepts several
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# name.<10 hex>.ext -> content never changes under this URL
+_FINGERPRINTED = re.compile(r"\.[0-9a-f]{10}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+# --- Build step -------------------------------------------------------------
+
+def minify_css(text: str) -> str:
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
+    text = re.sub(r"\s+", " ", text)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", text).replace(";}", "}").strip()
+
+
+def minify_js(text: str) -> str:
+    """
+    Conservative: drops indentation, blank lines and whole-line // comments.
+    Line breaks stay, so automatic semicolon insertion behaves exactly as before.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//")) + "\n"
+
+
+def minify_html(text: str) -> str:
+    if "<pre" in text or "<textarea" in text:
+        return text  # whitespace is significant there
+    text = re.sub(r"<!--(?!\[if).*?-->", "", text, flags=re.DOTALL)
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js, ".html": minify_html}
+
+
+def fingerprint(name: str, content: bytes) -> str:
+    root, ext = os.path.splitext(name)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:10]}{ext}"
+
+
+def _rewrite_references(text: str, manifest: Dict[str, str]) -> str:
+    """Points quoted/url() references to source names at their fingerprinted names"""
+    for source, built in manifest.items():
+        text = re.sub(
+            r"""(["'(])(\./)?""" + re.escape(source) + r"""(["')])""",
+            lambda m: f"{m.group(1)}{m.group(2) or ''}{built}{m.group(3)}",
+            text,
+        )
+    return text
+
+
+def _optimize_png(content: bytes) -> bytes:
+    """Lossless re-encode with Pillow (an fpdf2 dependency) if that makes it smaller"""
+    try:
+        from PIL import Image
+        out = io.BytesIO()
+        Image.open(io.BytesIO(content)).save(out, format="PNG", optimize=True)
+        return out.getvalue() if out.tell() < len(content) else content
+    except Exception:
+        return content
+
+
+def _write_variants(path: str, content: bytes) -> List[str]:
+    """Writes .gz (and .br) next to `path` when they are smaller than the original"""
+    written = []
+    variants = [(".gz", gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.insert(0, (".br", brotli.compress(content, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(path + suffix, "wb") as f:
+                f.write(compressed)
+            written.append(suffix)
+    return written
+
+
+def build_assets(src_dir: str, out_dir: str) -> Dict[str, str]:
+    """
+    Minifies, fingerprints and precompresses everything under src_dir into
+    out_dir. HTML pages keep their names (they are the entry points and are
+    revalidated); everything else gets name.<hash>.ext and references to it
+    are rewritten. Returns the manifest {source path: built path}.
+    """
+    out_dir = os.path.abspath(out_dir)
+    files = []
+    for root, dirs, names in os.walk(src_dir):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != out_dir and not d.startswith(".")]
+        for name in names:
+            rel = os.path.relpath(os.path.join(root, name), src_dir).replace(os.sep, "/")
+            files.append(rel)
+
+    # Leaves first (images, fonts), then CSS/JS (which may reference them), then HTML
+    def stage(rel: str) -> int:
+        ext = os.path.splitext(rel)[1]
+        return {".html": 2, ".css": 1, ".js": 1}.get(ext, 0)
+
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    manifest: Dict[str, str] = {}
+    for rel in sorted(files, key=lambda r: (stage(r), r)):
+        ext = os.path.splitext(rel)[1].lower()
+        with open(os.path.join(src_dir, rel), "rb") as f:
+            content = f.read()
+        if ext in MINIFIERS:
+            text = _rewrite_references(content.decode("utf-8"), manifest)
+            content = MINIFIERS[ext](text).encode("utf-8")
+        elif ext == ".png":
+            content = _optimize_png(content)
+
+        built = rel if ext == ".html" else fingerprint(rel, content)
+        path = os.path.join(out_dir, built)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        if ext in COMPRESSIBLE:
+            _write_variants(path, content)
+        manifest[rel] = built
+
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# --- Serving ----------------------------------------------------------------
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """'gzip, br;q=0.8, *;q=0' -> {'gzip': 1.0, 'br': 0.8, '*': 0.0}"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the build step's .br / .gz twin of a file when the
+    client accepts that encoding (Vary: Accept-Encoding, one ETag per variant,
+    304 on If-None-Match). Fingerprinted files are cached as immutable for a
+    year; everything else (index.html) is revalidated on each visit.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._variants: Dict[str, List[Tuple[str, str, os.stat_result]]] = {}
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+
+        encoding, path = None, full_path
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for name, variant_path, variant_stat in self._available(full_path):
+            if accepted.get(name, accepted.get("*", 0.0)) > 0:
+                encoding, path, stat_result = name, variant_path, variant_stat
+                break
+
+        response = FileResponse(path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+        response.headers["vary"] = "Accept-Encoding"
+        response.headers["cache-control"] = IMMUTABLE if _FINGERPRINTED.search(full_path) else REVALIDATE
+        if encoding:
+            response.headers["content-encoding"] = encoding
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _available(self, full_path: str) -> List[Tuple[str, str, os.stat_result]]:
+        """Precompressed twins of a file, best first (looked up once; built files don't change)"""
+        variants = self._variants.get(full_path)
+        if variants is None:
+            variants = []
+            for name, suffix in ENCODINGS:
+                try:
+                    variants.append((name, full_path + suffix, os.stat(full_path + suffix)))
+                except OSError:
+                    pass
+            self._variants[full_path] = variants
+        return variants
+
+
+def static_root(frontend_dir: str) -> str:
+    """The built frontend (frontend/dist) when present, else the sources (local development)"""
+    dist = os.path.join(frontend_dir, "dist")
+    return dist if os.path.exists(os.path.join(dist, MANIFEST)) else frontend_dir
+
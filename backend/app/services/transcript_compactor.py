@@ -0,0 +1,141 @@
+# backend/app/services/transcript_compactor.py
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from google.genai import types
+from backend.app.services.gemini_caller import GeminiCaller
+
+WINDOW_PROMPT = """ROLE: Technical recruiter taking notes during a candidate interview.
+TASK: Summarize this excerpt of the interview (part {index}) in at most 120 words.
+KEEP: skills the candidate claimed, projects/metrics cited as evidence, questions the candidate asked back,
+notable communication style (clarity, confidence, metaphors). DROP: greetings and filler.
+
+EXCERPT:
+{excerpt}
+"""
+
+
+def format_messages(messages: List[dict]) -> str:
+    return "\n".join(f"{msg['role'].upper()}: {msg['content']}" for msg in messages)
+
+
+class TranscriptCompactor:
+    """
+    Map-reduce digest of long interview transcripts for the hiring report.
+
+    The transcript is cut into fixed windows of whole messages (~window_chars).
+    Every complete window is summarized in parallel; the last, still growing
+    window is kept verbatim. Because earlier windows never change as a chat
+    grows, their summaries are cached per session and only new windows are
+    summarized on the next report. Short transcripts are passed through as is.
+
+    Each window summary is a GeminiCaller call under the "report" budget (with
+    hedging, fallback model and metrics); a window whose summary fails or runs
+    out of budget goes into the digest verbatim.
+    """
+
+    def __init__(self, client, model_name: str, window_chars: Optional[int] = None,
+                 direct_chars: Optional[int] = None, parallelism: Optional[int] = None,
+                 max_sessions: Optional[int] = None, gemini_caller: Optional[GeminiCaller] = None):
+        self.client = client
+        self.model_name = model_name
+        self.gemini = gemini_caller or GeminiCaller(model_name)
+        self.window_chars = window_chars or int(os.getenv("REPORT_WINDOW_CHARS", "6000"))
+        self.direct_chars = direct_chars or int(os.getenv("REPORT_DIRECT_CHARS", "12000"))
+        self.parallelism = parallelism or int(os.getenv("REPORT_SUMMARY_PARALLELISM", "4"))
+        self.max_sessions = max_sessions or int(os.getenv("REPORT_SUMMARY_SESSIONS", "200"))
+        self._executor = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="report-map")
+        # session key -> {window hash -> summary}, least recently used session first
+        self._summaries: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.windows_summarized = 0
+        self.windows_reused = 0
+
+    def digest(self, chat_history: List[dict], session_id: Optional[str] = None) -> str:
+        """Returns the transcript, or its compact digest when it is too long"""
+        transcript = format_messages(chat_history)
+        if len(transcript) <= self.direct_chars:
+            return transcript
+
+        # 1. Map: summarize the complete windows (cached ones are reused)
+        windows = self._windows(chat_history)
+        complete, tail = windows[:-1], windows[-1]
+        summaries = self._summarize(self._session_key(chat_history, session_id), complete)
+
+        # 2. Reduce: earlier parts as notes, the most recent part verbatim
+        notes = "\n".join(f"[Part {i}] {summary}" for i, summary in enumerate(summaries, start=1))
+        return (
+            f"(Long interview: parts 1-{len(complete)} summarized, latest part verbatim)\n"
+            f"{notes}\n[Latest part]\n{tail}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._summaries),
+                "windows_summarized": self.windows_summarized,
+                "windows_reused": self.windows_reused,
+            }
+
+    def _windows(self, messages: List[dict]) -> List[str]:
+        """Greedy windows of whole messages; a message longer than a window gets its own"""
+        windows, current, size = [], [], 0
+        for msg in messages:
+            line = format_messages([msg])
+            if current and size + len(line) > self.window_chars:
+                windows.append("\n".join(current))
+                current, size = [], 0
+            current.append(line)
+            size += len(line) + 1
+        windows.append("\n".join(current))
+        return windows
+
+    @staticmethod
+    def _session_key(chat_history: List[dict], session_id: Optional[str]) -> str:
+        # Without a session id, the opening message identifies the conversation
+        return session_id or hashlib.sha256(format_messages(chat_history[:1]).encode("utf-8")).hexdigest()
+
+    def _summarize(self, session_key: str, windows: List[str]) -> List[str]:
+        hashes = [hashlib.sha256(w.encode("utf-8")).hexdigest() for w in windows]
+        with self._lock:
+            cache = self._summaries.setdefault(session_key, {})
+            self._summaries.move_to_end(session_key)
+            while len(self._summaries) > self.max_sessions:
+                self._summaries.popitem(last=False)
+            known = {h: cache[h] for h in hashes if h in cache}
+            self.windows_reused += len(known)
+
+        todo = [(i, w, h) for i, (w, h) in enumerate(zip(windows, hashes), start=1) if h not in known]
+        futures = [(h, self._executor.submit(self._summarize_window, i, w)) for i, w, h in todo]
+        fresh = {h: future.result() for h, future in futures}
+
+        with self._lock:
+            cache.update({h: s for h, s in fresh.items() if s})
+            self.windows_summarized += len(fresh)
+        return [known.get(h) or fresh.get(h) or windows[i] for i, h in enumerate(hashes)]
+
+    def _summarize_window(self, index: int, excerpt: str) -> Optional[str]:
+        prompt = WINDOW_PROMPT.format(index=index, excerpt=excerpt)
+
+        def attempt(model: str, timeout: float):
+            return self.client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    temperature=0.2,
+                    http_options=types.HttpOptions(timeout=int(timeout * 1000))
+                )
+            )
+
+        try:
+            response = self.gemini.call("report", attempt)
+            return (response.text or "").strip() or None
+        except Exception as e:
+            # The raw window is used instead, so the report still covers it
+            print(f"⚠️ Transcript Summary Error: {e}")
+            return None
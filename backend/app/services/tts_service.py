@@ -1,21 +1,127 @@
 # backend/app/services/tts_service.py
 import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
 from google.cloud import texttospeech
+from backend.app.services import metrics
+from backend.app.services.audio_cache import AudioCache
+
+# Markdown that should not be read aloud
+_CODE_BLOCK = re.compile(r"```.*?(?:```|$)", re.DOTALL)  # Mermaid diagrams, code (also unterminated)
+_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_INLINE_CODE = re.compile(r"`([^`]*)`")
+_LINE_MARKUP = re.compile(r"^\s*(?:#{1,6}\s+|>\s*|[-*+]\s+)", re.MULTILINE)
+_EMPHASIS = re.compile(r"(\*{1,3}|_{2,3}|~~)")
+_TABLE_RULE = re.compile(r"^\s*\|?[\s:|-]+\|[\s:|-]*$", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def clean_for_speech(text: str) -> str:
+    """Strips Markdown / Mermaid so only speakable prose is left"""
+    text = _CODE_BLOCK.sub(" ", text)
+    text = _IMAGE.sub(r"\1", text)
+    text = _LINK.sub(r"\1", text)
+    text = _INLINE_CODE.sub(r"\1", text)
+    text = _TABLE_RULE.sub("", text)
+    text = _LINE_MARKUP.sub("", text)
+    text = _EMPHASIS.sub("", text).replace("|", " ")
+    # Keep line breaks (they end headings and bullets), collapse other whitespace
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def split_for_speech(text: str, max_chars: int = 400) -> List[str]:
+    """
+    Cleans the text and splits it at sentence boundaries. The first chunk is
+    the first sentence alone (so playback starts quickly); later sentences are
+    packed up to max_chars. Over-long sentences are cut at word boundaries.
+    """
+    sentences = []
+    for sentence in _SENTENCE_END.split(clean_for_speech(text)):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            sentences.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            sentences.append(sentence)
+
+    chunks = sentences[:1]
+    for sentence in sentences[1:]:
+        if len(chunks) > 1 and len(chunks[-1]) + len(sentence) + 1 <= max_chars:
+            chunks[-1] += " " + sentence
+        else:
+            chunks.append(sentence)
+    return chunks
+
 
 class TTSService:
-    def __init__(self):
+    def __init__(self, client=None, cache: Optional[AudioCache] = None, parallelism: Optional[int] = None):
+        # Replays and canned answers are served from here instead of a paid synthesis call
+        self.cache = cache or AudioCache()
+        # Sentence chunks of long answers are synthesized concurrently (shared bound for all requests)
+        self.parallelism = parallelism or int(os.getenv("TTS_PARALLELISM", "4"))
+        self._executor = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="tts")
+
         # Assumes GOOGLE_APPLICATION_CREDENTIALS is set or default auth works
+        # (an existing client can be passed in, e.g. a fake in tests)
         try:
-            self.client = texttospeech.TextToSpeechClient()
+            self.client = client or texttospeech.TextToSpeechClient()
         except Exception as e:
             print(f"⚠️ TTS Init Error: {e}")
             self.client = None
 
+    def stats(self) -> Dict[str, Any]:
+        """Audio cache counters for the /api/stats endpoint"""
+        return self.cache.stats()
+
+    def synthesize_stream(self, text: str, voice_name: str = "en-US-Neural2-F") -> Iterator[bytes]:
+        """
+        Splits the text into sentence chunks, synthesizes up to `parallelism`
+        of them ahead, and yields the MP3 segments in order as they complete.
+        MP3 frames concatenate cleanly, so the stream plays as one file.
+        """
+        chunks = iter(split_for_speech(text))
+        pending = deque(
+            self._executor.submit(self.synthesize_speech, chunk, voice_name)
+            for chunk in (next(chunks, None) for _ in range(self.parallelism))
+            if chunk is not None
+        )
+        try:
+            while pending:
+                audio = pending.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(self._executor.submit(self.synthesize_speech, chunk, voice_name))
+                if audio:
+                    yield audio
+        finally:
+            # Client went away: don't pay for audio nobody will hear
+            for future in pending:
+                future.cancel()
+
+    def synthesize_long(self, text: str, voice_name: str = "en-US-Neural2-F") -> bytes:
+        """Whole-answer MP3, built from the same chunks as the stream (no input-size limit)"""
+        return b"".join(self.synthesize_stream(text, voice_name))
+
     def synthesize_speech(self, text: str, voice_name: str = "en-US-Neural2-F") -> bytes:
         """
         Synthesizes text to speech using Google Cloud Neural2 voices.
         Returns audio bytes (MP3).
         """
+        started = time.perf_counter()
+        metrics.TTS_CHARS.observe(len(text))
+        cache_key = AudioCache.key(text, voice_name, "MP3")
+        cached_audio = self.cache.get(cache_key)
+        metrics.CACHE_LOOKUPS.inc(cache="tts", result="miss" if cached_audio is None else "hit")
+        if cached_audio is not None:
+            metrics.TTS_SECONDS.observe(time.perf_counter() - started, cache="hit")
+            return cached_audio
+
         if not self.client:
             print("⚠️ TTS Client not initialized, returning empty bytes.")
             return b""
@@ -40,7 +146,10 @@ class TTSService:
             response = self.client.synthesize_speech(
                 input=input_text, voice=voice, audio_config=audio_config
             )
+            self.cache.put(cache_key, response.audio_content)
+            metrics.TTS_SECONDS.observe(time.perf_counter() - started, cache="miss")
             return response.audio_content
         except Exception as e:
             print(f"⚠️ TTS Synthesis Error: {e}")
+            metrics.ERRORS.inc(component="tts")
             return b""
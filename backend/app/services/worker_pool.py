@@ -0,0 +1,72 @@
+# backend/app/services/worker_pool.py
+import os
+import asyncio
+import functools
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the pool already holds max_workers + max_queue jobs."""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls (Gemini, TTS, PDF rendering) off the event loop
+    on a fixed-size thread pool. At most `max_workers` jobs run at once and
+    at most `max_queue` more may wait; beyond that callers are rejected
+    immediately instead of piling up (backpressure).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("WORKER_POOL_SIZE", "8"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("WORKER_QUEUE_SIZE", "16"))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="persona-worker")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Awaits fn(*args, **kwargs) on the pool, or raises PoolSaturatedError."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedules fn(*args, **kwargs) without waiting (background jobs), or raises PoolSaturatedError."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturatedError(f"Worker pool saturated ({self._pending} jobs in flight)")
+            self._pending += 1
+
+        try:
+            # The caller's context goes along (e.g. the request's trace spans)
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,33 @@
+# backend/build_assets.py
+"""
+Frontend build step: minifies frontend/ into frontend/dist with content-hashed
+file names, gzip (and brotli, if installed) twins and a manifest.json. The
+server serves frontend/dist when it exists (see Dockerfile), else frontend/.
+
+    python -m backend.build_assets
+"""
+import os
+import argparse
+from backend.app.services.static_assets import build_assets
+
+FRONTEND_DIR = "frontend"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build precompressed, fingerprinted frontend assets.")
+    parser.add_argument("--src", default=FRONTEND_DIR)
+    parser.add_argument("--out", default=os.path.join(FRONTEND_DIR, "dist"))
+    args = parser.parse_args()
+
+    manifest = build_assets(args.src, args.out)
+    before = after = 0
+    for source, built in manifest.items():
+        before += os.path.getsize(os.path.join(args.src, source))
+        built_path = os.path.join(args.out, built)
+        gz_path = built_path + ".gz"
+        after += os.path.getsize(gz_path if os.path.exists(gz_path) else built_path)
+    print(f"📦 Built {len(manifest)} assets into {args.out}: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB (gzip)")
+
+
+if __name__ == "__main__":
+    main()
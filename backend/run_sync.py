@@ -0,0 +1,98 @@
+# backend/run_sync.py
+"""
+Scheduled GitHub sync. Refreshes backend/data/dynamic_profile.json and, if a
+server URL is given, tells the running agent to reload it right away
+(otherwise its background watcher picks the change up within KNOWLEDGE_CHECK_SECONDS).
+Each run also pre-extracts resume.pdf into resume_cache.json and writes the
+portfolio index (portfolio_index.bin), so server start skips that work.
+Repos pushed since the last run get their README, language bytes and recent
+commits fetched concurrently (github_enrichment.jsonl; GITHUB_ENRICH=0 skips it).
+
+    python -m backend.run_sync                      # sync once
+    python -m backend.run_sync --interval 3600      # sync every hour
+    python -m backend.run_sync --notify http://localhost:8000
+    python -m backend.run_sync --resume-only        # build step (see Dockerfile)
+    python -m backend.run_sync --persona jane       # another twin: PERSONAS_DIR/jane, GitHub user from its persona.json
+"""
+import os
+import time
+import argparse
+import requests
+from dotenv import load_dotenv
+from backend.app.services.github_sync import GitHubSyncService
+from backend.app.services.knowledge import build_resume_cache, load_identity
+from backend.app.services.portfolio_index import build_index_file
+from backend.app.services.repo_enrichment import ENRICHMENT_FILE, RepoEnricher
+
+DATA_DIR = "backend/data"
+PROFILE_PATH = os.path.join(DATA_DIR, "dynamic_profile.json")
+
+
+def sync_once(syncer: GitHubSyncService, profile_path: str = PROFILE_PATH) -> bool:
+    """Runs one sync; returns True if the profile file was rewritten."""
+    raw_data = syncer.fetch_repos()
+    if not raw_data:
+        return False
+    data = syncer.process_data(raw_data)
+    # Three API calls per repo: only for the repos that made the profile's cutoff
+    kept = {project["name"] for project in data["projects"]}
+    enriched = syncer.enrich([repo for repo in raw_data if repo["name"] in kept])
+    if not syncer.changed and not enriched and os.path.exists(profile_path):
+        print("💤 No changes on GitHub since the last sync.")
+        return False
+    syncer.save_to_json(data, profile_path)
+    return True
+
+
+def notify(server_url: str, force: bool = False):
+    """Asks the running server to reload its knowledge (POST /api/admin/reload)."""
+    try:
+        response = requests.post(
+            f"{server_url.rstrip('/')}/api/admin/reload",
+            params={"force": "true"} if force else None,
+            headers={"X-Admin-Token": os.getenv("ADMIN_TOKEN", "")},
+            timeout=30
+        )
+        response.raise_for_status()
+        print(f"🔄 Server reloaded: {response.json()}")
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Reload Notification Error: {e}")
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Sync GitHub repositories into the agent's profile data.")
+    parser.add_argument("--username", help="GitHub user (default: github_username of the persona)")
+    parser.add_argument("--persona", help="Persona id: sync PERSONAS_DIR/<id> instead of backend/data")
+    parser.add_argument("--interval", type=int, default=0, help="Seconds between syncs (0 = run once)")
+    parser.add_argument("--notify", metavar="URL", help="Server to notify after a change, e.g. http://localhost:8000")
+    parser.add_argument("--resume-only", action="store_true",
+                        help="Only pre-extract resume.pdf and the portfolio index, skip GitHub")
+    args = parser.parse_args()
+
+    data_dir = DATA_DIR
+    if args.persona:
+        data_dir = os.path.join(os.getenv("PERSONAS_DIR", os.path.join(DATA_DIR, "personas")), args.persona)
+    resume_rebuilt = build_resume_cache(data_dir)
+    build_index_file(data_dir)
+    if args.resume_only:
+        return
+
+    username = args.username or load_identity(data_dir)["github_username"]
+    enricher = None
+    if os.getenv("GITHUB_ENRICH", "1").lower() in ("1", "true", "yes"):
+        enricher = RepoEnricher(store_path=os.path.join(data_dir, ENRICHMENT_FILE))
+    syncer = GitHubSyncService(username=username, cache_path=os.path.join(data_dir, "github_cache.json"),
+                               enricher=enricher)
+    profile_path = os.path.join(data_dir, "dynamic_profile.json")
+    while True:
+        if (sync_once(syncer, profile_path) or resume_rebuilt) and args.notify:
+            notify(args.notify)
+        resume_rebuilt = False
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
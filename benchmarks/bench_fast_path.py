@@ -0,0 +1,101 @@
+"""
+Benchmark: factual portfolio questions answered by the fast path (portfolio
+index, no Gemini call) vs the same questions through the fake Gemini client,
+the share of a sample question mix the fast path answers, and index load
+time (portfolio_index.bin vs building it from dynamic_profile.json).
+
+Run from the repo root:
+    python -m benchmarks.bench_fast_path
+    python -m benchmarks.bench_fast_path --latency 0.8
+"""
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.getcwd(), "tests"))
+
+from benchmarks import harness
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.fast_path import FastPathMatcher
+from backend.app.services.portfolio_index import INDEX_FILE, PortfolioIndex
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+FACTUAL = [
+    "How many projects did you build in 2025?",
+    "Which projects use Python?",
+    "What's your most-starred project?",
+    "Top 5 projects?",
+    "What languages do you use?",
+    "Which repos use Rust?",
+]
+OPEN = ["Tell me about yourself", "How do you handle conflict in a team?", "Do you know Kafka?", "Why should we hire you?"]
+
+
+def bench_ask(latency, repeat):
+    results = {}
+    for enabled in (True, False):
+        agent = AIAgentService(client=FakeGenAIClient(latency=latency, fail_cache_create=True), data_dir=DATA_DIR)
+        agent.fast_path.enabled = enabled
+        agent.response_cache.max_entries = 0  # every turn does the full work
+        turns = itertools.count()
+
+        def turn():
+            i = next(turns)
+            agent.ask(FACTUAL[i % len(FACTUAL)], session_id=f"bench-{i}")
+
+        results["fast_path" if enabled else "gemini"] = harness.measure(turn, repeat=repeat)
+    return results
+
+
+def bench_matcher(index, repeat):
+    matcher = FastPathMatcher(enabled=True)
+    questions = FACTUAL + OPEN
+    timing = harness.measure(lambda: [matcher.match(q, index) for q in questions], repeat=repeat)
+    stats = matcher.stats()
+    timing["per_question_us"] = round(timing["median_ms"] * 1000 / len(questions), 2)
+    timing["answer_rate"] = stats["answered"] / (stats["answered"] + stats["injected"] + stats["misses"])
+    return timing
+
+
+def bench_load(profile, repeat):
+    data_dir = tempfile.mkdtemp()
+    try:
+        PortfolioIndex.from_profile(profile).save(os.path.join(data_dir, INDEX_FILE))
+        return {
+            "binary": harness.measure(lambda: PortfolioIndex.load(os.path.join(data_dir, INDEX_FILE)), repeat=repeat),
+            "from_json": harness.measure(lambda: PortfolioIndex.from_profile(profile), repeat=repeat),
+        }
+    finally:
+        shutil.rmtree(data_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast path vs Gemini for factual questions")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake Gemini latency in seconds")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(os.path.join(DATA_DIR, "dynamic_profile.json"), encoding="utf-8") as f:
+        profile = json.load(f)
+    index = PortfolioIndex.from_profile(profile)
+    results = {
+        "ask": bench_ask(args.latency, args.repeat),
+        "matcher": bench_matcher(index, args.repeat * 10),
+        "index_load": bench_load(profile, args.repeat),
+    }
+    ask = results["ask"]
+    print(f"ask (factual): fast path {ask['fast_path']['median_ms']} ms vs gemini {ask['gemini']['median_ms']} ms"
+          f" | matcher {results['matcher']['per_question_us']} us/question,"
+          f" answers {results['matcher']['answer_rate']:.0%} of the mix"
+          f" | index load {results['index_load']['binary']['median_ms']} ms"
+          f" (from JSON {results['index_load']['from_json']['median_ms']} ms)")
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: per-request system-instruction cost, before vs after precomputation
+(CONTEXT_MODE=full, where the whole profile is part of the instruction).
+
+Run from the repo root:
+    python -m benchmarks.bench_instructions
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.getcwd(), "tests"))
+
+from backend.app.services.ai_agent import AIAgentService, INTERACTION_MODES, SENIORITY_LEVELS
+from fakes import FakeGenAIClient
+
+ITERATIONS = 2000
+
+
+def legacy_base(agent):
+    """The old base instruction, with the profile embedded as indent=2 JSON."""
+    return agent.base_system_instruction.replace(
+        json.dumps(agent.profile_data, ensure_ascii=False, separators=(",", ":")),
+        json.dumps(agent.profile_data, indent=2)
+    )
+
+
+def legacy_build(base, mode, seniority):
+    """The old per-request path: format the dynamic part and concatenate it to the base."""
+    return base + "\n" + AIAgentService._dynamic_part(mode, seniority)
+
+
+def main():
+    # The legacy path embedded the whole profile, so compare against full mode (retrieval is bench_retrieval)
+    previous_mode = os.environ.get("CONTEXT_MODE")
+    os.environ["CONTEXT_MODE"] = "full"
+    try:
+        agent = AIAgentService(client=FakeGenAIClient())
+    finally:
+        if previous_mode is None:
+            os.environ.pop("CONTEXT_MODE", None)
+        else:
+            os.environ["CONTEXT_MODE"] = previous_mode
+    variants = [(m, s) for m in INTERACTION_MODES for s in SENIORITY_LEVELS]
+    base = legacy_base(agent)
+
+    legacy_s = timeit.timeit(lambda: [legacy_build(base, m, s) for m, s in variants], number=ITERATIONS // len(variants))
+    table_s = timeit.timeit(lambda: [agent._build_dynamic_instruction(m, s) for m, s in variants], number=ITERATIONS // len(variants))
+
+    legacy_chars = len(legacy_build(base, "hr", 2))
+    table_chars = len(agent._build_dynamic_instruction("hr", 2))
+
+    results = {
+        "legacy_us_per_request": round(legacy_s / ITERATIONS * 1e6, 2),
+        "precomputed_us_per_request": round(table_s / ITERATIONS * 1e6, 3),
+        "legacy_prompt_chars": legacy_chars,
+        "precomputed_prompt_chars": table_chars,
+        "legacy_prompt_tokens_est": legacy_chars // 4,
+        "precomputed_prompt_tokens_est": table_chars // 4,
+        "prompt_size_reduction_pct": round(100 * (1 - table_chars / legacy_chars), 1),
+    }
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: multi-persona serving. For N personas built from the real profile
+and resume: first-request latency to a cold persona (bundle load included) vs
+a warm one, retained memory per idle persona (deep_sizeof estimate vs
+tracemalloc), and LRU behaviour when the byte budget holds only a fraction.
+
+Run from the repo root:
+    python -m benchmarks.bench_personas
+"""
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.getcwd(), "tests"))
+
+from backend.app.services.personas import PersonaRegistry
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+PERSONAS = 20
+
+
+def build_personas(root, count):
+    for i in range(count):
+        path = os.path.join(root, f"twin-{i}")
+        os.makedirs(path)
+        for name in ("dynamic_profile.json", "resume.pdf", "resume_cache.json"):
+            if os.path.exists(os.path.join(DATA_DIR, name)):
+                shutil.copy(os.path.join(DATA_DIR, name), os.path.join(path, name))
+        with open(os.path.join(path, "persona.json"), "w", encoding="utf-8") as f:
+            json.dump({"name": f"Twin Number {i}", "short_name": f"Twin{i}", "possessive": "their"}, f)
+
+
+def first_request(registry, persona_id):
+    started = time.perf_counter()
+    registry.get(persona_id).ask("Do you know Kafka?", session_id="bench")
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as root:
+        build_personas(root, PERSONAS)
+        ids = [f"twin-{i}" for i in range(PERSONAS)]
+
+        # 1. Cold vs warm first request, unbounded budget
+        registry = PersonaRegistry(FakeGenAIClient(fail_cache_create=True), root=root)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        cold = [first_request(registry, pid) for pid in ids]
+        traced_per_persona = (tracemalloc.get_traced_memory()[0] - before) / PERSONAS
+        tracemalloc.stop()
+        warm = [first_request(registry, pid) for pid in ids]
+        stats = registry.stats()
+
+        # 2. Budget for a quarter of them: round-robin traffic keeps evicting
+        per_persona = stats["bytes"] / PERSONAS
+        bounded = PersonaRegistry(FakeGenAIClient(fail_cache_create=True), root=root,
+                                  max_bytes=int(per_persona * PERSONAS / 4))
+        for pid in ids * 2:
+            bounded.get(pid)
+        bounded_stats = bounded.stats()
+
+    results = {
+        "personas": PERSONAS,
+        "cold_first_request_ms_median": round(statistics.median(cold), 2),
+        "cold_first_request_ms_max": round(max(cold), 2),
+        "warm_request_ms_median": round(statistics.median(warm), 2),
+        "idle_persona_kib_estimate": round(per_persona / 1024, 1),
+        "idle_persona_kib_tracemalloc": round(traced_per_persona / 1024, 1),
+        "bounded_loaded": bounded_stats["loaded"],
+        "bounded_bytes_kib": round(bounded_stats["bytes"] / 1024, 1),
+        "bounded_evictions": bounded_stats["evictions"],
+    }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,79 @@
+"""
+Benchmark: hiring-report latency and prompt tokens as the transcript grows,
+single prompt (compaction off) vs map-reduce compaction, plus a repeated
+report on the same, slightly longer session (cached window summaries).
+
+The fake Gemini client charges 40 ms per call plus 0.02 ms per prompt token.
+
+Run from the repo root:
+    python -m benchmarks.bench_report_compaction
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.getcwd(), "tests"))
+
+from backend.app.services.ai_agent import AIAgentService
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+TURN_COUNTS = [10, 50, 200, 800]
+REPORT_JSON = json.dumps({"candidate_name": "Veronika Kashtanova", "verdict": "HIRE", "top_skills": []})
+
+
+def transcript(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"Question {i}: walk me through how you scaled service {i}. " * 3})
+        history.append({"role": "model", "content": f"In project {i} we sharded Postgres, added Kafka and cut p95 by 40%. " * 6})
+    return history
+
+
+def reply(contents):
+    return REPORT_JSON if "OUTPUT FORMAT: JSON" in str(contents) else "Claims Kafka/Postgres scaling, cites p95 metrics. " * 4
+
+
+def measure(history, compaction):
+    client = FakeGenAIClient(reply=reply, latency=0.04, latency_per_token=0.00002)
+    agent = AIAgentService(client=client, data_dir=DATA_DIR)
+    if not compaction:
+        agent.compactor.direct_chars = float("inf")
+
+    started = time.perf_counter()
+    agent.generate_hiring_report(history, session_id="bench")
+    first_ms = (time.perf_counter() - started) * 1000
+    prompt_tokens = sum(client.prompt_tokens(c.contents, c.config) for c in client.calls)
+    final_tokens = client.prompt_tokens(client.calls[-1].contents, None)
+
+    # Same session a few turns later: only new windows are summarized
+    calls_before = len(client.calls)
+    started = time.perf_counter()
+    agent.generate_hiring_report(history + transcript(5), session_id="bench")
+    again_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "latency_ms": round(first_ms),
+        "final_prompt_tokens_est": final_tokens,
+        "total_prompt_tokens_est": prompt_tokens,
+        "gemini_calls": calls_before,
+        "grown_session_latency_ms": round(again_ms),
+        "grown_session_calls": len(client.calls) - calls_before,
+    }
+
+
+def main():
+    results = {}
+    for turns in TURN_COUNTS:
+        history = transcript(turns)
+        results[turns] = {"single_prompt": measure(history, False), "map_reduce": measure(history, True)}
+        single, mr = results[turns]["single_prompt"], results[turns]["map_reduce"]
+        print(f"{turns:>4} turns | single: {single['latency_ms']:>5} ms, {single['final_prompt_tokens_est']:>6} tok"
+              f" | map-reduce: {mr['latency_ms']:>5} ms, {mr['final_prompt_tokens_est']:>5} tok final,"
+              f" regrown {mr['grown_session_latency_ms']:>4} ms ({mr['grown_session_calls']} calls)")
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
@@ -0,0 +1,82 @@
+"""
+Benchmark: prompt size and local latency per turn as the portfolio grows,
+"full" (everything in the prompt) vs "retrieval" (top-k chunks per question).
+
+Run from the repo root:
+    python -m benchmarks.bench_retrieval
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.getcwd(), "tests"))
+
+from backend.app.services.ai_agent import AIAgentService
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+PROJECT_COUNTS = [40, 160, 640, 2560]
+QUESTIONS = ["Do you know Kafka?", "Which projects use Rust?", "Tell me about your education", "What did you build with Gemini?"]
+
+
+def synthetic_profile(count):
+    with open(os.path.join(DATA_DIR, "dynamic_profile.json"), encoding="utf-8") as f:
+        real = json.load(f)["projects"]
+    projects = []
+    for i in range(count):
+        project = dict(real[i % len(real)])
+        project["name"] = f"{project['name']}-{i}"
+        projects.append(project)
+    return {"generated_at": "2026-01-01", "total_projects_2025_2026": count, "projects": projects}
+
+
+def measure(mode, data_dir):
+    os.environ["CONTEXT_MODE"] = mode
+    client = FakeGenAIClient(fail_cache_create=True)
+    started = time.perf_counter()
+    agent = AIAgentService(client=client, data_dir=data_dir)
+    startup_ms = (time.perf_counter() - started) * 1000
+    agent.fast_path.enabled = False  # measure the prompt, not the local answers (bench_fast_path)
+
+    prep_times, prompt_chars = [], []
+    for i, question in enumerate(QUESTIONS):
+        started = time.perf_counter()
+        # The same request building ask()/ask_stream() run before each Gemini call
+        agent._request_for(agent._turn_inputs(question, "hr", 2, f"bench-{i}"), use_cache=False)
+        prep_times.append(time.perf_counter() - started)
+        agent.ask(question, session_id=f"bench-{i}")
+        call = client.calls[-1]
+        prompt_chars.append(len(call.config.system_instruction) + sum(len(p.text) for p in call.contents[-1].parts))
+
+    avg_chars = sum(prompt_chars) / len(prompt_chars)
+    return {
+        "startup_ms": round(startup_ms, 1),
+        "prompt_chars": round(avg_chars),
+        "prompt_tokens_est": round(avg_chars / 4),
+        "turn_prep_ms": round(sum(prep_times) / len(prep_times) * 1000, 3),
+    }
+
+
+def main():
+    results = {}
+    for count in PROJECT_COUNTS:
+        data_dir = tempfile.mkdtemp()
+        try:
+            shutil.copy(os.path.join(DATA_DIR, "resume.pdf"), data_dir)
+            with open(os.path.join(data_dir, "dynamic_profile.json"), "w", encoding="utf-8") as f:
+                json.dump(synthetic_profile(count), f)
+            results[count] = {mode: measure(mode, data_dir) for mode in ("full", "retrieval")}
+        finally:
+            shutil.rmtree(data_dir)
+        full, rag = results[count]["full"], results[count]["retrieval"]
+        print(f"{count:>5} projects | full: {full['prompt_tokens_est']:>7} tok, {full['turn_prep_ms']:>7} ms"
+              f" | retrieval: {rag['prompt_tokens_est']:>5} tok, {rag['turn_prep_ms']:>6} ms")
+    os.environ.pop("CONTEXT_MODE", None)
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(main(), indent=2))
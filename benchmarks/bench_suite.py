@@ -0,0 +1,281 @@
+"""
+Offline benchmark suite: the hot paths against in-process fakes for Gemini,
+Cloud TTS and the GitHub API (tests/fakes.py), so no keys, network or live
+server are needed and runs are comparable over time.
+
+Cases: instruction building, chat throughput under concurrency (through the
+FastAPI app, pool and gate), PDF rendering, report generation, speech
+synthesis, GitHub sync (cold and all-304), profile processing, per-repo
+enrichment (cold, sequential vs fanned out, and unchanged) and the
+conversation log (append, transcript read).
+
+Results are written as JSON (benchmarks/results/ by default); pass an earlier
+file with --compare to see the change per case.
+
+Run from the repo root:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --latency 0.2 --concurrency 32 --compare benchmarks/results/bench-....json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.getcwd(), "tests"))
+
+from benchmarks import harness
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.audio_cache import AudioCache
+from backend.app.services.conversation_log import ConversationLog
+from backend.app.services.github_sync import GitHubSyncService
+from backend.app.services.pdf_generator import PDFService
+from backend.app.services.repo_enrichment import RepoEnricher
+from backend.app.services.tts_service import TTSService
+from fakes import FakeGenAIClient, FakeGitHubRepoAPI, FakeGitHubSession, FakeTTSClient, make_repo
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+REPORT_DATA = {
+    "candidate_name": "Veronika Kashtanova",
+    "role": "Senior AI Engineer / Founder",
+    "session_id": "BENCH-000001",
+    "executive_summary": "Strong systems thinking; backed every claim with a shipped project and a metric. " * 3,
+    "top_skills": [
+        {"name": f"Skill {i}", "evidence": "Cited sharding Postgres, Kafka consumers and a p95 cut of 40%. " * 4}
+        for i in range(5)
+    ],
+    "communication_style": "Clear, confident, uses metaphors sparingly and precisely. " * 3,
+    "verdict": "STRONG HIRE",
+}
+
+
+def transcript(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"Question {i}: how did you scale service {i}? " * 3})
+        history.append({"role": "model", "content": f"In project {i} we sharded Postgres and cut p95 by 40%. " * 6})
+    return history
+
+
+def bench_instructions(args):
+    agent = AIAgentService(client=FakeGenAIClient(), data_dir=DATA_DIR)
+    kb = agent.knowledge
+    return {
+        "instructions.base": harness.measure(lambda: agent._get_base_instruction(kb), args.repeat * 10),
+        "instructions.table": harness.measure(
+            lambda: agent._build_instruction_table(kb.base_system_instruction), args.repeat * 10),
+    }
+
+
+def bench_chat(args):
+    import httpx
+    import backend.app.main as main
+    from backend.app.services.admission import ConcurrencyGate, RateLimiter
+    from backend.app.services.worker_pool import BoundedExecutor
+
+    reply = "x" * args.reply_chars
+    agent = AIAgentService(client=FakeGenAIClient(reply=reply, latency=args.latency), data_dir=DATA_DIR)
+    agent.response_cache.threshold = 1.01  # every question distinct: measure the Gemini path
+    main.agent = agent
+    main.limiter = RateLimiter(enabled=False)
+    main.gate = ConcurrencyGate(max_concurrent=args.concurrency)
+    # Pool sized to match, or requests past WORKER_POOL_SIZE + WORKER_QUEUE_SIZE get a 503
+    main.pool = BoundedExecutor(max_workers=args.concurrency, max_queue=args.concurrency)
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            latencies = []
+            queue = asyncio.Queue()
+            for i in range(args.requests):
+                queue.put_nowait(i)
+
+            async def visitor():
+                while not queue.empty():
+                    i = queue.get_nowait()
+                    started = time.perf_counter()
+                    response = await client.post("/api/chat", json={
+                        "message": f"Question {i}: which project shows Kafka skills?", "session_id": f"bench-{i}"})
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[visitor() for _ in range(args.concurrency)])
+            return latencies, time.perf_counter() - started
+
+    latencies, wall = asyncio.run(run())
+    result = harness.summarize(latencies)
+    result["requests_per_s"] = round(len(latencies) / wall, 1)
+    result["concurrency"] = args.concurrency
+    return {"chat.throughput": result}
+
+
+def bench_pdf(args):
+    service = PDFService()
+    size = len(service.create_report(REPORT_DATA))
+    result = harness.measure(lambda: service.create_report(REPORT_DATA), args.repeat)
+    result["pdf_bytes"] = size
+    return {"pdf.render": result}
+
+
+def bench_report(args):
+    report_json = json.dumps(REPORT_DATA)
+
+    def reply(contents):
+        return report_json if "OUTPUT FORMAT: JSON" in str(contents) else "Claims Kafka scaling with p95 metrics. " * 4
+
+    results = {}
+    for turns in (10, 200):
+        history = transcript(turns)
+        agent = AIAgentService(client=FakeGenAIClient(reply=reply, latency=args.latency), data_dir=DATA_DIR)
+        # Fresh session each run, so window summaries are not reused between runs
+        runs = iter(range(10 ** 6))
+        results[f"report.generate.{turns}_turns"] = harness.measure(
+            lambda: agent.generate_hiring_report(history, session_id=f"bench-{next(runs)}"), args.repeat)
+    return results
+
+
+def bench_tts(args):
+    answer = "We sharded Postgres and cut p95 latency by forty percent. " * 12
+    client = FakeTTSClient(latency=args.latency, bytes_per_char=args.tts_bytes_per_char)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Zero-sized cache: every chunk is synthesized; then a cache that keeps them all
+        uncached = TTSService(client=client, cache=AudioCache(memory_bytes=0, disk_bytes=0, disk_dir=tmp))
+        cached = TTSService(client=client, cache=AudioCache(memory_bytes=64 * 1024 * 1024, disk_bytes=0, disk_dir=tmp))
+        return {
+            "tts.synthesize_long.cold": harness.measure(lambda: uncached.synthesize_long(answer), args.repeat),
+            "tts.synthesize_long.cached": harness.measure(lambda: cached.synthesize_long(answer), args.repeat),
+        }
+
+
+def bench_sync(args):
+    repos = [make_repo(i, stars=i % 50, language=("Python", "Java", "Rust")[i % 3]) for i in range(args.repos)]
+    for repo in repos:
+        repo["description"] = "d" * args.description_chars
+    session = FakeGitHubSession(repos, latency=args.github_latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def syncer():
+            return GitHubSyncService(cache_path=os.path.join(tmp, "github_cache.json"), session=session,
+                                     sleep=lambda _: None)
+
+        def cold():
+            if os.path.exists(os.path.join(tmp, "github_cache.json")):
+                os.remove(os.path.join(tmp, "github_cache.json"))
+            s = syncer()
+            s.process_data(s.fetch_repos())
+
+        def warm():
+            s = syncer()
+            raw = s.fetch_repos()
+            s.process_data(raw)
+
+        def process_only():
+            GitHubSyncService(cache_path="", session=session).process_data(raw)
+
+        raw = syncer().fetch_repos()
+        return {
+            "sync.cold": harness.measure(cold, args.repeat),
+            "sync.not_modified": harness.measure(warm, args.repeat),
+            "sync.process_data": harness.measure(process_only, args.repeat),
+        }
+
+
+def bench_enrich(args):
+    repos = [make_repo(i) for i in range(args.enrich_repos)]
+    api = FakeGitHubRepoAPI(latency=args.github_latency)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "github_enrichment.jsonl")
+
+        def cold(concurrency):
+            def run():
+                if os.path.exists(store):
+                    os.remove(store)
+                enricher = RepoEnricher(token="", store_path=store, concurrency=concurrency, transport=api.transport())
+                enricher.enrich(repos)
+            return run
+
+        results = {
+            "enrich.cold.sequential": harness.measure(cold(1), max(1, args.repeat // 5)),
+            "enrich.cold.concurrent": harness.measure(cold(16), args.repeat),
+        }
+        results["enrich.unchanged"] = harness.measure(
+            lambda: RepoEnricher(token="", store_path=store, transport=api.transport()).enrich(repos), args.repeat)
+        return results
+
+
+def bench_conversations(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        log = ConversationLog(path=os.path.join(tmp, "conversations.db"))
+        # What a chat request pays: enqueueing only, the batch writer does the I/O
+        results["conversations.append"] = harness.measure(
+            lambda: log.append_turn("bench-append", "How did you scale Kafka?", "We sharded Postgres. " * 30),
+            args.repeat * 10)
+        for count in (10, 200):
+            session_id = f"bench-{count}"
+            for turn in transcript(count)[::2]:
+                log.append_turn(session_id, turn["content"], "In project 7 we sharded Postgres. " * 6)
+            log.flush()
+            results[f"conversations.transcript.{count}_turns"] = harness.measure(
+                lambda: log.transcript(session_id), args.repeat)
+        log.close()
+    return results
+
+
+CASES = {
+    "instructions": bench_instructions,
+    "chat": bench_chat,
+    "pdf": bench_pdf,
+    "report": bench_report,
+    "tts": bench_tts,
+    "sync": bench_sync,
+    "enrich": bench_enrich,
+    "conversations": bench_conversations,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark suite (fake Gemini / TTS / GitHub).")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="Run only these cases")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per case")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake Gemini / TTS latency per call (s)")
+    parser.add_argument("--github-latency", type=float, default=0.01, help="Fake GitHub latency per page (s)")
+    parser.add_argument("--reply-chars", type=int, default=800, help="Size of fake Gemini chat answers")
+    parser.add_argument("--tts-bytes-per-char", type=int, default=40, help="Fake audio size per character")
+    parser.add_argument("--repos", type=int, default=500, help="Repositories served by the fake GitHub API")
+    parser.add_argument("--enrich-repos", type=int, default=40, help="Repositories in the enrichment case")
+    parser.add_argument("--description-chars", type=int, default=200, help="Size of each repo description")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent chat visitors")
+    parser.add_argument("--requests", type=int, default=200, help="Chat requests in the throughput case")
+    parser.add_argument("--out", help="Result file (default: benchmarks/results/bench-<time>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown flagged as regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {"environment": harness.environment(), "config": vars(args), "results": {}}
+    for name in args.only or CASES:
+        print(f"⏱️  {name}...")
+        for case, result in CASES[name](args).items():
+            report["results"][case] = result
+            print(f"   {case:<28} median {result['median_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms")
+
+    path = args.out or harness.default_path()
+    harness.save(report, path)
+    print(f"💾 Results saved to {path}")
+
+    if args.compare:
+        print(f"📊 Compared with {args.compare}:")
+        for line in harness.compare(harness.load(args.compare), report, args.threshold):
+            print("   " + line)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Tiny benchmark harness: timing statistics, JSON result files and run-to-run
+comparison. Used by bench_suite; no pytest-benchmark needed.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+def summarize(samples_s: List[float]) -> Dict[str, float]:
+    """min / median / p95 / mean of a list of durations, in milliseconds"""
+    ordered = sorted(samples_s)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 10, warmup: int = 1) -> Dict[str, float]:
+    """Calls fn() `warmup` times untimed, then `repeat` times timed"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save(report: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10,
+            metric: str = "median_ms") -> List[str]:
+    """
+    One line per benchmark present in both reports: old vs new `metric` and the
+    change. Lines slower than `threshold` (relative) are marked REGRESSION.
+    """
+    lines = []
+    old_results, new_results = baseline.get("results", {}), current.get("results", {})
+    for name in sorted(set(old_results) & set(new_results)):
+        old, new = old_results[name].get(metric), new_results[name].get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        flag = "  REGRESSION" if change > threshold else ("  faster" if change < -threshold else "")
+        lines.append(f"{name:<28} {old:>10.2f} -> {new:>10.2f} {metric} ({change:+.1%}){flag}")
+    return lines
+
+
+def default_path(directory: Optional[str] = None) -> str:
+    directory = directory or os.path.join("benchmarks", "results")
+    return os.path.join(directory, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
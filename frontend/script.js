@@ -14,6 +14,13 @@ const senioritySlider = document.getElementById('seniority-slider');
 const seniorityDisplay = document.getElementById('seniority-display');
 const seniorityLevels = ["Junior", "Middle", "Senior", "CTO"];
 
+// --- SESSION (one conversation per visitor tab) ---
+let sessionId = (window.crypto && crypto.randomUUID)
+    ? crypto.randomUUID()
+    : `${Date.now().toString(16)}-${Math.random().toString(16).slice(2)}`;
+// Which digital twin to talk to (?persona=<id>); the default persona when absent
+const personaId = new URLSearchParams(window.location.search).get('persona') || null;
+
 // --- MOBILE MENU TOGGLE ---
 const mobileMenuBtn = document.getElementById('mobile-menu-btn');
 const mobileTerminalBtn = document.getElementById('mobile-terminal-btn');
@@ -91,6 +98,8 @@ const VoiceSystem = {
     recognition: null,
     currentAudio: null,
     currentListenBtn: null,
+    audioUrls: new Map(), // text -> object URL, so LISTEN replays skip the network
+    maxCachedAudio: 20,
 
     init: function() {
         // Init Speech Recognition
@@ -174,8 +183,21 @@ const VoiceSystem = {
         this.currentListenBtn.innerHTML = '⏹ STOP';
         this.currentListenBtn.classList.add('playing');
 
+        const cachedUrl = this.audioUrls.get(text);
+        if (cachedUrl) {
+            Terminal.log("TTS_CACHE: Replaying cached audio", 'info');
+            this.visualizeAudio(cachedUrl);
+            return;
+        }
+
         Terminal.log("TTS_REQ: Requesting audio stream...", 'info');
-        
+
+        if (window.MediaSource && MediaSource.isTypeSupported('audio/mpeg')) {
+            this.streamTTS(text);
+            return;
+        }
+
+        // Fallback: download the whole MP3, then play
         fetch('/api/tts', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
@@ -185,6 +207,7 @@ const VoiceSystem = {
         .then(blob => {
             if (!this.currentListenBtn) return; // Case where it was stopped before fetch returned
             const url = URL.createObjectURL(blob);
+            this.rememberAudio(text, url);
             this.visualizeAudio(url);
         })
         .catch(err => {
@@ -193,6 +216,62 @@ const VoiceSystem = {
         });
     },
 
+    streamTTS: function(text) {
+        // Plays sentence-by-sentence MP3 segments as they arrive from /api/tts/stream
+        const mediaSource = new MediaSource();
+        const parts = [];
+        let audio = null;
+
+        mediaSource.addEventListener('sourceopen', async () => {
+            const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+            // A SourceBuffer takes one append at a time
+            const append = (chunk) => new Promise((resolve, reject) => {
+                sourceBuffer.addEventListener('updateend', resolve, { once: true });
+                sourceBuffer.addEventListener('error', reject, { once: true });
+                sourceBuffer.appendBuffer(chunk);
+            });
+
+            try {
+                const res = await fetch('/api/tts/stream', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ text: text })
+                });
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+
+                const reader = res.body.getReader();
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    if (this.currentAudio !== audio) { // Stopped mid-stream
+                        reader.cancel();
+                        return;
+                    }
+                    parts.push(value);
+                    await append(value);
+                }
+                if (mediaSource.readyState === 'open') mediaSource.endOfStream();
+                this.rememberAudio(text, URL.createObjectURL(new Blob(parts, { type: 'audio/mpeg' })));
+            } catch (err) {
+                Terminal.log("TTS_ERROR: " + err, 'error');
+                if (this.currentAudio === audio) this.stopTTS();
+            }
+        }, { once: true });
+
+        this.visualizeAudio(URL.createObjectURL(mediaSource));
+        audio = this.currentAudio;
+    },
+
+    rememberAudio: function(text, url) {
+        this.audioUrls.set(text, url);
+        if (this.audioUrls.size > this.maxCachedAudio) {
+            // Maps iterate in insertion order: drop the oldest
+            const [oldestText, oldestUrl] = this.audioUrls.entries().next().value;
+            this.audioUrls.delete(oldestText);
+            URL.revokeObjectURL(oldestUrl);
+        }
+    },
+
     visualizeAudio: function(audioUrl) {
         if (!this.audioContext) {
             this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
@@ -320,6 +399,22 @@ if (modeToggle) {
 }
 
 // 3. Report Generation
+const REPORT_POLL_MS = 1000;
+
+function waitForReport(job) {
+    // Resolves with the finished job (status "done"), rejects if it failed
+    if (job.status === 'done') return Promise.resolve(job);
+    if (job.status === 'failed') return Promise.reject(new Error(job.error || "Report generation failed"));
+    Terminal.log(`REPORT_JOB: ${job.status.toUpperCase()}...`, 'info');
+    return new Promise(resolve => setTimeout(resolve, REPORT_POLL_MS))
+        .then(() => fetch(`/api/reports/${job.job_id}`))
+        .then(response => {
+            if (response.ok) return response.json();
+            throw new Error("Report job lost");
+        })
+        .then(waitForReport);
+}
+
 const downloadBtn = document.getElementById('download-report-btn');
 if (downloadBtn) {
     downloadBtn.addEventListener('click', () => {
@@ -331,47 +426,29 @@ if (downloadBtn) {
         downloadBtn.innerHTML = '⏳ GENERATING...';
         downloadBtn.disabled = true;
 
-        // Collect Chat History
-        const messages = [];
-        document.querySelectorAll('#chat-history .message').forEach(msg => {
-            const labelEl = msg.querySelector('.message-label');
-            if (!labelEl) return;
-            
-            const roleLabel = labelEl.innerText;
-            const contentEl = msg.querySelector('.markdown-content');
-            let content = "";
-            
-            if (contentEl) {
-                content = contentEl.innerText;
-            } else {
-                content = msg.innerText; 
-            }
-
-            let role = "user";
-            if (roleLabel.toLowerCase().includes("veronika")) role = "model";
-            
-            if (roleLabel.includes("System")) return;
-
-            messages.push({ role: role, content: content });
-        });
-
-        if (messages.length === 0) {
+        if (!history.querySelector('.user-message')) {
             Terminal.log("WARN: No data to analyze", 'warn');
             downloadBtn.innerHTML = originalText;
             downloadBtn.disabled = false;
             return;
         }
 
-        // Send to API
-        fetch('/api/generate-report', {
+        // Submit a background job (the server reads this session's transcript), then poll until the PDF is ready
+        fetch('/api/reports', {
              method: 'POST',
              headers: { 'Content-Type': 'application/json' },
-             body: JSON.stringify({ chat_history: messages })
+             body: JSON.stringify({ session_id: sessionId, persona_id: personaId })
         })
         .then(response => {
-            if (response.ok) return response.blob();
+            if (response.ok) return response.json();
             throw new Error("Report generation failed");
         })
+        .then(job => waitForReport(job))
+        .then(job => fetch(job.download_url))
+        .then(response => {
+            if (response.ok) return response.blob();
+            throw new Error("Report download failed");
+        })
         .then(blob => {
             // Create Download Link
             const url = window.URL.createObjectURL(blob);
@@ -542,32 +619,81 @@ function handleSendMessage() {
     Terminal.log(`UPLINK: Sending ${text.length} bytes`, 'info');
     Terminal.log(`PAYLOAD: { mode: "${currentMode}", level: ${currentSeniority} }`, 'info');
     
-    // Send to Backend API
-    fetch('/api/chat', {
+    // Send to Backend API (Server-Sent Events: the answer renders while it is generated)
+    const sentAt = performance.now();
+    let fullText = '';
+    let liveMsg = null;
+
+    const handleStreamEvent = (event) => {
+        if (event.type === 'chunk') {
+            if (!liveMsg) {
+                stopThinkingAnim();
+                Terminal.log(`DOWNLINK: First token in ${Math.round(performance.now() - sentAt)}ms`, 'info');
+                liveMsg = createLiveMessage("Veronika's digital twin");
+            }
+            fullText += event.data.text;
+            updateLiveMessage(liveMsg, fullText);
+        } else if (event.type === 'done') {
+            if (event.data.session_id) sessionId = event.data.session_id;
+            const usage = event.data.usage || {};
+            if (usage.total_tokens) {
+                Terminal.log(`TOKENS: prompt ${usage.prompt_tokens} / response ${usage.response_tokens} (cached ${usage.cached_tokens})`, 'sys');
+            }
+        } else if (event.type === 'error') {
+            fullText = event.data.text;
+        }
+    };
+
+    fetch('/api/chat/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message: text, mode: currentMode, seniority: currentSeniority }),
+        body: JSON.stringify({ message: text, mode: currentMode, seniority: currentSeniority, session_id: sessionId, persona_id: personaId }),
     })
-    .then(response => {
-        if (!response.ok) throw new Error('Network response was not ok');
-        return response.json();
+    .then(async response => {
+        if (response.status === 429 || response.status === 503) {
+            const busy = new Error('Server throttled the request');
+            busy.retryAfter = response.headers.get('Retry-After') || '1';
+            throw busy;
+        }
+        if (!response.ok || !response.body) throw new Error('Network response was not ok');
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                handleStreamEvent(parseSSEEvent(buffer.slice(0, boundary)));
+                buffer = buffer.slice(boundary + 2);
+            }
+        }
     })
-    .then(data => {
+    .then(() => {
         stopThinkingAnim();
         core.classList.remove('thinking');
-        Terminal.log(`DOWNLINK: Received ${data.response.length} chars`, 'info');
-        if (data.response.includes('[SECURITY_ALERT]')) {
+        if (liveMsg) liveMsg.remove();
+        Terminal.log(`DOWNLINK: Received ${fullText.length} chars in ${Math.round(performance.now() - sentAt)}ms`, 'info');
+        if (fullText.includes('[SECURITY_ALERT]')) {
             Terminal.log("🚨 THREAT DETECTED: Prompt Injection", 'error');
             Terminal.log("ACTION: Executing Security Protocol", 'error');
         } else {
             Terminal.log("RAG_VERIFICATION: PASS", 'info');
         }
-        addMessage(data.response, 'ai-message', "Veronika's digital twin");
+        // Final render: Markdown, Mermaid diagrams, security state and LISTEN button
+        addMessage(fullText, 'ai-message', "Veronika's digital twin");
     })
     .catch(error => {
         console.error('Error:', error);
         stopThinkingAnim();
         core.classList.remove('thinking');
+        if (liveMsg) liveMsg.remove();
+        if (error.retryAfter) {
+            Terminal.log(`THROTTLED: Uplink saturated, retry in ${error.retryAfter}s`, 'warn');
+            addMessage(`<span style="color: #ffb84d; font-weight: bold;">UPLINK THROTTLED: retry in ${error.retryAfter}s</span>`, 'ai-message', 'SYSTEM');
+            return;
+        }
         Terminal.log("CONNECTION_ERROR: Server Unreachable", 'error');
         addMessage('<span style="color: #ff4d4d; font-weight: bold;">CONNECTION LOST</span>', 'ai-message', 'SYSTEM');
     });
@@ -585,6 +711,41 @@ if (sendBtn) {
     sendBtn.addEventListener('click', handleSendMessage);
 }
 
+// --- HELPER: Streaming (SSE) ---
+function parseSSEEvent(raw) {
+    const event = { type: 'message', data: {} };
+    raw.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event.type = line.slice(6).trim();
+        else if (line.startsWith('data:')) event.data = JSON.parse(line.slice(5));
+    });
+    return event;
+}
+
+function createLiveMessage(label) {
+    const msg = document.createElement('div');
+    msg.className = 'message ai-message';
+    msg.innerHTML = `<div class="message-label">${label}</div><div class="markdown-content"></div>`;
+    history.appendChild(msg);
+    return msg;
+}
+
+function updateLiveMessage(msg, content) {
+    // Coalesce re-renders to one per animation frame
+    msg.pendingContent = content;
+    if (msg.renderScheduled) return;
+    msg.renderScheduled = true;
+    requestAnimationFrame(() => {
+        msg.renderScheduled = false;
+        const target = msg.querySelector('.markdown-content');
+        let parsed = msg.pendingContent;
+        if (typeof marked !== 'undefined') {
+            try { parsed = marked.parse(parsed); } catch (e) { console.error(e); }
+        }
+        target.innerHTML = parsed;
+        history.scrollTop = history.scrollHeight;
+    });
+}
+
 // --- HELPER: Message Rendering ---
 function addMessage(content, type, label) {
     const msg = document.createElement('div');
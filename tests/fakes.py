@@ -0,0 +1,288 @@
+"""In-process stand-ins for external clients, so tests run offline."""
+import asyncio
+import base64
+import json
+import math
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import requests
+from google.genai import errors, types
+from requests.structures import CaseInsensitiveDict
+
+
+def api_error(code, message):
+    """The error google-genai raises for a non-2xx response"""
+    status = {400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 404: "NOT_FOUND", 503: "UNAVAILABLE"}.get(code, "")
+    cls = errors.ServerError if code >= 500 else errors.ClientError
+    return cls(code, {"error": {"code": code, "message": message, "status": status}})
+
+
+def _usage(prompt_tokens, response_tokens, cached_tokens=0):
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=response_tokens,
+        cached_content_token_count=cached_tokens,
+        total_token_count=prompt_tokens + response_tokens,
+    )
+
+
+def _response(text, usage=None):
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part.from_text(text=text)]))],
+        usage_metadata=usage,
+    )
+
+
+class FakeModels:
+    def __init__(self, client):
+        self._client = client
+
+    def generate_content(self, *, model, contents, config=None):
+        self._client.record(model, contents, config)
+        time.sleep(self._client.latency_for(model) + self._client.prompt_tokens(contents, config) * self._client.latency_per_token)
+        reply = self._client.reply_for(contents)
+        return _response(reply, _usage(self._client.prompt_tokens(contents, config), len(reply.split())))
+
+    def generate_content_stream(self, *, model, contents, config=None):
+        self._client.record(model, contents, config)
+        reply = self._client.reply_for(contents)
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self._client.latency_for(model) / max(len(words), 1))
+            last = i == len(words) - 1
+            usage = _usage(self._client.prompt_tokens(contents, config), len(words)) if last else None
+            yield _response(word if i == 0 else " " + word, usage)
+
+
+class FakeCaches:
+    """In-memory stand-in for client.caches (explicit context caching)."""
+
+    def __init__(self, fail_create=False):
+        self.fail_create = fail_create
+        self.live = {}
+        self.created = []
+        self.updated = []
+        self.deleted = []
+
+    def create(self, *, model, config=None):
+        if self.fail_create:
+            raise api_error(400, "Cached content is too small")
+        name = f"cachedContents/fake-{len(self.created) + 1}"
+        self.live[name] = config
+        self.created.append(name)
+        return types.CachedContent(name=name, model=model)
+
+    def update(self, *, name, config=None):
+        if name not in self.live:
+            raise api_error(404, f"{name} not found")
+        self.updated.append(name)
+        return types.CachedContent(name=name)
+
+    def delete(self, *, name, config=None):
+        self.live.pop(name, None)
+        self.deleted.append(name)
+
+
+class FakeGenAIClient:
+    """
+    Minimal genai.Client look-alike. Replies with `reply` (or the result of
+    `reply(contents)` if callable) after `latency` seconds (or `latency(model)` if
+    callable; plus `latency_per_token` per estimated prompt token), and records every call.
+    Requests that reference a cached context unknown to `caches` fail like the real API.
+    """
+
+    def __init__(self, reply="Fake answer from the digital twin.", latency=0.0, fail_cache_create=False,
+                 latency_per_token=0.0):
+        self.reply = reply
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.calls = []
+        self.models = FakeModels(self)
+        self.caches = FakeCaches(fail_create=fail_cache_create)
+
+    def record(self, model, contents, config):
+        self.calls.append(SimpleNamespace(model=model, contents=contents, config=config))
+        if config is not None and config.cached_content and config.cached_content not in self.caches.live:
+            raise api_error(403, f"CachedContent {config.cached_content} not found or expired")
+
+    def latency_for(self, model):
+        return self.latency(model) if callable(self.latency) else self.latency
+
+    def reply_for(self, contents):
+        return self.reply(contents) if callable(self.reply) else self.reply
+
+    @staticmethod
+    def prompt_tokens(contents, config):
+        """Rough token estimate (chars / 4) for what would be sent upstream."""
+        size = len(str(contents))
+        if config is not None and config.system_instruction:
+            size += len(str(config.system_instruction))
+        return size // 4
+
+
+def make_repo(i, updated_at="2025-06-01T10:00:00Z", stars=0, language="Python"):
+    """A raw GitHub /repos record with the fields GitHubSyncService reads."""
+    return {
+        "name": f"repo-{i}",
+        "full_name": f"vero-code/repo-{i}",
+        "description": f"Project number {i}",
+        "html_url": f"https://github.com/vero-code/repo-{i}",
+        "stargazers_count": stars,
+        "language": language,
+        "topics": ["ai"],
+        "created_at": "2025-01-15T10:00:00Z",
+        "updated_at": updated_at,
+        "pushed_at": updated_at,
+        "fork": False,
+    }
+
+
+class FakeGitHubSession:
+    """
+    requests.Session look-alike serving /users/<name>/repos from `repos`,
+    with Link pagination, ETags (304 on If-None-Match) and optional
+    rate-limit responses queued in `rate_limited`.
+    """
+
+    def __init__(self, repos, per_page=100, latency=0.0):
+        self.repos = repos
+        self.per_page = per_page
+        self.latency = latency
+        self.headers = {}
+        self.calls = []
+        self.rate_limited = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append({"url": url, "params": params, "headers": dict(headers or {})})
+        time.sleep(self.latency)
+        response = requests.Response()
+        response.url = url
+
+        if self.rate_limited:
+            response.status_code = 403
+            response.headers = CaseInsensitiveDict(self.rate_limited.pop(0))
+            response._content = b'{"message": "API rate limit exceeded"}'
+            return response
+
+        page = params["page"]
+        body = self.repos[(page - 1) * self.per_page:page * self.per_page]
+        etag = f'"{hash(json.dumps(body, sort_keys=True)) & 0xffffffff:x}"'
+        last = max(1, -(-len(self.repos) // self.per_page))
+        response.headers = CaseInsensitiveDict({"ETag": etag})
+        if last > 1:
+            response.headers["Link"] = f'<{url}?per_page={self.per_page}&page={last}>; rel="last"'
+        if (headers or {}).get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = json.dumps(body).encode()
+        return response
+
+
+class FakeGitHubRepoAPI:
+    """
+    Async handler for httpx.MockTransport serving /repos/<owner>/<name>/
+    readme, languages and commits after `latency` seconds. Records each
+    path and the peak number of requests in flight. Responses queued in
+    `rate_limited` (header dicts) are answered first with 403.
+    """
+
+    def __init__(self, latency=0.0, readme="# Project\n\n[![ci](badge.svg)](x)\nShards Postgres by tenant."):
+        self.latency = latency
+        self.readme = readme
+        self.calls = []
+        self.rate_limited = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def transport(self):
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request):
+        self.calls.append(request.url.path)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if self.rate_limited:
+            return httpx.Response(403, headers=self.rate_limited.pop(0), json={"message": "API rate limit exceeded"})
+
+        name = request.url.path.split("/")[3]
+        if request.url.path.endswith("/readme"):
+            return httpx.Response(200, json={"content": base64.b64encode(self.readme.encode()).decode()})
+        if request.url.path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 9000, "Shell": 1000})
+        commits = [
+            {"commit": {"message": f"Fix {name} #{i}\n\nDetails", "author": {"date": f"2026-01-{i:02d}T10:00:00Z"}}}
+            for i in range(1, int(request.url.params.get("per_page", 5)) + 1)
+        ]
+        return httpx.Response(200, json=commits)
+
+
+class FakeTTSClient:
+    """
+    texttospeech.TextToSpeechClient look-alike: returns deterministic fake
+    audio bytes after `latency` seconds and records every synthesized text.
+    """
+
+    def __init__(self, latency=0.0, bytes_per_char=40):
+        self.latency = latency
+        self.bytes_per_char = bytes_per_char
+        self.calls = []
+
+    def synthesize_speech(self, *, input, voice, audio_config):
+        self.calls.append(input.text)
+        time.sleep(self.latency)
+        audio = (input.text.encode("utf-8") * self.bytes_per_char)[:len(input.text) * self.bytes_per_char]
+        return SimpleNamespace(audio_content=b"ID3" + audio)
+
+
+class FakeRedis:
+    """
+    Just enough of redis-py for RedisBucketStore: hashes with PEXPIRE and
+    register_script(). Lua can't run here, so scripts execute a Python port
+    of the token-bucket script against the same commands (atomic via a lock).
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._hashes = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+        self.script_calls = 0
+
+    def hmget(self, key, *fields):
+        if key in self._expires and self._clock() >= self._expires[key]:
+            self._hashes.pop(key, None)
+            self._expires.pop(key, None)
+        values = self._hashes.get(key, {})
+        return [values.get(f) for f in fields]
+
+    def hset(self, key, mapping):
+        self._hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def pexpire(self, key, ms):
+        self._expires[key] = self._clock() + ms / 1000
+
+    def register_script(self, source):
+        assert "HMGET" in source and "PEXPIRE" in source
+
+        def script(keys, args):
+            from backend.app.services.admission import token_bucket
+            rate, burst, now, cost = map(float, args)
+            with self._lock:
+                self.script_calls += 1
+                tokens, ts = self.hmget(keys[0], "tokens", "ts")
+                allowed, tokens, retry = token_bucket(
+                    float(tokens) if tokens is not None else None,
+                    float(ts) if ts is not None else None, now, rate, burst, cost)
+                self.hset(keys[0], {"tokens": tokens, "ts": now})
+                self.pexpire(keys[0], math.ceil(burst / rate * 1000))
+            return [int(allowed), str(retry)]
+        return script
@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import backend.app.main as main
+from backend.app.services.admission import (
+    AdmissionTimeout, ConcurrencyGate, InMemoryBucketStore, RateLimiter, RateLimitExceeded, RedisBucketStore,
+)
+from backend.app.services.report_jobs import ReportJobManager
+from backend.app.services.worker_pool import BoundedExecutor
+from fakes import FakeRedis
+
+
+class StubAgent:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def ask(self, message, mode="hr", seniority=2, session_id="default"):
+        time.sleep(self.latency)
+        return f"echo: {message}"
+
+    def ask_stream(self, message, mode="hr", seniority=2, session_id="default"):
+        yield {"type": "chunk", "text": f"echo: {message}"}
+        yield {"type": "done", "usage": {}}
+
+
+async def _post_all(requests):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*[client.post(path, json=body, headers=headers) for path, body, headers in requests])
+
+
+@pytest.fixture(autouse=True)
+def behind_cloud_run(monkeypatch):
+    monkeypatch.setattr(main, "TRUSTED_PROXY_HOPS", 1)
+
+
+def _chat(ip, path="/api/chat"):
+    # The last hop is the one Cloud Run appends; anything before it is client-supplied
+    return path, {"message": "hi", "session_id": ip}, {"X-Forwarded-For": f"203.0.113.7, {ip}"}
+
+
+def test_bucket_refills_over_time():
+    clock = [0.0]
+    store = InMemoryBucketStore(clock=lambda: clock[0])
+    limiter = RateLimiter(store=store, limits={"chat": "2/10"}, enabled=True)
+
+    limiter.check("chat", "a")
+    limiter.check("chat", "a")
+    with pytest.raises(RateLimitExceeded) as exc:
+        limiter.check("chat", "a")
+    assert exc.value.retry_after == pytest.approx(5.0)
+
+    clock[0] += 5
+    limiter.check("chat", "a")
+
+
+def test_each_client_and_endpoint_has_its_own_budget(monkeypatch):
+    monkeypatch.setattr(main, "agent", StubAgent())
+    monkeypatch.setattr(main, "limiter", RateLimiter(
+        store=InMemoryBucketStore(), limits={"chat": "2/60", "tts": "1/60"}, enabled=True))
+
+    responses = asyncio.run(_post_all([_chat("1.1.1.1")] * 3 + [_chat("2.2.2.2")]))
+    assert [r.status_code for r in responses[:3]].count(429) == 1
+    assert responses[3].status_code == 200
+
+    limited = next(r for r in responses if r.status_code == 429)
+    assert 1 <= int(limited.headers["Retry-After"]) <= 30
+    # The streaming endpoint draws from the same "chat" budget
+    assert asyncio.run(_post_all([_chat("1.1.1.1", "/api/chat/stream")]))[0].status_code == 429
+
+
+def test_spoofed_forwarded_for_does_not_reset_the_budget(monkeypatch):
+    monkeypatch.setattr(main, "agent", StubAgent())
+    monkeypatch.setattr(main, "limiter", RateLimiter(
+        store=InMemoryBucketStore(), limits={"chat": "2/60"}, enabled=True))
+
+    spoofed = [("/api/chat", {"message": "hi"}, {"X-Forwarded-For": f"10.9.9.{i}, 1.1.1.1"}) for i in range(4)]
+    assert [r.status_code for r in asyncio.run(_post_all(spoofed))].count(429) == 2
+
+
+def test_forwarded_for_is_ignored_without_a_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(main, "TRUSTED_PROXY_HOPS", 0)
+    monkeypatch.setattr(main, "agent", StubAgent())
+    monkeypatch.setattr(main, "limiter", RateLimiter(
+        store=InMemoryBucketStore(), limits={"chat": "2/60"}, enabled=True))
+
+    forged = [("/api/chat", {"message": "hi"}, {"X-Forwarded-For": f"10.9.9.{i}"}) for i in range(4)]
+    assert [r.status_code for r in asyncio.run(_post_all(forged))].count(429) == 2
+
+
+def test_purge_keeps_buckets_of_slower_endpoints():
+    clock = [0.0]
+    store = InMemoryBucketStore(max_keys=2, clock=lambda: clock[0])
+    limiter = RateLimiter(store=store, limits={"chat": "30/60", "report": "1/300"}, enabled=True)
+    limiter.check("report", "a")
+
+    clock[0] += 61  # full again for chat (60 s), not for report (300 s)
+    limiter.check("chat", "b")
+    limiter.check("chat", "c")  # over max_keys: purge
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("report", "a")
+
+
+def test_redis_store_is_shared_between_instances():
+    redis = FakeRedis()
+    first = RateLimiter(store=RedisBucketStore(redis), limits={"report": "3/300"}, enabled=True)
+    second = RateLimiter(store=RedisBucketStore(redis), limits={"report": "3/300"}, enabled=True)
+
+    first.check("report", "c")
+    second.check("report", "c")
+    first.check("report", "c")
+    with pytest.raises(RateLimitExceeded):
+        second.check("report", "c")
+    assert redis.script_calls == 4
+
+
+def test_gate_queues_then_times_out():
+    gate = ConcurrencyGate(max_concurrent=1, queue_timeout=0.2)
+
+    async def hold(seconds):
+        await gate.acquire()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            gate.release()
+
+    async def scenario():
+        # The second caller waits for the first (0.05 s < deadline), the third gives up
+        return await asyncio.gather(hold(0.05), hold(0.3), hold(0), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert results[:2] == [None, None]
+    assert isinstance(results[2], AdmissionTimeout)
+    stats = gate.stats()
+    assert stats["active"] == 0 and stats["waiting"] == 0 and stats["timed_out"] == 1
+
+
+def test_busy_upstream_returns_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(main, "agent", StubAgent(latency=0.3))
+    monkeypatch.setattr(main, "pool", BoundedExecutor(max_workers=4, max_queue=4))
+    monkeypatch.setattr(main, "limiter", RateLimiter(store=InMemoryBucketStore(), enabled=False))
+    monkeypatch.setattr(main, "gate", ConcurrencyGate(max_concurrent=1, queue_timeout=0.1))
+
+    responses = asyncio.run(_post_all([_chat(f"9.9.9.{i}") for i in range(2)]))
+    assert sorted(r.status_code for r in responses) == [200, 503]
+    busy = next(r for r in responses if r.status_code == 503)
+    assert busy.headers["Retry-After"] == "1"
+
+
+def test_streaming_response_releases_its_slot(monkeypatch):
+    monkeypatch.setattr(main, "agent", StubAgent())
+    monkeypatch.setattr(main, "limiter", RateLimiter(store=InMemoryBucketStore(), enabled=False))
+    monkeypatch.setattr(main, "gate", ConcurrencyGate(max_concurrent=1, queue_timeout=0.5))
+
+    responses = asyncio.run(_post_all([_chat("3.3.3.3", "/api/chat/stream")] * 3))
+    assert all(r.status_code == 200 for r in responses)
+    assert main.gate.stats()["active"] == 0
+
+
+class ReportAgent:
+    def __init__(self):
+        self.active_slots = []
+
+    def generate_hiring_report(self, chat_history, session_id=None):
+        self.active_slots.append(main.gate.stats()["active"])
+        return b"%PDF-fake"
+
+
+def test_report_jobs_hold_an_upstream_slot(monkeypatch):
+    agent = ReportAgent()
+    monkeypatch.setattr(main, "agent", agent)
+    monkeypatch.setattr(main, "gate", ConcurrencyGate(max_concurrent=1, queue_timeout=0.1))
+    manager = ReportJobManager(main.render_hiring_report, BoundedExecutor(max_workers=1, max_queue=2))
+
+    def finished(job):
+        while manager.get(job.id).status in ("queued", "running"):
+            time.sleep(0.01)
+        return manager.get(job.id).status
+
+    assert finished(manager.submit([{"role": "user", "content": "a"}])) == "done"
+    assert agent.active_slots == [1] and main.gate.stats()["active"] == 0
+
+    async def gate_taken():
+        await main.gate.acquire()  # every slot busy with chat traffic
+        try:
+            return await asyncio.to_thread(finished, manager.submit([{"role": "user", "content": "b"}]))
+        finally:
+            main.gate.release()
+
+    assert asyncio.run(gate_taken()) == "failed"
+    assert agent.active_slots == [1] and main.gate.stats()["timed_out"] == 1
@@ -0,0 +1,33 @@
+import json
+
+from benchmarks import bench_suite, harness
+
+
+def test_suite_runs_offline_and_saves_json(tmp_path):
+    out = tmp_path / "run.json"
+    report = bench_suite.main(["--only", "instructions", "pdf", "--repeat", "2", "--out", str(out)])
+
+    saved = json.loads(out.read_text())
+    assert saved["results"] == report["results"]
+    assert {"instructions.table", "pdf.render"} <= set(saved["results"])
+    assert saved["results"]["pdf.render"]["runs"] == 2
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"chat.throughput": {"median_ms": 100.0}, "pdf.render": {"median_ms": 10.0}}}
+    current = {"results": {"chat.throughput": {"median_ms": 150.0}, "pdf.render": {"median_ms": 10.2}}}
+
+    lines = harness.compare(baseline, current, threshold=0.10)
+    assert len(lines) == 2
+    assert "REGRESSION" in lines[0] and "+50.0%" in lines[0]
+    assert "REGRESSION" not in lines[1]
+
+
+def test_chat_case_runs_at_the_requested_concurrency(tmp_path, monkeypatch):
+    import backend.app.main as main
+    for name in ("agent", "limiter", "gate", "pool"):
+        monkeypatch.setattr(main, name, getattr(main, name))  # restored after the test
+
+    report = bench_suite.main(["--only", "chat", "--concurrency", "32", "--requests", "64", "--latency", "0.01",
+                               "--out", str(tmp_path / "run.json")])
+    assert report["results"]["chat.throughput"]["runs"] == 64
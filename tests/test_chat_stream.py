@@ -0,0 +1,51 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import backend.app.main as main
+from backend.app.services.ai_agent import AIAgentService
+from fakes import FakeGenAIClient
+
+
+def _parse_sse(body):
+    events = []
+    for raw in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in raw.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_emits_chunks_then_usage(monkeypatch):
+    agent = AIAgentService(client=FakeGenAIClient(reply="Yes. In Stream Refinery I used Python."))
+    monkeypatch.setattr(main, "agent", agent)
+
+    response = TestClient(main.app).post(
+        "/api/chat/stream", json={"message": "Do you know Python?", "session_id": "s1"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    chunks = [data["text"] for kind, data in events if kind == "chunk"]
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Yes. In Stream Refinery I used Python."
+
+    kind, done = events[-1]
+    assert kind == "done"
+    assert done["session_id"] == "s1"
+    assert done["usage"]["total_tokens"] > 0
+
+    # The streamed exchange is remembered like a regular /api/chat turn
+    assert agent.sessions.turn_count("s1") == 1
+
+
+def test_out_of_range_mode_and_seniority_are_rejected(monkeypatch):
+    client = FakeGenAIClient()
+    monkeypatch.setattr(main, "agent", AIAgentService(client=client))
+    http = TestClient(main.app)
+
+    for body in ({"seniority": 7}, {"seniority": -1}, {"mode": "pirate"}):
+        for path in ("/api/chat", "/api/chat/stream"):
+            assert http.post(path, json={"message": "Hi", **body}).status_code == 422
+    assert client.calls == []
+    assert http.post("/api/chat", json={"message": "Hi", "mode": "tech_lead", "seniority": 3}).status_code == 200
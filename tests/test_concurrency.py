@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import httpx
+
+import backend.app.main as main
+from backend.app.services.worker_pool import BoundedExecutor
+
+UPSTREAM_LATENCY = 0.2
+REQUESTS = 8
+
+
+class StubAgent:
+    """Mimics a slow, blocking Gemini round trip."""
+
+    def ask(self, message, mode="hr", seniority=2, session_id="default"):
+        time.sleep(UPSTREAM_LATENCY)
+        return f"echo: {message}"
+
+
+async def _fire(n):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/api/chat", json={"message": f"q{i}", "session_id": f"s{i}"})
+            for i in range(n)
+        ])
+        return responses, time.perf_counter() - start
+
+
+def test_chat_requests_run_concurrently(monkeypatch):
+    monkeypatch.setattr(main, "agent", StubAgent())
+    monkeypatch.setattr(main, "pool", BoundedExecutor(max_workers=REQUESTS, max_queue=0))
+
+    responses, elapsed = asyncio.run(_fire(REQUESTS))
+
+    assert all(r.status_code == 200 for r in responses)
+    serial_time = REQUESTS * UPSTREAM_LATENCY
+    print(f"\n{REQUESTS} requests in {elapsed:.2f}s "
+          f"({REQUESTS / elapsed:.1f} req/s vs {1 / UPSTREAM_LATENCY:.1f} req/s serial)")
+    # A blocking handler would take ~serial_time; the pool overlaps the upstream waits
+    assert elapsed < serial_time / 2
+
+
+def test_saturated_pool_returns_503(monkeypatch):
+    monkeypatch.setattr(main, "agent", StubAgent())
+    monkeypatch.setattr(main, "pool", BoundedExecutor(max_workers=1, max_queue=1))
+
+    responses, _ = asyncio.run(_fire(4))
+    codes = sorted(r.status_code for r in responses)
+
+    assert codes == [200, 200, 503, 503]
+    rejected = [r for r in responses if r.status_code == 503]
+    assert all(r.headers["retry-after"] == "1" for r in rejected)
@@ -0,0 +1,111 @@
+import os
+import shutil
+
+import pytest
+
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.context_cache import ContextCacheManager
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CONTEXT_MODE", "full")  # the only mode that uses the cached context
+    for name in ("dynamic_profile.json", "resume.pdf"):
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path / name)
+    return str(tmp_path)
+
+
+def _last_call(client):
+    return client.calls[-1]
+
+
+def test_turns_reference_cache_and_send_only_the_delta(data_dir):
+    client = FakeGenAIClient()
+    agent = AIAgentService(client=client, data_dir=data_dir)
+
+    agent.ask("Do you know Python?", mode="tech_lead", seniority=3, session_id="s")
+    agent.ask("And Rust?", mode="tech_lead", seniority=3, session_id="s")
+
+    assert len(client.caches.created) == 1
+    call = _last_call(client)
+    assert call.config.cached_content == client.caches.created[0]
+    assert call.config.system_instruction is None
+    delta, message = call.contents[-1].parts
+    assert "TECH LEAD" in delta.text and "LEVEL: CTO" in delta.text
+    assert message.text == "And Rust?"
+    # The static prompt lives in the cache, not in every request
+    assert len(str(call.contents)) < len(agent.base_system_instruction) / 4
+    # History keeps only the plain user message
+    history = agent.sessions.get_history("s")
+    assert [p.text for p in history[0].parts] == ["Do you know Python?"]
+
+
+def test_falls_back_to_full_instruction_when_cache_cannot_be_created(data_dir):
+    client = FakeGenAIClient(fail_cache_create=True)
+    agent = AIAgentService(client=client, data_dir=data_dir)
+
+    assert agent.ask("Hi") == "Fake answer from the digital twin."
+    call = _last_call(client)
+    assert call.config.cached_content is None
+    assert call.config.system_instruction == agent.instructions[("hr", 2)]
+    assert agent.context_cache.stats()["failures"] == 1
+
+
+def test_rejected_cache_is_invalidated_and_request_retried(data_dir):
+    client = FakeGenAIClient()
+    agent = AIAgentService(client=client, data_dir=data_dir)
+    agent.ask("Hi")
+    client.caches.live.clear()  # expired server-side
+
+    assert agent.ask("Hi again") == "Fake answer from the digital twin."
+    assert _last_call(client).config.system_instruction is not None
+
+
+def test_cache_recreated_when_profile_changes(data_dir):
+    client = FakeGenAIClient()
+    agent = AIAgentService(client=client, data_dir=data_dir)
+    agent.ask("Hi")
+    first_cache = client.caches.created[0]
+
+    with open(os.path.join(data_dir, "dynamic_profile.json"), "w", encoding="utf-8") as f:
+        f.write('{"projects": [{"name": "brand-new-repo"}]}')
+    assert agent.reload_knowledge()
+    agent.ask("Any new projects?")
+
+    assert "brand-new-repo" in [c.title for c in agent.retrieval_index.retrieve("brand-new-repo")]
+    assert len(client.caches.created) == 2
+    assert first_cache in client.caches.deleted
+    assert _last_call(client).config.cached_content == client.caches.created[1]
+
+
+def test_ttl_is_extended_before_expiry():
+    clock = [1000.0]
+    client = FakeGenAIClient()
+    manager = ContextCacheManager(client, "model", ttl_seconds=600, enabled=True, clock=lambda: clock[0])
+
+    name = manager.get("static prompt", "fp1")
+    clock[0] += 590  # inside the refresh margin
+    assert manager.get("static prompt", "fp1") == name
+    assert client.caches.updated == [name]
+    assert len(client.caches.created) == 1
+
+
+def test_disabled_cache_is_never_created():
+    client = FakeGenAIClient()
+    manager = ContextCacheManager(client, "model", enabled=False)
+    assert manager.get("static prompt", "fp1") is None
+    assert client.caches.created == []
+
+
+def test_retrieval_mode_sends_the_short_instruction_without_a_cache(data_dir, monkeypatch):
+    monkeypatch.setenv("CONTEXT_MODE", "retrieval")
+    client = FakeGenAIClient()
+    agent = AIAgentService(client=client, data_dir=data_dir)
+    agent.ask("Do you know Python?")
+
+    assert client.caches.created == []
+    assert _last_call(client).config.system_instruction == agent.instructions[("hr", 2)]
+    assert agent.context_cache.stats()["enabled"] is False
@@ -0,0 +1,111 @@
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+
+import backend.app.main as main
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.conversation_log import ConversationLog
+from backend.app.services.report_jobs import ReportJobManager
+from backend.app.services.worker_pool import BoundedExecutor
+from fakes import FakeGenAIClient
+
+
+def test_turns_are_written_in_batches_and_survive_a_restart(tmp_path):
+    path = str(tmp_path / "conversations.db")
+    log = ConversationLog(path=path, batch_size=100, flush_seconds=0.05)
+    for i in range(40):
+        log.append_turn("s1", f"question {i}", f"answer {i}")
+    log.append_turn("s2", "other visitor", "other answer")
+
+    transcript = log.transcript("s1")
+    assert len(transcript) == 80
+    assert transcript[0] == {"role": "user", "content": "question 0"}
+    assert transcript[-1] == {"role": "model", "content": "answer 39"}
+    stats = log.stats()
+    assert stats["written_rows"] == 82 and stats["batches"] < 41
+    log.close()
+
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reopened = ConversationLog(path=path)
+    assert reopened.transcript("s2") == [
+        {"role": "user", "content": "other visitor"}, {"role": "model", "content": "other answer"}
+    ]
+    assert reopened.transcript("unknown") == []
+    reopened.close()
+
+
+def test_append_does_not_wait_for_disk(tmp_path):
+    log = ConversationLog(path=str(tmp_path / "c.db"), flush_seconds=1.0)
+    started = time.perf_counter()
+    for i in range(500):
+        log.append_turn(f"s{i % 7}", "q" * 200, "a" * 2000)
+    assert time.perf_counter() - started < 0.5
+    # A reader does not sit out the batching window either
+    started = time.perf_counter()
+    assert len(log.transcript("s0")) == 2 * 72
+    assert time.perf_counter() - started < 1.0
+    log.close()
+
+
+def test_full_queue_drops_whole_turns(tmp_path):
+    log = ConversationLog(path=str(tmp_path / "c.db"), max_pending=3, flush_seconds=0.5)
+    log.append_turn("s", "q1", "a1")
+    log.append_turn("s", "q2", "a2")  # would leave a half-written exchange
+    assert log.stats()["dropped_turns"] == 1
+    assert [t["content"] for t in log.transcript("s")] == ["q1", "a1"]
+    log.close()
+
+
+class RecordingGenerator:
+    def __init__(self):
+        self.histories = []
+        self.options = []
+
+    def __call__(self, chat_history, **options):
+        self.histories.append(chat_history)
+        self.options.append(options)
+        return b"%PDF-fake"
+
+
+def test_report_reads_the_transcript_by_session_id(tmp_path, monkeypatch):
+    generate = RecordingGenerator()
+    monkeypatch.setattr(main, "agent", AIAgentService(client=FakeGenAIClient(reply="Sharded Postgres.")))
+    monkeypatch.setattr(main, "conversations", ConversationLog(path=str(tmp_path / "c.db")))
+    monkeypatch.setattr(main, "reports", ReportJobManager(generate, BoundedExecutor(max_workers=1, max_queue=2)))
+    http = TestClient(main.app)
+
+    for question in ("How did you scale Kafka?", "What about Postgres?"):
+        assert http.post("/api/chat", json={"message": question, "session_id": "visitor-1"}).status_code == 200
+
+    job = http.post("/api/reports", json={"session_id": "visitor-1"}).json()
+    while job["status"] not in ("done", "failed"):
+        time.sleep(0.01)
+        job = http.get(f"/api/reports/{job['job_id']}").json()
+    assert job["status"] == "done"
+    assert generate.histories[0] == [
+        {"role": "user", "content": "How did you scale Kafka?"},
+        {"role": "model", "content": "Sharded Postgres."},
+        {"role": "user", "content": "What about Postgres?"},
+        {"role": "model", "content": "Sharded Postgres."},
+    ]
+    assert generate.options[0] == {"session_id": "visitor-1"}  # the compactor keys its summaries on it
+
+    assert http.post("/api/reports", json={"session_id": "nobody"}).status_code == 404
+    assert http.post("/api/reports", json={}).status_code == 422
+
+
+def test_transcript_is_per_session_and_persona(tmp_path, monkeypatch):
+    log = ConversationLog(path=str(tmp_path / "c.db"))
+    log.append_turn("visitor-1", "Hi Vero", "Hello!", persona_id=main.DEFAULT_PERSONA)
+    log.append_turn("visitor-1", "Hi Ada", "Hi, I'm Ada.", persona_id="ada")
+    assert [t["content"] for t in log.transcript("visitor-1", "ada")] == ["Hi Ada", "Hi, I'm Ada."]
+    assert log.transcript("visitor-1") == []
+
+    generate = RecordingGenerator()
+    monkeypatch.setattr(main, "conversations", log)
+    monkeypatch.setattr(main, "reports", ReportJobManager(generate, BoundedExecutor(max_workers=1, max_queue=2)))
+    pdf = TestClient(main.app).post("/api/generate-report", json={"session_id": "visitor-1"})
+    assert pdf.status_code == 200
+    assert generate.histories == [[{"role": "user", "content": "Hi Vero"}, {"role": "model", "content": "Hello!"}]]
+    log.close()
@@ -0,0 +1,126 @@
+import json
+
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.fast_path import FastPathMatcher
+from backend.app.services.github_sync import GitHubSyncService
+from backend.app.services.portfolio_index import INDEX_FILE, PortfolioIndex
+from fakes import FakeGenAIClient, FakeGitHubSession, make_repo
+
+PROFILE = {
+    "generated_at": "2026-03-01 10:00:00",
+    "projects": [
+        {"name": "stream-refinery", "language": "Python", "stars": 3, "description": "Kafka consumer pipeline.",
+         "topics": ["kafka"], "created": "2025-02-01", "last_update": "2025-09-01", "url": "https://x/stream"},
+        {"name": "rusty-agent", "language": "Rust", "stars": 1, "description": "Tokio based agent runtime.",
+         "topics": [], "created": "2026-01-10", "last_update": "2026-02-01", "url": "https://x/rusty"},
+        {"name": "venture-assist-ai", "language": "Python", "stars": 7, "description": "Google ADK assistant.",
+         "topics": ["gemini", "kafka"], "created": "2025-06-01", "last_update": "2025-11-20",
+         "url": "https://x/venture"},
+        {"name": "notes", "language": None, "stars": 0, "description": "", "topics": [], "created": "2025-05-05",
+         "last_update": "2025-05-05"},
+    ],
+}
+
+
+def test_index_round_trips_through_the_binary_file(tmp_path):
+    index = PortfolioIndex.from_profile(PROFILE)
+    assert index.names[0] == "venture-assist-ai"  # star-rank order
+    assert index.rows_by_topic("Kafka") == [0, 1]
+    assert index.rows_by_year(2026) == [2]
+
+    index.save(str(tmp_path / INDEX_FILE))
+    loaded = PortfolioIndex.load(str(tmp_path / INDEX_FILE))
+    assert [loaded.row(i) for i in range(len(loaded))] == [index.row(i) for i in range(len(index))]
+    assert loaded.source == PROFILE["generated_at"]
+    assert PortfolioIndex.for_profile(str(tmp_path), dict(PROFILE, generated_at="later")).source == "later"
+
+
+def test_factual_questions_are_answered_from_the_index():
+    index = PortfolioIndex.from_profile(PROFILE)
+    matcher = FastPathMatcher(enabled=True)
+
+    assert matcher.match("How many projects did you build in 2025?", index).answer.startswith("3 projects from 2025")
+    assert matcher.match("how many repos use kafka", index).answer.startswith("2 projects with kafka")
+    most = matcher.match("What's your most-starred project?", index)
+    assert most.intent == "most_starred" and "**venture-assist-ai** (★7)" in most.answer
+    assert "1 of my projects uses Rust:" in matcher.match("Which projects use Rust?", index).answer
+    assert "don't have a project with Go" in matcher.match("Which repos are written in Go?", index).answer
+    assert matcher.match("What languages do you use?", index).answer == \
+        "Languages across my GitHub projects: Python (2), Rust (1)."
+
+    # Mentions a language but is not a lookup: rows go to Gemini as context
+    python = matcher.match("Do you enjoy Python?", index)
+    assert python.answer is None and "stream-refinery" in python.context
+    assert matcher.match("Tell me about yourself", index) is None
+    assert matcher.match("How many projects? " + "x" * 200, index) is None
+    assert matcher.stats()["answered"] == 6 and matcher.stats()["injected"] == 1
+
+
+def test_questions_that_only_look_like_lookups_go_to_the_model():
+    index = PortfolioIndex.from_profile(dict(PROFILE, projects=PROFILE["projects"] + [
+        {"name": "go-tool", "language": "Go", "stars": 0, "topics": ["ai"], "last_update": "2025-01-01"}]))
+    matcher = FastPathMatcher(enabled=True)
+
+    for question in ("Which project would you go back and rewrite?",
+                     "Which projects do not use Python?",
+                     "Which projects aren't in Python?",
+                     "How many people contributed to your projects?",
+                     "Which projects used AI agents?",
+                     "Which projects use Python and Rust?",
+                     "How many projects use Kafka without Gemini?"):
+        result = matcher.match(question, index)
+        assert result is None or result.answer is None, question
+    # "go" inside a sentence is a verb, not the language
+    assert matcher.match("Would you go with Postgres again?", index) is None
+
+
+def test_agent_answers_lookups_without_calling_gemini(tmp_path):
+    (tmp_path / "dynamic_profile.json").write_text(json.dumps(PROFILE))
+    client = FakeGenAIClient(fail_cache_create=True)
+    agent = AIAgentService(client=client, data_dir=str(tmp_path))
+
+    assert "venture-assist-ai" in agent.ask("Which projects use Gemini?", session_id="s")
+    events = list(agent.ask_stream("How many projects in 2026?", session_id="s"))
+    assert events[-1]["fast_path"] is True
+    assert client.calls == []
+    assert agent.stats()["fast_path"]["answered"] == 2
+
+    agent.ask("Do you enjoy Rust?", session_id="s")
+    assert any("PORTFOLIO INDEX" in (p.text or "") and "rusty-agent" in p.text
+               for p in client.calls[-1].contents[-1].parts)
+
+
+def test_year_questions_need_creation_dates():
+    older_sync = dict(PROFILE, projects=[{k: v for k, v in p.items() if k != "created"} for p in PROFILE["projects"]])
+    index = PortfolioIndex.from_profile(older_sync)
+    assert not index.years_exact
+    assert FastPathMatcher(enabled=True).match("How many projects in 2026?", index) is None
+
+
+def test_records_cached_before_the_created_field_are_reprocessed(tmp_path):
+    repos = [make_repo(i) for i in range(3)]
+    syncer = GitHubSyncService(username="vero-code", cache_path=str(tmp_path / "github_cache.json"),
+                               session=FakeGitHubSession(repos))
+    syncer.process_data(repos)
+    # What a cache written by an older version looks like
+    for record in syncer.cache["projects"].values():
+        del record["project"]["created"]
+    syncer.cache.pop("project_schema")
+
+    data = syncer.process_data(repos)
+    assert syncer.reprocessed == 3
+    assert all(p["created"] == "2025-01-15" for p in data["projects"])
+    assert syncer.portfolio_index.years_exact
+
+
+def test_sync_writes_the_index_next_to_the_profile(tmp_path):
+    repos = [make_repo(i, stars=i) for i in range(3)]
+    syncer = GitHubSyncService(username="vero-code", cache_path=str(tmp_path / "github_cache.json"),
+                               session=FakeGitHubSession(repos))
+    data = syncer.process_data(repos)
+    syncer.save_to_json(data, str(tmp_path / "dynamic_profile.json"))
+
+    index = PortfolioIndex.load(str(tmp_path / INDEX_FILE))
+    assert index.names == ["repo-2", "repo-1", "repo-0"]
+    assert index.rows_by_year(2025) == [0, 1, 2]
+    assert PortfolioIndex.for_profile(str(tmp_path), data).source == data["generated_at"]
@@ -0,0 +1,133 @@
+import itertools
+import os
+import time
+
+import pytest
+
+from backend.app.services import metrics
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.gemini_caller import BudgetExceeded, CircuitBreaker, GeminiCaller
+from fakes import FakeGenAIClient, api_error
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+
+
+def _caller(**kwargs):
+    options = dict(fallback_model="lite", budgets={"chat": 2.0}, hedge=True,
+                   hedge_min_seconds=0.01, hedge_default_seconds=0.05)
+    options.update(kwargs)
+    return GeminiCaller("primary", **options)
+
+
+def test_slow_first_attempt_is_hedged_and_the_hedge_wins():
+    calls = itertools.count()
+
+    def attempt(model, timeout):
+        time.sleep(1.0 if next(calls) == 0 else 0.01)  # one request hits the slow tail
+        return model
+
+    caller = _caller()
+    before = metrics.GEMINI_CALLS.value(endpoint="chat", path="hedge", outcome="ok")
+    started = time.perf_counter()
+    assert caller.call("chat", attempt) == "primary"
+    assert time.perf_counter() - started < 0.5
+    assert caller.stats()["hedged"] == 1 and caller.stats()["hedge_wins"] == 1
+    assert metrics.GEMINI_CALLS.value(endpoint="chat", path="hedge", outcome="ok") == before + 1
+
+
+def test_hedge_delay_follows_the_observed_p95():
+    caller = _caller(hedge_default_seconds=5.0)
+    assert caller.hedge_delay("chat", "primary") == 5.0
+    window = caller._window("chat", "primary")
+    for i in range(1, 101):
+        window.observe(i / 100)
+    assert caller.hedge_delay("chat", "primary") == pytest.approx(0.95)
+
+
+def test_budget_bounds_the_call_even_if_gemini_hangs():
+    caller = _caller(budgets={"chat": 0.2}, hedge=False, fallback_model="")
+    started = time.perf_counter()
+    with pytest.raises(BudgetExceeded):
+        caller.call("chat", lambda model, timeout: time.sleep(2))
+    assert time.perf_counter() - started < 0.5
+    assert caller.stats()["timeouts"] == 1
+
+
+def test_fast_failure_is_retried_on_the_fallback_model():
+    def attempt(model, timeout):
+        if model == "primary":
+            raise api_error(503, "model overloaded")
+        return model
+
+    caller = _caller()
+    assert caller.call("chat", attempt) == "lite"
+    assert caller.stats()["fallbacks"] == 1
+
+
+def test_breaker_routes_to_fallback_while_primary_is_slow_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker(window=4, min_calls=2, slow_seconds=0.05, cooldown_seconds=30, clock=lambda: now[0])
+    caller = _caller(breaker=breaker, hedge=False)
+    slow = [True]
+
+    def attempt(model, timeout):
+        time.sleep(0.06 if model == "primary" and slow[0] else 0.0)
+        return model
+
+    assert [caller.call("chat", attempt) for _ in range(2)] == ["primary", "primary"]
+    assert breaker.state == "open"
+    assert caller.call("chat", attempt) == "lite"
+
+    now[0] += 31  # cooldown over: one probe goes to the (recovered) primary model
+    slow[0] = False
+    assert caller.call("chat", attempt) == "primary"
+    assert breaker.state == "closed"
+    assert metrics.BREAKER_TRANSITIONS.value(state="half_open") >= 1
+
+
+def test_agent_answers_from_the_fallback_model_when_the_primary_times_out():
+    client = FakeGenAIClient(reply="Lite answer.", latency=lambda model: 1.0 if model == "gemini-3-flash-preview" else 0.0)
+    caller = GeminiCaller("gemini-3-flash-preview", fallback_model="lite", budgets={"chat": 0.2, "report": 0.2},
+                          hedge=False, breaker=CircuitBreaker(min_calls=1, cooldown_seconds=60))
+    agent = AIAgentService(client=client, data_dir=DATA_DIR, gemini_caller=caller)
+
+    assert agent.ask("How did you scale Kafka?", session_id="a").startswith("AI Error:")
+    assert agent.ask("How did you scale Kafka?", session_id="b") == "Lite answer."
+    assert client.calls[-1].model == "lite"
+    assert client.calls[-1].config.cached_content is None  # the primary model's cached context is not reused
+    assert client.calls[-1].config.http_options.timeout <= 200
+    # Not cached for other visitors: the next answer comes from Gemini again
+    assert agent.response_cache.stats()["entries"] == 0
+    assert agent.stats()["gemini"]["breaker"] == "open"
+
+
+def test_local_errors_are_not_retried_or_held_against_the_breaker():
+    breaker = CircuitBreaker(min_calls=2, cooldown_seconds=60)
+    caller = _caller(breaker=breaker, hedge=False)
+    models = []
+
+    def attempt(model, timeout):
+        models.append(model)
+        raise KeyError(("hr", 7))  # e.g. a bad lookup while building the request
+
+    for _ in range(5):
+        with pytest.raises(KeyError):
+            caller.call("chat", attempt)
+    assert models == ["primary"] * 5
+    assert breaker.state == "closed"
+
+
+def test_agent_bugs_do_not_route_visitors_to_the_fallback_model():
+    def broken(contents):
+        raise ValueError("bad response handling")
+
+    client = FakeGenAIClient(reply=broken)
+    caller = GeminiCaller("gemini-3-flash-preview", fallback_model="lite", hedge=False,
+                          breaker=CircuitBreaker(min_calls=2, cooldown_seconds=60))
+    agent = AIAgentService(client=client, data_dir=DATA_DIR, gemini_caller=caller)
+    for i in range(3):
+        assert agent.ask("How did you scale Kafka?", session_id=f"a{i}").startswith("AI Error:")
+        assert list(agent.ask_stream("What about Postgres?", session_id=f"b{i}"))[-1]["type"] == "error"
+
+    assert caller.breaker.state == "closed"
+    assert all(call.model == "gemini-3-flash-preview" for call in client.calls)
@@ -0,0 +1,56 @@
+from backend.app.services.github_sync import GitHubSyncService
+from fakes import FakeGitHubSession, make_repo
+
+
+def _syncer(tmp_path, session, **kwargs):
+    return GitHubSyncService(
+        username="vero-code", cache_path=str(tmp_path / "github_cache.json"), session=session, **kwargs
+    )
+
+
+def test_fetches_all_pages_in_order(tmp_path):
+    session = FakeGitHubSession([make_repo(i) for i in range(250)], per_page=100)
+    repos = _syncer(tmp_path, session).fetch_repos()
+
+    assert [r["name"] for r in repos] == [f"repo-{i}" for i in range(250)]
+    # Page count comes from the Link header: no trailing empty-page request
+    assert sorted(c["params"]["page"] for c in session.calls) == [1, 2, 3]
+
+
+def test_unchanged_account_is_served_from_etag_cache(tmp_path):
+    session = FakeGitHubSession([make_repo(i) for i in range(150)], per_page=100)
+    _syncer(tmp_path, session).fetch_repos()
+
+    # A fresh process re-reads the ETags from disk
+    syncer = _syncer(tmp_path, session)
+    repos = syncer.fetch_repos()
+
+    assert len(repos) == 150
+    assert syncer.changed is False
+    assert syncer.not_modified == 2
+    assert all("If-None-Match" in c["headers"] for c in session.calls[-2:])
+
+
+def test_only_updated_repos_are_reprocessed(tmp_path):
+    repos = [make_repo(i) for i in range(5)]
+    syncer = _syncer(tmp_path, FakeGitHubSession(repos))
+    syncer.process_data(repos)
+    assert syncer.reprocessed == 5
+
+    repos[2] = make_repo(2, updated_at="2026-02-01T10:00:00Z", stars=9)
+    data = syncer.process_data(repos)
+
+    assert syncer.reprocessed == 1
+    assert data["total_projects_2025_2026"] == 5
+    assert data["projects"][0]["name"] == "repo-2"
+    assert data["projects"][0]["last_update"] == "2026-02-01"
+
+
+def test_waits_for_rate_limit_reset_then_retries(tmp_path):
+    session = FakeGitHubSession([make_repo(1)])
+    session.rate_limited = [{"Retry-After": "7"}, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}]
+    waits = []
+    repos = _syncer(tmp_path, session, sleep=waits.append).fetch_repos()
+
+    assert [r["name"] for r in repos] == ["repo-1"]
+    assert waits == [7.0, 1]
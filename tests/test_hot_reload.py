@@ -0,0 +1,94 @@
+import asyncio
+import os
+import shutil
+import time
+
+import httpx
+import pytest
+
+import backend.app.main as main
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.knowledge import KnowledgeWatcher
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+NEW_PROFILE = '{"projects": [{"name": "brand-new-repo", "language": "Rust"}]}'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in ("dynamic_profile.json", "resume.pdf"):
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path / name)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def agent(data_dir):
+    return AIAgentService(client=FakeGenAIClient(), data_dir=data_dir)
+
+
+def _write_profile(data_dir, text):
+    with open(os.path.join(data_dir, "dynamic_profile.json"), "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_reload_swaps_snapshot_and_clears_response_cache(agent, data_dir):
+    agent.ask("Tell me about yourself")
+    old = agent.knowledge
+
+    _write_profile(data_dir, NEW_PROFILE)
+    assert agent.reload_knowledge()
+
+    assert agent.knowledge is not old
+    assert agent.knowledge_fingerprint != old.fingerprint
+    assert agent.profile_data["projects"][0]["name"] == "brand-new-repo"
+    assert agent.response_cache.stats()["entries"] == 0
+    # A request that grabbed the old snapshot still sees consistent old data
+    assert "brand-new-repo" not in old.base_system_instruction
+    assert old.profile_data["projects"][0]["name"] != "brand-new-repo"
+
+
+def test_unchanged_or_touched_files_do_not_reload(agent, data_dir):
+    old = agent.knowledge
+    assert not agent.reload_knowledge()
+
+    path = os.path.join(data_dir, "dynamic_profile.json")
+    later = time.time() + 5
+    os.utime(path, (later, later))
+    assert not agent.reload_knowledge()
+    assert agent.knowledge.fingerprint == old.fingerprint
+    assert agent.knowledge.retrieval_index is old.retrieval_index
+    assert agent.reload_knowledge(force=True)
+
+
+def test_watcher_picks_up_changes(agent, data_dir):
+    watcher = KnowledgeWatcher(agent, interval=0.05)
+    watcher.start()
+    try:
+        _write_profile(data_dir, NEW_PROFILE)
+        deadline = time.time() + 5
+        while agent.profile_data["projects"][0].get("name") != "brand-new-repo" and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+    assert agent.profile_data["projects"][0]["name"] == "brand-new-repo"
+
+
+async def _post_reload(headers):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/api/admin/reload", headers=headers)
+
+
+def test_admin_reload_requires_token(agent, data_dir, monkeypatch):
+    monkeypatch.setattr(main, "agent", agent)
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert asyncio.run(_post_reload({"X-Admin-Token": ""})).status_code == 403
+
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+    assert asyncio.run(_post_reload({"X-Admin-Token": "wrong"})).status_code == 403
+
+    _write_profile(data_dir, NEW_PROFILE)
+    response = asyncio.run(_post_reload({"X-Admin-Token": "s3cret"}))
+    assert response.status_code == 200
+    assert response.json() == {"reloaded": True, "fingerprint": agent.knowledge_fingerprint}
@@ -0,0 +1,27 @@
+import pytest
+
+from backend.app.services.ai_agent import AIAgentService
+from fakes import FakeGenAIClient
+
+
+def test_all_variants_precomputed_and_read_only():
+    agent = AIAgentService(client=FakeGenAIClient())
+
+    assert len(agent.instructions) == 8
+    assert agent._build_dynamic_instruction("tech_lead", 3) is agent.instructions[("tech_lead", 3)]
+    assert "TECH LEAD" in agent.instructions[("tech_lead", 0)]
+    assert "LEVEL: CTO" in agent.instructions[("hr", 3)]
+    with pytest.raises(TypeError):
+        agent.instructions[("hr", 0)] = "tampered"
+
+
+def test_unknown_mode_falls_back_to_hr():
+    agent = AIAgentService(client=FakeGenAIClient())
+    assert agent._build_dynamic_instruction("pirate", 1) == agent.instructions[("hr", 1)]
+
+
+def test_profile_json_is_compact(monkeypatch):
+    monkeypatch.setenv("CONTEXT_MODE", "full")
+    agent = AIAgentService(client=FakeGenAIClient())
+    assert '\n  "projects"' not in agent.base_system_instruction
+    assert '"projects":[' in agent.base_system_instruction
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.app.main as main
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.personas import PersonaNotFound, PersonaRegistry, deep_sizeof
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+
+
+def _persona(root, persona_id, name):
+    path = root / persona_id
+    path.mkdir()
+    shutil.copy(os.path.join(DATA_DIR, "dynamic_profile.json"), path / "dynamic_profile.json")
+    (path / "persona.json").write_text(json.dumps({
+        "name": name, "short_name": name.split()[0], "possessive": "their", "github_username": persona_id,
+    }))
+
+
+@pytest.fixture
+def root(tmp_path):
+    _persona(tmp_path, "jane", "Jane Doe")
+    _persona(tmp_path, "max", "Max Power")
+    return str(tmp_path)
+
+
+def test_personas_load_lazily_with_their_own_identity(root):
+    client = FakeGenAIClient()
+    registry = PersonaRegistry(client, root=root)
+    assert registry.stats()["loaded"] == 0
+
+    jane = registry.get("jane")
+    assert "AI Digital Agent of Jane Doe" in jane.base_system_instruction
+    assert "Veronika" not in jane.base_system_instruction
+    assert jane.client is client and jane.injection_filter is registry.injection_filter
+    assert registry.get("jane") is jane
+
+    stats = registry.stats()
+    assert stats["loads"] == 1 and stats["hits"] == 1
+    assert stats["personas"]["jane"]["bytes"] == deep_sizeof(jane.knowledge) > 0
+
+
+def test_lru_evicts_least_recently_used_over_the_byte_budget(root, monkeypatch):
+    monkeypatch.setenv("CONTEXT_MODE", "full")
+    client = FakeGenAIClient()
+    probe = PersonaRegistry(client, root=root)
+    probe.get("jane")
+    one_persona = probe.stats()["bytes"]
+
+    registry = PersonaRegistry(client, root=root, max_bytes=int(one_persona * 1.5))
+    jane = registry.get("jane")
+    jane.ask("Tell me about yourself")  # registers jane's cached context
+    registry.get("max")
+
+    stats = registry.stats()
+    assert list(stats["personas"]) == ["max"]
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= registry.max_bytes
+    # The evicted persona's Gemini cached context is deleted right away
+    assert client.caches.deleted and not jane.context_cache.stats()["active"]
+
+
+def test_unknown_and_unsafe_persona_ids_are_rejected(root):
+    registry = PersonaRegistry(FakeGenAIClient(), root=root)
+    for persona_id in ("nobody", "../jane", "Jane", ""):
+        with pytest.raises(PersonaNotFound):
+            registry.get(persona_id)
+
+
+def test_concurrent_first_requests_share_one_load(root):
+    registry = PersonaRegistry(FakeGenAIClient(), root=root)
+    agents = []
+    threads = [threading.Thread(target=lambda: agents.append(registry.get("max"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert registry.stats()["loads"] == 1
+    assert len({id(a) for a in agents}) == 1
+
+
+def test_waiters_never_load_a_second_agent_while_the_first_is_published(root):
+    registry = PersonaRegistry(FakeGenAIClient(), root=root)
+    insert = registry._insert
+
+    def slow_insert(persona_id, entry):
+        time.sleep(0.1)  # waiters wake up while the first load is being published
+        return insert(persona_id, entry)
+
+    registry._insert = slow_insert
+    agents = []
+    threads = [threading.Thread(target=lambda: agents.append(registry.get("jane"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+        time.sleep(0.01)
+    for t in threads:
+        t.join()
+
+    assert registry.stats()["loads"] == 1
+    assert len({id(a) for a in agents}) == 1
+
+
+def test_chat_routes_by_persona_id(root, monkeypatch):
+    client = FakeGenAIClient(fail_cache_create=True)
+    monkeypatch.setattr(main, "agent", AIAgentService(client=client))
+    monkeypatch.setattr(main, "personas", PersonaRegistry(client, root=root))
+    http = TestClient(main.app)
+
+    assert http.post("/api/chat", json={"message": "Who are you?", "persona_id": "jane"}).status_code == 200
+    assert "Jane Doe" in client.calls[-1].config.system_instruction
+
+    assert http.post("/api/chat", json={"message": "Who are you?"}).status_code == 200
+    assert "Veronika Kashtanova" in client.calls[-1].config.system_instruction
+
+    assert http.post("/api/chat", json={"message": "hi", "persona_id": "nobody"}).status_code == 404
@@ -0,0 +1,106 @@
+import json
+import time
+
+from backend.app.services.github_sync import GitHubSyncService
+from backend.run_sync import sync_once
+from backend.app.services.repo_enrichment import RepoEnricher
+from backend.app.services.retrieval import chunk_projects
+from fakes import FakeGitHubRepoAPI, FakeGitHubSession, make_repo
+
+
+def _enricher(tmp_path, api, **kwargs):
+    return RepoEnricher(token="t", store_path=str(tmp_path / "github_enrichment.jsonl"),
+                        transport=api.transport(), **kwargs)
+
+
+def test_repos_are_enriched_concurrently_within_the_limit(tmp_path):
+    api = FakeGitHubRepoAPI(latency=0.05)
+    enricher = _enricher(tmp_path, api, concurrency=16, commits=3)
+    repos = [make_repo(i) for i in range(40)]
+
+    started = time.perf_counter()
+    assert enricher.enrich(repos) == 40
+    # 120 calls of 50 ms: sequential would take 6 s
+    assert time.perf_counter() - started < 1.5
+    assert len(api.calls) == 120 and api.peak_in_flight <= 16
+
+    details = enricher.lookup("repo-7")
+    assert details["readme"] == "# Project Shards Postgres by tenant."
+    assert details["language_bytes"] == {"Python": 9000, "Shell": 1000}
+    assert details["recent_commits"][0] == {"date": "2026-01-01", "message": "Fix repo-7 #1"}
+
+
+def test_only_repos_pushed_since_the_last_run_are_fetched(tmp_path):
+    api = FakeGitHubRepoAPI()
+    repos = [make_repo(i) for i in range(5)]
+    _enricher(tmp_path, api).enrich(repos)
+
+    repos[3] = make_repo(3, updated_at="2026-03-01T10:00:00Z")
+    enricher = _enricher(tmp_path, api)  # a fresh process reads the store from disk
+    api.calls.clear()
+    assert enricher.enrich(repos) == 1
+    assert sorted(api.calls) == ["/repos/vero-code/repo-3/commits", "/repos/vero-code/repo-3/languages",
+                                 "/repos/vero-code/repo-3/readme"]
+    assert enricher.stats()["unchanged"] == 4
+    assert enricher.lookup("repo-0")["language_bytes"] == {"Python": 9000, "Shell": 1000}
+
+
+def test_rate_limit_pauses_every_task_then_retries(tmp_path):
+    api = FakeGitHubRepoAPI()
+    api.rate_limited = [{"Retry-After": "7"}]
+    waits = []
+
+    async def sleep(seconds):
+        waits.append(round(seconds))
+
+    enricher = _enricher(tmp_path, api, sleep=sleep)
+    assert enricher.enrich([make_repo(0), make_repo(1)]) == 2
+    assert enricher.stats()["rate_limit_waits"] == 1
+    # The limited call and those started after it all waited out the same pause
+    assert waits and set(waits) <= {7, 6}
+    assert len(api.calls) == 7
+
+
+def test_profile_is_written_with_enrichment_and_feeds_retrieval(tmp_path):
+    repos = [make_repo(i, stars=i) for i in range(3)]
+    api = FakeGitHubRepoAPI()
+    syncer = GitHubSyncService(username="vero-code", cache_path=str(tmp_path / "github_cache.json"),
+                               session=FakeGitHubSession(repos), enricher=_enricher(tmp_path, api))
+    assert syncer.enrich(repos) == 3
+    syncer.save_to_json(syncer.process_data(repos), str(tmp_path / "dynamic_profile.json"))
+
+    profile = json.loads((tmp_path / "dynamic_profile.json").read_text(encoding="utf-8"))
+    assert [p["name"] for p in profile["projects"]] == ["repo-2", "repo-1", "repo-0"]
+    assert profile["projects"][0]["readme"].endswith("Shards Postgres by tenant.")
+    chunk = chunk_projects(profile)[0].text
+    assert "Languages: Python 90%, Shell 10%." in chunk and "Recent commits: Fix repo-2 #1" in chunk
+
+
+def test_streamed_profile_matches_a_plain_dump(tmp_path):
+    repos = [make_repo(i, stars=i) for i in range(2)]
+    syncer = GitHubSyncService(username="vero-code", cache_path=str(tmp_path / "github_cache.json"),
+                               session=FakeGitHubSession(repos), enricher=_enricher(tmp_path, FakeGitHubRepoAPI()))
+    syncer.enrich(repos)
+    data = syncer.process_data(repos)
+    path = tmp_path / "dynamic_profile.json"
+
+    syncer.save_to_json(data, str(path))
+    merged = {**data, "projects": [{**p, **syncer.enricher.lookup(p["name"])} for p in data["projects"]]}
+    assert path.read_text(encoding="utf-8") == json.dumps(merged, ensure_ascii=False, indent=2)
+
+    syncer.save_to_json(dict(data, projects=[]), str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["projects"] == []
+
+
+def test_sync_enriches_only_repos_within_the_cutoff(tmp_path):
+    old = dict(make_repo(9, updated_at="2024-03-01T10:00:00Z"), created_at="2023-01-01T10:00:00Z")
+    repos = [make_repo(0), make_repo(1), old]
+    api = FakeGitHubRepoAPI()
+    syncer = GitHubSyncService(username="vero-code", cache_path=str(tmp_path / "github_cache.json"),
+                               session=FakeGitHubSession(repos), enricher=_enricher(tmp_path, api))
+
+    assert sync_once(syncer, str(tmp_path / "dynamic_profile.json"))
+    assert len(api.calls) == 6 and not any("repo-9" in path for path in api.calls)
+    profile = json.loads((tmp_path / "dynamic_profile.json").read_text(encoding="utf-8"))
+    assert {p["name"] for p in profile["projects"]} == {"repo-0", "repo-1"}
+    assert all(p["readme"] for p in profile["projects"])
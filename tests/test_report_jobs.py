@@ -0,0 +1,112 @@
+import asyncio
+import io
+import time
+
+import httpx
+from pypdf import PdfReader
+
+import backend.app.main as main
+from backend.app.services.pdf_generator import PDFService
+from backend.app.services.report_jobs import ReportJobManager
+from backend.app.services.worker_pool import BoundedExecutor
+
+HISTORY = [
+    {"role": "user", "content": "Do you know Python?"},
+    {"role": "model", "content": "Yes. In 'Stream Refinery' I built a Kafka consumer."},
+]
+
+
+class SlowGenerator:
+    def __init__(self, latency=0.1, pdf=b"%PDF-fake"):
+        self.latency = latency
+        self.pdf = pdf
+        self.calls = 0
+
+    def __call__(self, chat_history):
+        self.calls += 1
+        time.sleep(self.latency)
+        return self.pdf
+
+
+def _wait(manager, job, timeout=5):
+    deadline = time.time() + timeout
+    while manager.get(job.id).status in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.01)
+    return manager.get(job.id)
+
+
+def test_submit_returns_immediately_and_job_completes():
+    generate = SlowGenerator(latency=0.2)
+    manager = ReportJobManager(generate, BoundedExecutor(max_workers=2, max_queue=2))
+
+    started = time.perf_counter()
+    job = manager.submit(HISTORY)
+    assert time.perf_counter() - started < 0.1
+    assert job.status in ("queued", "running")
+
+    job = _wait(manager, job)
+    assert job.status == "done" and job.pdf == b"%PDF-fake"
+    assert job.to_dict()["download_url"] == f"/api/reports/{job.id}/pdf"
+
+
+def test_same_transcript_is_not_regenerated():
+    generate = SlowGenerator()
+    manager = ReportJobManager(generate, BoundedExecutor(max_workers=2, max_queue=2))
+
+    first = manager.submit(HISTORY)
+    assert manager.submit(list(HISTORY)) is first  # still running: joins it
+    _wait(manager, first)
+
+    again = manager.submit(HISTORY)
+    assert again.status == "done" and again.pdf == first.pdf
+    assert manager.generate_now(HISTORY) == first.pdf
+    assert generate.calls == 1
+    assert manager.stats()["cache_hits"] == 2
+
+
+def test_failed_generation_is_reported_and_not_cached():
+    generate = SlowGenerator(latency=0, pdf=b"")
+    manager = ReportJobManager(generate, BoundedExecutor(max_workers=1, max_queue=1))
+
+    job = _wait(manager, manager.submit(HISTORY))
+    assert job.status == "failed" and job.error
+    _wait(manager, manager.submit(HISTORY))
+    assert generate.calls == 2
+
+
+def test_report_endpoints(monkeypatch):
+    manager = ReportJobManager(SlowGenerator(latency=0.05), BoundedExecutor(max_workers=2, max_queue=2))
+    monkeypatch.setattr(main, "reports", manager)
+
+    async def flow():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            submitted = await client.post("/api/reports", json={"chat_history": HISTORY})
+            job = submitted.json()
+            early = await client.get(f"/api/reports/{job['job_id']}/pdf")
+            while job["status"] not in ("done", "failed"):
+                await asyncio.sleep(0.02)
+                job = (await client.get(f"/api/reports/{job['job_id']}")).json()
+            pdf = await client.get(job["download_url"])
+            missing = await client.get("/api/reports/nope")
+            return submitted, early, pdf, missing
+
+    submitted, early, pdf, missing = asyncio.run(flow())
+    assert submitted.status_code == 202
+    assert early.status_code == 409
+    assert pdf.status_code == 200 and pdf.content == b"%PDF-fake"
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert missing.status_code == 404
+
+
+def test_long_report_repeats_header_template_on_every_page():
+    data = {
+        "candidate_name": "Veronika Kashtanova",
+        "session_id": "AUTO-GEN-120000",
+        "executive_summary": "Strong systems thinking. " * 400,
+        "verdict": "HIRE",
+    }
+    pages = PdfReader(io.BytesIO(PDFService().create_report(data))).pages
+    assert len(pages) >= 2
+    assert "TECHNICAL DUE DILIGENCE REPORT" in pages[0].extract_text()
+    assert "ID: AUTO-GEN-120000" in pages[1].extract_text()
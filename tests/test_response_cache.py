@@ -0,0 +1,89 @@
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.response_cache import ResponseCache
+from fakes import FakeGenAIClient
+
+
+def test_exact_and_near_duplicate_hits():
+    cache = ResponseCache(max_entries=10)
+    cache.put("Tell me about yourself", "hr", 2, "I am Veronika's twin.", latency=1.5)
+
+    assert cache.get("tell me about yourself", "hr", 2) == "I am Veronika's twin."
+    assert cache.get("Please, tell me about yourself!", "hr", 2) == "I am Veronika's twin."
+    assert cache.get("tel me about yourself", "hr", 2) == "I am Veronika's twin."
+
+    stats = cache.stats()
+    assert stats["hits_exact"] == 2
+    assert stats["hits_similar"] == 1
+    assert stats["latency_saved_seconds"] == 4.5
+
+
+def test_different_questions_do_not_collide():
+    cache = ResponseCache(max_entries=10)
+    cache.put("Do you know Python?", "hr", 2, "Yes, Python.")
+    cache.put("What is your most starred project?", "hr", 2, "venture-assist-ai")
+
+    assert cache.get("Do you know Rust?", "hr", 2) is None
+    assert cache.get("Do you know Java?", "hr", 2) is None
+    assert cache.get("What is your least starred project?", "hr", 2) is None
+    # Trigram-close, but another year or an extra keyword is another question
+    cache.put("Which Python projects did you build in 2025?", "hr", 2, "Three in 2025.")
+    assert cache.get("Which Python projects did you build in 2024?", "hr", 2) is None
+    assert cache.get("Which Python projects did you build in 2025 alone?", "hr", 2) is None
+    assert cache.get("which python projects did you build in 2025", "hr", 2) == "Three in 2025."
+    assert cache.stats()["hits_similar"] == 0
+    # Mode and seniority change the answer, so they are part of the key
+    assert cache.get("Do you know Python?", "tech_lead", 2) is None
+    assert cache.get("Do you know Python?", "hr", 3) is None
+
+
+def test_lru_bound_and_invalidation():
+    cache = ResponseCache(max_entries=2)
+    cache.put("contact info", "hr", 2, "a")
+    cache.put("availability", "hr", 2, "b")
+    cache.get("contact info", "hr", 2)
+    cache.put("python experience", "hr", 2, "c")  # evicts "availability"
+
+    assert cache.get("availability", "hr", 2) is None
+    assert cache.get("contact info", "hr", 2) == "a"
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate()
+    assert cache.get("contact info", "hr", 2) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_agent_serves_repeated_questions_without_calling_gemini():
+    client = FakeGenAIClient()
+    agent = AIAgentService(client=client)
+
+    first = agent.ask("Do you know Python?", session_id="visitor-1")
+    calls = len(client.calls)
+    second = agent.ask("do you know python", session_id="visitor-2")
+
+    assert second == first
+    assert len(client.calls) == calls
+    # The cached answer still becomes part of visitor-2's conversation
+    assert agent.sessions.turn_count("visitor-2") == 1
+
+
+def test_follow_up_answers_are_not_cached():
+    client = FakeGenAIClient()
+    agent = AIAgentService(client=client)
+
+    agent.ask("Tell me about your projects", session_id="v1")
+    agent.ask("Tell me more", session_id="v1")  # depends on the conversation so far
+
+    assert agent.response_cache.get("Tell me more", "hr", 2) is None
+
+
+def test_follow_ups_are_not_served_from_other_visitors_answers():
+    client = FakeGenAIClient(reply=lambda contents: f"Answer to {len(contents)} turns")
+    agent = AIAgentService(client=client)
+    assert agent.ask("Tell me more", session_id="a") == "Answer to 1 turns"  # first turn: cached
+
+    agent.ask("How did you scale Kafka?", session_id="b")
+    calls = len(client.calls)
+    assert agent.ask("Tell me more", session_id="b") == "Answer to 3 turns"
+    events = list(agent.ask_stream("Tell me more", session_id="b"))
+    assert len(client.calls) == calls + 2
+    assert not events[-1].get("cached")
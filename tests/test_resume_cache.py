@@ -0,0 +1,50 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import backend.app.services.knowledge as knowledge
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.knowledge import RESUME_CACHE, load_resume_pages
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in ("dynamic_profile.json", "resume.pdf"):
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path / name)
+    return str(tmp_path)
+
+
+def test_second_load_skips_pdf_parsing(data_dir, monkeypatch):
+    pages, from_cache = load_resume_pages(data_dir)
+    assert not from_cache
+    assert os.path.exists(os.path.join(data_dir, RESUME_CACHE))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("PDF parsed despite a valid cache")
+    monkeypatch.setattr(knowledge, "PdfReader", fail)
+
+    assert load_resume_pages(data_dir) == (pages, True)
+
+
+def test_stale_cache_is_rebuilt(data_dir):
+    cache_path = os.path.join(data_dir, RESUME_CACHE)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"sha256": "old-pdf", "pages": ["outdated"]}, f)
+
+    pages, from_cache = load_resume_pages(data_dir)
+    assert not from_cache and pages != ["outdated"]
+    assert load_resume_pages(data_dir) == (pages, True)
+
+
+def test_startup_timings_are_recorded(data_dir):
+    AIAgentService(client=FakeGenAIClient(), data_dir=data_dir)
+    agent = AIAgentService(client=FakeGenAIClient(), data_dir=data_dir)
+
+    timings = agent.startup_timings
+    assert {"client_init", "data_load", "instruction_build"} <= timings.keys()
+    assert timings["resume_from_cache"] is True
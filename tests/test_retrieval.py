@@ -0,0 +1,53 @@
+import json
+import os
+
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.retrieval import BM25Index, Chunk, RetrievalIndex, chunk_resume
+from fakes import FakeGenAIClient
+
+PROFILE = {
+    "projects": [
+        {"name": "stream-refinery", "language": "Python", "stars": 3, "description": "Kafka consumer pipeline.", "topics": ["kafka"]},
+        {"name": "rusty-agent", "language": "Rust", "stars": 1, "description": "Tokio based agent runtime.", "topics": []},
+        {"name": "venture-assist-ai", "language": "Python", "stars": 7, "description": "Google ADK assistant.", "topics": ["gemini"]},
+    ]
+}
+RESUME = ["VERONIKA KASHTANOVA AI Engineer ● Professional summary here.", "EDUCATION ● Master's Degree (Honors)."]
+
+
+def test_bm25_ranks_matching_chunk_first():
+    index = BM25Index([Chunk("t", "a", "java spring boot"), Chunk("t", "b", "kafka streams in python")])
+    assert index.search("Do you know Kafka?", k=1)[0][1].title == "b"
+    assert index.search("haskell", k=3) == []
+
+
+def test_resume_is_chunked_without_pdf_whitespace():
+    chunks = chunk_resume(["VERONIKA\n \nKASHTANOVA\n \n● Python\n \n● Java"], max_chars=20)
+    assert [c.text for c in chunks] == ["VERONIKA KASHTANOVA", "Python Java"]
+
+
+def test_retrieve_pins_resume_header_and_falls_back_to_showcase():
+    index = RetrievalIndex(RESUME, PROFILE)
+    kafka = index.retrieve("Any Kafka experience?", k=2)
+    assert kafka[0].title == "Resume p.1"
+    assert kafka[1].title == "stream-refinery"
+    # Nothing matches an open question: show the most-starred projects
+    assert [c.title for c in index.retrieve("tell me about yourself", k=1)][1:] == ["venture-assist-ai"]
+
+
+def test_agent_sends_only_relevant_chunks(tmp_path):
+    (tmp_path / "dynamic_profile.json").write_text(json.dumps(PROFILE))
+    client = FakeGenAIClient(fail_cache_create=True)
+    agent = AIAgentService(client=client, data_dir=str(tmp_path))
+    agent.fast_path.enabled = False  # this lookup would be answered locally (see test_fast_path.py)
+
+    agent.ask("Which projects use Rust?", session_id="s")
+
+    call = client.calls[-1]
+    retrieved, message = call.contents[-1].parts
+    assert "rusty-agent" in retrieved.text
+    assert "venture-assist-ai" not in retrieved.text
+    assert message.text == "Which projects use Rust?"
+    # The static instruction only carries an overview, not the records themselves
+    assert "rusty-agent" not in call.config.system_instruction
+    assert "3 projects" in call.config.system_instruction
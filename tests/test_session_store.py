@@ -0,0 +1,56 @@
+from backend.app.services.session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sessions_are_isolated():
+    store = SessionStore(max_sessions=10, ttl_seconds=60, max_history_turns=5)
+    store.append_turn("alice", "u1", "m1")
+    store.append_turn("bob", "u2", "m2")
+
+    assert store.get_history("alice") == ["u1", "m1"]
+    assert store.get_history("bob") == ["u2", "m2"]
+
+
+def test_history_is_capped_per_session():
+    store = SessionStore(max_sessions=10, ttl_seconds=60, max_history_turns=2)
+    for i in range(5):
+        store.append_turn("s", f"u{i}", f"m{i}")
+
+    # Only the last 2 exchanges survive, and history still starts with a user turn
+    assert store.get_history("s") == ["u3", "m3", "u4", "m4"]
+    assert store.stats()["trimmed_turns"] == 3
+
+
+def test_lru_eviction():
+    store = SessionStore(max_sessions=2, ttl_seconds=60, max_history_turns=5)
+    store.append_turn("a", "u", "m")
+    store.append_turn("b", "u", "m")
+    store.get_history("a")  # a becomes most recently used
+    store.append_turn("c", "u", "m")  # evicts b
+
+    assert store.turn_count("a") == 1
+    assert store.turn_count("b") == 0
+    stats = store.stats()
+    assert stats["active_sessions"] == 2
+    assert stats["evicted_lru"] == 1
+
+
+def test_ttl_eviction():
+    clock = FakeClock()
+    store = SessionStore(max_sessions=10, ttl_seconds=30, max_history_turns=5, clock=clock)
+    store.append_turn("old", "u", "m")
+    clock.now = 20
+    store.append_turn("fresh", "u", "m")
+    clock.now = 40
+
+    stats = store.stats()
+    assert stats["active_sessions"] == 1
+    assert stats["evicted_ttl"] == 1
+    assert store.turn_count("fresh") == 1
@@ -0,0 +1,77 @@
+import gzip
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.services.static_assets import (
+    IMMUTABLE, PrecompressedStaticFiles, accepted_encodings, build_assets, static_root,
+)
+
+FRONTEND_DIR = os.path.join(os.getcwd(), "frontend")
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    out = str(tmp_path_factory.mktemp("dist"))
+    manifest = build_assets(FRONTEND_DIR, out)
+    app = FastAPI()
+    app.mount("/", PrecompressedStaticFiles(directory=out, html=True), name="frontend")
+    return manifest, out, TestClient(app)
+
+
+def test_build_fingerprints_assets_and_rewrites_references(built):
+    manifest, out, _ = built
+    assert manifest["index.html"] == "index.html"
+    assert manifest["script.js"].startswith("script.") and manifest["script.js"] != "script.js"
+
+    with open(os.path.join(out, "index.html"), encoding="utf-8") as f:
+        index = f.read()
+    assert manifest["script.js"] in index and manifest["styles.css"] in index
+    assert '"script.js"' not in index
+    with open(os.path.join(out, manifest["script.js"]), encoding="utf-8") as f:
+        assert manifest["public/alert.gif"] in f.read()
+    assert static_root(os.path.dirname(out)) == os.path.dirname(out)  # no manifest there
+
+
+def test_precompressed_variant_is_sent_and_far_smaller_on_the_wire(built):
+    manifest, out, client = built
+    original = os.path.getsize(os.path.join(FRONTEND_DIR, "script.js"))
+
+    response = client.get("/" + manifest["script.js"], headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-type"].startswith(("application/javascript", "text/javascript"))
+    wire = int(response.headers["content-length"])
+    assert wire == os.path.getsize(os.path.join(out, manifest["script.js"] + ".gz"))
+    assert wire < original / 2
+
+    # Clients that don't accept gzip get the (minified) identity file
+    plain = client.get("/" + manifest["script.js"], headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == gzip.decompress(open(os.path.join(out, manifest["script.js"] + ".gz"), "rb").read())
+    assert plain.headers["etag"] != response.headers["etag"]
+
+
+def test_repeat_visit_transfers_only_revalidation(built):
+    manifest, _, client = built
+    headers = {"Accept-Encoding": "gzip, br"}
+
+    first = client.get("/", headers=headers)
+    assert first.headers["cache-control"] == "no-cache"
+    asset = client.get("/" + manifest["styles.css"], headers=headers)
+    assert asset.headers["cache-control"] == IMMUTABLE
+    first_visit = int(first.headers["content-length"]) + int(asset.headers["content-length"])
+
+    # The browser reuses the immutable asset without asking and revalidates the page
+    again = client.get("/", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert first_visit > 0
+
+
+def test_accepted_encodings_parses_quality_values():
+    assert accepted_encodings("gzip, br;q=0.8, *;q=0") == {"gzip": 1.0, "br": 0.8, "*": 0.0}
+    assert accepted_encodings("") == {}
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+
+from backend.app.services.ai_agent import AIAgentService
+from backend.app.services.gemini_caller import GeminiCaller
+from backend.app.services.transcript_compactor import TranscriptCompactor, format_messages
+from fakes import FakeGenAIClient
+
+DATA_DIR = os.path.join(os.getcwd(), "backend", "data")
+REPORT_JSON = json.dumps({"candidate_name": "Veronika Kashtanova", "verdict": "HIRE", "top_skills": []})
+
+
+def _history(turns, start=0):
+    history = []
+    for i in range(start, start + turns):
+        history.append({"role": "user", "content": f"Question {i}: how did you scale service {i}? " * 5})
+        history.append({"role": "model", "content": f"Answer {i}: sharded Postgres and added Kafka. " * 8})
+    return history
+
+
+def _reply(contents):
+    return REPORT_JSON if "OUTPUT FORMAT: JSON" in str(contents) else "Notes: claims Kafka, Postgres."
+
+
+def _compactor(client, **kwargs):
+    return TranscriptCompactor(client, "model", window_chars=2000, direct_chars=4000, **kwargs)
+
+
+def test_short_transcript_is_passed_through():
+    client = FakeGenAIClient(reply=_reply)
+    history = _history(2)
+    assert _compactor(client).digest(history) == format_messages(history)
+    assert client.calls == []
+
+
+def test_long_transcript_is_summarized_except_latest_window():
+    client = FakeGenAIClient(reply=_reply)
+    history = _history(40)
+    digest = _compactor(client).digest(history)
+
+    transcript = format_messages(history)
+    assert len(digest) < len(transcript) / 4
+    assert digest.count("Notes: claims Kafka") == len(client.calls) > 1
+    assert format_messages(history[-1:]) in digest  # latest part verbatim
+
+
+def test_growing_session_only_summarizes_new_windows():
+    client = FakeGenAIClient(reply=_reply)
+    compactor = _compactor(client)
+    history = _history(40)
+    compactor.digest(history, session_id="s1")
+    first_calls = len(client.calls)
+
+    compactor.digest(history + _history(10, start=40), session_id="s1")
+    new_calls = len(client.calls) - first_calls
+    assert 0 < new_calls < first_calls / 2
+    assert compactor.stats()["windows_reused"] == first_calls
+
+
+def test_windows_are_summarized_in_parallel():
+    client = FakeGenAIClient(reply=_reply, latency=0.1)
+    compactor = _compactor(client, parallelism=8)
+
+    started = time.perf_counter()
+    compactor.digest(_history(40))
+    elapsed = time.perf_counter() - started
+    assert len(client.calls) >= 8
+    assert elapsed < len(client.calls) * 0.1 / 2
+
+
+def test_hung_summaries_are_cut_off_by_the_report_budget():
+    client = FakeGenAIClient(reply=_reply, latency=2)
+    caller = GeminiCaller("model", fallback_model="", budgets={"report": 0.2}, hedge=False)
+    history = _history(40)
+
+    started = time.perf_counter()
+    digest = _compactor(client, parallelism=8, gemini_caller=caller).digest(history)
+    assert time.perf_counter() - started < 1.5
+    assert "Notes: claims Kafka" not in digest and format_messages(history[:1]) in digest  # raw windows
+    assert caller.stats()["timeouts"] >= 1
+    assert all(call.config.http_options.timeout <= 200 for call in client.calls)
+
+
+def test_report_prompt_uses_the_digest():
+    client = FakeGenAIClient(reply=_reply)
+    agent = AIAgentService(client=client, data_dir=DATA_DIR)
+    history = _history(60)
+
+    assert agent.generate_hiring_report(history, session_id="s1").startswith(b"%PDF")
+    report_prompt = client.calls[-1].contents
+    assert "OUTPUT FORMAT: JSON" in report_prompt
+    assert len(report_prompt) < len(format_messages(history)) / 2
@@ -0,0 +1,84 @@
+import threading
+
+from backend.app.services.audio_cache import AudioCache
+from backend.app.services.tts_service import TTSService
+from fakes import FakeTTSClient
+
+CONTACT = "You can reach me via X (@veron_code) or check my code on GitHub."
+
+
+def _service(tmp_path, memory_bytes=1 << 20, disk_bytes=1 << 22):
+    client = FakeTTSClient()
+    cache = AudioCache(memory_bytes=memory_bytes, disk_bytes=disk_bytes, disk_dir=str(tmp_path))
+    return TTSService(client=client, cache=cache), client
+
+
+def test_replay_is_served_from_memory(tmp_path):
+    tts, client = _service(tmp_path)
+    audio = tts.synthesize_speech(CONTACT)
+
+    assert tts.synthesize_speech(CONTACT) == audio
+    assert client.calls == [CONTACT]
+    stats = tts.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 1
+    assert stats["bytes_saved"] == len(audio)
+
+
+def test_voice_is_part_of_the_key(tmp_path):
+    tts, client = _service(tmp_path)
+    tts.synthesize_speech(CONTACT)
+    tts.synthesize_speech(CONTACT, voice_name="en-GB-Neural2-A")
+    assert len(client.calls) == 2
+
+
+def test_memory_evictions_spill_to_disk_and_survive_restart(tmp_path):
+    tts, client = _service(tmp_path, memory_bytes=6000)
+    texts = [f"Answer number {i}, repeated for length." * 2 for i in range(5)]
+    for text in texts:
+        tts.synthesize_speech(text)
+    assert tts.stats()["memory_bytes"] <= 6000
+
+    # A new process finds the audio on disk
+    restarted, new_client = _service(tmp_path, memory_bytes=6000)
+    for text in texts:
+        restarted.synthesize_speech(text)
+    assert new_client.calls == []
+    assert restarted.stats()["disk_hits"] == len(texts)
+
+
+def test_disk_tier_is_bounded_by_bytes(tmp_path):
+    tts, client = _service(tmp_path, memory_bytes=0, disk_bytes=10_000)
+    for i in range(20):
+        tts.synthesize_speech(f"Canned answer {i:02d} about availability and roles.")
+
+    stats = tts.stats()
+    assert 0 < stats["disk_bytes"] <= 10_000
+    assert len(list(tmp_path.iterdir())) == stats["disk_entries"]
+    # The most recent answer is still cached, the oldest was evicted
+    tts.synthesize_speech("Canned answer 19 about availability and roles.")
+    tts.synthesize_speech("Canned answer 00 about availability and roles.")
+    assert client.calls[-1] == "Canned answer 00 about availability and roles."
+    assert len(client.calls) == 21
+
+
+def test_disk_reads_do_not_block_other_lookups(tmp_path):
+    cache = AudioCache(memory_bytes=100, disk_bytes=1 << 20, disk_dir=str(tmp_path))
+    cache.put("slow", b"x" * 1000)  # too big for memory: served from disk
+    cache.put("fast", b"y" * 10)
+
+    reading, release = threading.Event(), threading.Event()
+    read_disk = cache._read_disk
+
+    def slow_read(key):
+        reading.set()
+        release.wait(5)
+        return read_disk(key)
+
+    cache._read_disk = slow_read
+    reader = threading.Thread(target=cache.get, args=("slow",))
+    reader.start()
+    assert reading.wait(5)
+    assert cache.get("fast") == b"y" * 10 and cache.stats()["disk_entries"] == 2  # lock is free
+    release.set()
+    reader.join(5)
+    assert cache.stats()["disk_hits"] == 1
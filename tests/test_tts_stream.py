@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import httpx
+
+import backend.app.main as main
+from backend.app.services.audio_cache import AudioCache
+from backend.app.services.tts_service import TTSService, clean_for_speech, split_for_speech
+from fakes import FakeTTSClient
+
+ANSWER = """## Stream Refinery
+Yes. In **Stream Refinery** I used `Python` to build a Kafka consumer. It handles 10k events/s.
+
+```mermaid
+graph TD; Kafka-->Consumer-->Postgres
+```
+
+- Exactly-once delivery.
+- Backpressure via [bounded queues](https://example.com/queues).
+What is your CI/CD setup?"""
+
+
+def _service(tmp_path, latency=0.0, parallelism=4):
+    client = FakeTTSClient(latency=latency)
+    cache = AudioCache(memory_bytes=1 << 20, disk_bytes=0, disk_dir=str(tmp_path))
+    return TTSService(client=client, cache=cache, parallelism=parallelism), client
+
+
+def test_markdown_and_mermaid_are_not_read_aloud():
+    spoken = clean_for_speech(ANSWER)
+    for markup in ("```", "mermaid", "Kafka-->", "**", "`", "##", "https://", "- "):
+        assert markup not in spoken
+    assert "Backpressure via bounded queues." in spoken
+
+
+def test_first_chunk_is_a_single_sentence_and_long_sentences_are_cut():
+    chunks = split_for_speech(ANSWER, max_chars=60)
+    assert chunks[0] == "Stream Refinery"
+    assert all(len(c) <= 60 for c in chunks)
+    assert " ".join(chunks).split() == clean_for_speech(ANSWER).split()
+
+
+def test_stream_is_in_order_and_synthesized_concurrently(tmp_path):
+    tts, client = _service(tmp_path, latency=0.1)
+    tts_serial, _ = _service(tmp_path, parallelism=1)
+
+    started = time.perf_counter()
+    segments = list(tts.synthesize_stream(ANSWER))
+    elapsed = time.perf_counter() - started
+
+    assert len(segments) == len(split_for_speech(ANSWER)) > 1
+    assert segments == [tts_serial.synthesize_speech(c) for c in split_for_speech(ANSWER)]
+    assert sorted(client.calls) == sorted(split_for_speech(ANSWER))
+    # Serial synthesis would take len(segments) * latency
+    assert elapsed < len(segments) * 0.1 * 0.75 + 0.05
+
+
+def test_first_segment_arrives_before_the_rest_is_synthesized(tmp_path):
+    tts, client = _service(tmp_path, latency=0.1, parallelism=1)
+    long_answer = " ".join(f"Sentence number {i} is here." for i in range(30))
+    stream = tts.synthesize_stream(long_answer)
+
+    started = time.perf_counter()
+    next(stream)
+    assert time.perf_counter() - started < 0.5
+    stream.close()
+    assert len(client.calls) < 5
+
+
+def test_stream_endpoint(tmp_path, monkeypatch):
+    tts, _ = _service(tmp_path)
+    monkeypatch.setattr(main, "tts_service", tts)
+
+    async def post():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/tts/stream", json={"text": ANSWER})
+
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/mpeg"
+    assert response.content == tts.synthesize_long(ANSWER)